@@ -0,0 +1,46 @@
+"""
+Optional NumPy acceleration.
+
+NumPy isn't a requirement. Days with a vectorized path ask for it at runtime
+and keep their pure-Python path for when it isn't there, or when the input is
+too small to be worth importing NumPy for:
+
+    np = numpy(len(forrest.cells), NUMPY_MIN_CELLS)
+    if np is not None:
+        return find_visible_numpy(np, forrest)
+    ...
+
+Both paths give identical answers, and parsed inputs (which end up in the
+parse cache) have the same shape either way, so only plain Python objects
+come out of a vectorized path.
+
+NumPy is imported on first use rather than when a day is imported, since
+importing it takes far longer than the import budget (see `aoc.bench`)
+allows. Set `AOC_NUMPY=0` to force the pure-Python paths, e.g. to compare the
+two.
+"""
+from types import ModuleType
+import os
+
+_numpy: 'ModuleType|None' = None
+_looked = False
+
+def numpy(size: int = 0, min_size: int = 0) -> 'ModuleType|None':
+    """
+    The numpy module, or None if it isn't installed, is disabled, or `size`
+    (of the input, in whatever unit the caller's `min_size` is in) is below
+    `min_size`.
+    """
+    global _numpy, _looked
+    if size < min_size:
+        return None
+    if not _looked:
+        _looked = True
+        if os.environ.get('AOC_NUMPY', '1') != '0':
+            try:
+                import numpy
+            except ImportError:
+                pass
+            else:
+                _numpy = numpy
+    return _numpy
@@ -0,0 +1,133 @@
+"""
+Solve many inputs for one day and stream the answers as JSON lines.
+
+    python -m aoc.batch 20 corpus/day_20/            # every file in a directory
+    python -m aoc.batch 20 a.txt b.txt -j 4          # the listed files on 4 workers
+    python -m aoc.batch 20 --manifest inputs.txt     # the files listed in a manifest
+    python -m aoc.batch 20 corpus/ -o answers.jsonl  # write to a file instead of stdout
+
+A manifest lists one input path per line, relative to the manifest itself;
+blank lines and lines starting with '#' are skipped. An input's id is its path
+as given, or relative to the directory it was found in.
+
+The workers live for the whole batch and import the day's module once, so
+throughput scales with cores rather than with interpreter startup. Inputs are
+handed out in chunks, and every input produces one line as soon as its chunk
+is done:
+
+    {"id": "...", "part1": "...", "part2": "...", "timings": {"parse": 0.001, ...}}
+
+or `{"id": "...", "error": "..."}` when the day raised. Lines therefore come
+out in completion order, not input order. Parsed inputs aren't cached, since a
+corpus is rarely solved twice. Days that set `MAPPED_INPUT` parse straight
+from a memory map of the file (see `aoc.reader`), so a large input is never
+read into memory as a whole.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from pathlib import Path
+from types import ModuleType
+import argparse
+import json
+import os
+import sys
+import time
+
+from aoc.days import day_phases, find_days, load_day, precompile, run_phase
+from aoc.reader import map_file
+
+# The day's module, imported once per worker by `init_worker`
+_module: 'ModuleType|None' = None
+
+def init_worker(day: int):
+    global _module
+    _module = load_day(day)
+
+def solve_input(module: ModuleType, input_id: str, path: Path) -> dict:
+    record = {'id': input_id}
+    timings = {}
+    answers = {}
+    try:
+        mapped = getattr(module, 'MAPPED_INPUT', False)
+        with map_file(path) if mapped else nullcontext(path.read_text()) as text:
+            parsed = None
+            for phase in day_phases(module):
+                start = time.perf_counter()
+                parsed, answer = run_phase(module, phase, text, parsed)
+                timings[phase] = time.perf_counter() - start
+                if answer is not None:
+                    answers[phase] = str(answer)
+    except Exception as e:
+        record['error'] = f'{e.__class__.__name__}: {e}'
+        return record
+    record.update(answers)
+    record['timings'] = timings
+    return record
+
+def solve_chunk(chunk: 'list[tuple[str, Path]]') -> 'list[dict]':
+    return [solve_input(_module, input_id, path) for input_id, path in chunk]
+
+def collect_inputs(paths: 'list[Path]', manifest: 'Path|None') -> 'list[tuple[str, Path]]':
+    """
+    Returns (id, path) for every input named on the command line: files as
+    given, the files directly inside directories, and the entries of the
+    manifest.
+    """
+    inputs = []
+    for path in paths:
+        if path.is_dir():
+            for child in sorted(path.iterdir()):
+                if child.is_file():
+                    inputs.append((str(child.relative_to(path)), child))
+        else:
+            inputs.append((str(path), path))
+    if manifest is not None:
+        for line in manifest.read_text().split('\n'):
+            line = line.strip()
+            if line and not line.startswith('#'):
+                inputs.append((line, manifest.parent / line))
+    return inputs
+
+def chunked(inputs: list, chunk_size: int) -> 'list[list]':
+    return [inputs[i:i + chunk_size] for i in range(0, len(inputs), chunk_size)]
+
+def main(argv: 'list[str]|None' = None):
+    parser = argparse.ArgumentParser(prog='python -m aoc.batch', description='Solve many inputs for one Advent of Code day.')
+    parser.add_argument('day', type=int, help='day to solve')
+    parser.add_argument('paths', nargs='*', type=Path, help='input files, or directories of input files')
+    parser.add_argument('-m', '--manifest', type=Path, help='file listing one input path per line')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='number of worker processes (default: core count)')
+    parser.add_argument('--chunk-size', type=int, help='inputs handed to a worker at a time (default: enough for about 4 chunks per worker)')
+    parser.add_argument('-o', '--output', help='write JSON lines to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    if args.day not in find_days():
+        parser.error(f'no solution for day {args.day}')
+    inputs = collect_inputs(args.paths, args.manifest)
+    if not inputs:
+        parser.error('no inputs given')
+    chunk_size = args.chunk_size or max(1, len(inputs) // (args.jobs * 4))
+
+    precompile()
+    start = time.perf_counter()
+    errors = 0
+    outf = sys.stdout if args.output is None else open(args.output, 'w')
+    try:
+        with ProcessPoolExecutor(max_workers=args.jobs, initializer=init_worker, initargs=(args.day,)) as executor:
+            futures = [executor.submit(solve_chunk, chunk) for chunk in chunked(inputs, chunk_size)]
+            for future in as_completed(futures):
+                for record in future.result():
+                    errors += 'error' in record
+                    outf.write(json.dumps(record) + '\n')
+                outf.flush()
+    finally:
+        if outf is not sys.stdout:
+            outf.close()
+    elapsed = time.perf_counter() - start
+
+    print(f'Solved {len(inputs)} input(s) in {elapsed:.3f}s ({len(inputs) / elapsed:.1f}/s), {errors} error(s)', file=sys.stderr)
+    if errors:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+"""
+Benchmark each day's parse, precompute, part 1 and part 2 phases.
+
+    python -m aoc.bench 8 12 14                   # benchmark the listed days
+    python -m aoc.bench -r 10 -w 2                # 10 timed runs after 2 warmup runs
+    python -m aoc.bench 20 --size 50000           # run against a generated input
+    python -m aoc.bench -o new.json               # save results
+    python -m aoc.bench -b old.json -t 0.05       # flag phases >5% slower than old.json
+    python -m aoc.bench --import-budget 2         # flag days taking >2ms to import
+
+Days are benchmarked one at a time in a single process so that they don't
+compete for cores. Each run parses the input from scratch and feeds the result
+to both parts, exactly like the runner. The comparison uses the minimum time of
+each phase, which is the least noisy of the statistics; the exit status is 1 if
+any phase regressed.
+
+Startup is benchmarked too, as an `import` phase: the time `-X importtime`
+reports for importing the day's module in a fresh interpreter that has already
+imported the runner's own modules, which is what each runner worker pays. A day
+whose fastest import exceeds `--import-budget` also makes the exit status 1.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from aoc.days import ROOT, day_phases, find_days, load_day, load_generator, load_input, precompile, run_phase
+from aoc.runner import render_table
+
+# Phases faster than this are dominated by timer and scheduler noise, so they
+# are never reported as regressions
+NOISE_FLOOR = 0.001
+
+DEFAULT_IMPORT_BUDGET = 0.005
+
+class PhaseStats:
+    def __init__(self, times: 'list[float]'):
+        self.times = times
+
+    @property
+    def min(self) -> float:
+        return min(self.times)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    @property
+    def stddev(self) -> float:
+        return statistics.stdev(self.times) if len(self.times) > 1 else 0.0
+
+    def to_json(self) -> dict:
+        return {'min': self.min, 'median': self.median, 'stddev': self.stddev, 'times': self.times}
+
+def run_once(module, text: str) -> 'dict[str, float]':
+    times = {}
+    parsed = None
+    for phase in day_phases(module):
+        start = time.perf_counter()
+        parsed, _ = run_phase(module, phase, text, parsed)
+        times[phase] = time.perf_counter() - start
+    return times
+
+def measure_import(day: int) -> float:
+    """
+    Seconds a fresh interpreter spends importing the day's module (including
+    anything it imports that `aoc.days` hasn't already), per `-X importtime`.
+    """
+    module_name = f'day_{day:02d}.solution'
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import aoc.days; import {module_name}'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    # Lines look like "import time:   self [us] | cumulative | name"
+    for line in proc.stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module_name:
+            return int(fields[1]) / 1e6
+    raise RuntimeError(f'no import time reported for {module_name}')
+
+def bench_day(day: int, repeat: int, warmup: int, size: 'int|None' = None, seed: int = 0) -> dict:
+    """
+    Returns the JSON record for one day: per-phase statistics, or the error
+    that stopped the day from running.
+    """
+    try:
+        module = load_day(day)
+        if size is None:
+            text = load_input(day, module)
+        else:
+            text = load_generator(day).generate(size, seed)
+
+        for _ in range(warmup):
+            measure_import(day)
+            run_once(module, text)
+        samples = {'import': [], **{phase: [] for phase in day_phases(module)}}
+        for _ in range(repeat):
+            samples['import'].append(measure_import(day))
+            for phase, elapsed in run_once(module, text).items():
+                samples[phase].append(elapsed)
+    except Exception as e:
+        return {'error': f'{e.__class__.__name__}: {e}'}
+    return {'phases': {phase: PhaseStats(times).to_json() for phase, times in samples.items()}}
+
+def compare(current: dict, baseline: dict) -> 'dict[tuple[str, str], float]':
+    """
+    Returns the relative change in minimum time of every phase present in both
+    result sets, keyed by (day, phase). Days are keyed by their string number
+    as they are in the JSON files.
+    """
+    changes = {}
+    for day, record in current['days'].items():
+        old_record = baseline['days'].get(day)
+        if 'phases' not in record or old_record is None or 'phases' not in old_record:
+            continue
+        for phase, stats in record['phases'].items():
+            old_stats = old_record['phases'].get(phase)
+            if old_stats is None or old_stats['min'] == 0:
+                continue
+            changes[(day, phase)] = stats['min'] / old_stats['min'] - 1
+    return changes
+
+def is_regression(change: float, stats: dict, threshold: float) -> bool:
+    return change > threshold and stats['min'] >= NOISE_FLOOR
+
+def over_budget(current: dict, import_budget: float) -> 'list[str]':
+    """
+    The days (keyed as in the JSON) whose fastest import exceeded the budget.
+    """
+    return [day for day, record in current['days'].items()
+            if 'phases' in record and record['phases']['import']['min'] > import_budget]
+
+def format_results(current: dict, changes: 'dict[tuple[str, str], float]', threshold: float, import_budget: float = DEFAULT_IMPORT_BUDGET) -> str:
+    header = ('Day', 'Phase', 'Min (s)', 'Median (s)', 'Stddev (s)')
+    if changes:
+        header += ('Change',)
+    rows = [header + ('',)]
+    for day, record in current['days'].items():
+        if 'error' in record:
+            rows.append((f'{int(day):02d}', '', '', '', '') + (('',) if changes else ()) + (record['error'],))
+            continue
+        for phase, stats in record['phases'].items():
+            row = (f'{int(day):02d}', phase, f'{stats["min"]:.4f}', f'{stats["median"]:.4f}', f'{stats["stddev"]:.4f}')
+            flag = ''
+            if phase == 'import' and stats['min'] > import_budget:
+                flag = 'OVER BUDGET'
+            if changes:
+                change = changes.get((day, phase))
+                row += ('' if change is None else f'{change:+.1%}',)
+                if change is not None and is_regression(change, stats, threshold):
+                    flag = ' '.join(filter(None, ('REGRESSION', flag)))
+            rows.append(row + (flag,))
+    return render_table(rows)
+
+def main(argv: 'list[str]|None' = None):
+    parser = argparse.ArgumentParser(prog='python -m aoc.bench', description='Benchmark Advent of Code solutions.')
+    parser.add_argument('days', nargs='*', type=int, help='days to benchmark (default: all)')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='timed runs per day (default: 5)')
+    parser.add_argument('-w', '--warmup', type=int, default=1, help='untimed runs before timing (default: 1)')
+    parser.add_argument('--size', type=int, help='benchmark a generated input of this size instead of input.txt')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the generated input (default: 0)')
+    parser.add_argument('-o', '--output', help='write results to this JSON file')
+    parser.add_argument('-b', '--baseline', help='JSON file from an earlier run to compare against')
+    parser.add_argument('-t', '--threshold', type=float, default=0.10, help='relative slowdown reported as a regression (default: 0.10)')
+    parser.add_argument('--import-budget', type=float, default=DEFAULT_IMPORT_BUDGET * 1000, metavar='MS', help=f'longest a day may take to import, in milliseconds (default: {DEFAULT_IMPORT_BUDGET * 1000:g})')
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+
+    days = list(find_days())
+    if args.days:
+        missing = [d for d in args.days if d not in days]
+        if missing:
+            parser.error(f'no solution for day(s) {", ".join(str(d) for d in missing)}')
+        days = args.days
+    import_budget = args.import_budget / 1000
+
+    precompile()
+    current = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'warmup': args.warmup,
+            'size': args.size,
+            'seed': args.seed,
+            'import_budget': import_budget,
+            'timestamp': time.time(),
+        },
+        'days': {},
+    }
+    for day in days:
+        print(f'Benchmarking day {day:02d}', file=sys.stderr)
+        current['days'][str(day)] = bench_day(day, args.repeat, args.warmup, args.size, args.seed)
+
+    if args.output is not None:
+        with open(args.output, 'w') as outf:
+            json.dump(current, outf, indent=2)
+
+    changes = {}
+    if args.baseline is not None:
+        with open(args.baseline, 'r') as inf:
+            baseline = json.load(inf)
+        if baseline['meta'].get('size') != args.size or baseline['meta'].get('seed') != args.seed:
+            print('Warning: baseline was measured on a different input', file=sys.stderr)
+        changes = compare(current, baseline)
+
+    print(format_results(current, changes, args.threshold, import_budget))
+
+    regressions = [key for key, change in changes.items()
+                   if is_regression(change, current['days'][key[0]]['phases'][key[1]], args.threshold)]
+    if regressions:
+        print(f'{len(regressions)} phase(s) regressed by more than {args.threshold:.0%}')
+    slow_imports = over_budget(current, import_budget)
+    if slow_imports:
+        print(f'{len(slow_imports)} day(s) took longer than {args.import_budget:g}ms to import')
+    if regressions or slow_imports:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
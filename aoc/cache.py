@@ -0,0 +1,62 @@
+"""
+On-disk cache of parsed inputs.
+
+Parsing is the expensive step for several days (day 16 builds the powerset of
+openable valves, day 24 precomputes every blizzard configuration), so the
+runner stores the parsed input as both parts receive it (after `precompute`,
+for days that have one) and loads it back on later runs of the same input.
+Entries are pickles named after the SHA-256 of the day, its `PARSER_VERSION`
+and the input text, so editing the input invalidates the entry automatically;
+changing what a day's `parse` or `precompute` returns needs a `PARSER_VERSION`
+bump in that day's module (it defaults to 1).
+"""
+from pathlib import Path
+from types import ModuleType
+import hashlib
+import os
+import pickle
+
+from aoc.days import ROOT
+
+CACHE_DIR = ROOT / '.cache' / 'parsed'
+
+def cache_key(day: int, module: ModuleType, text: str) -> str:
+    version = getattr(module, 'PARSER_VERSION', 1)
+    digest = hashlib.sha256(f'day {day} parser {version}\n'.encode())
+    digest.update(text.encode())
+    return digest.hexdigest()
+
+def cache_path(day: int, module: ModuleType, text: str, cache_dir: Path = CACHE_DIR) -> Path:
+    return cache_dir / f'day_{day:02d}-{cache_key(day, module, text)}.pickle'
+
+def load_cached(day: int, module: ModuleType, text: str, cache_dir: Path = CACHE_DIR) -> 'tuple[object, bool]':
+    """
+    Returns the cached parsed input and True, or (None, False) when there is
+    no usable entry.
+    """
+    path = cache_path(day, module, text, cache_dir)
+    try:
+        with path.open('rb') as inf:
+            return pickle.load(inf), True
+    except FileNotFoundError:
+        pass
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        # Written by an older version of the module; the caller parses again
+        # and overwrites it
+        pass
+    return None, False
+
+def store_cached(day: int, module: ModuleType, text: str, parsed, cache_dir: Path = CACHE_DIR):
+    path = cache_path(day, module, text, cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary name first so that a concurrent reader never sees a
+    # partial file
+    tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+    try:
+        with tmp_path.open('wb') as outf:
+            pickle.dump(parsed, outf, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, RecursionError):
+        # Not every parsed structure can be pickled; those days just aren't cached
+        tmp_path.unlink()
+    else:
+        os.replace(tmp_path, path)
@@ -0,0 +1,65 @@
+"""
+Cycle detection for long-running simulations.
+
+A simulation that is a deterministic function of some state eventually
+repeats itself once that state repeats. `CycleDetector` remembers the step at
+which every state was first seen, keyed by a compact fingerprint of the
+state (a packed tuple, the bytes of a grid, ...) rather than the state
+itself, along with any counters the simulation keeps (height, score, ...):
+
+    detector = CycleDetector()
+    step = 0
+    while step < total:
+        advance()
+        step += 1
+        cycle = detector.observe(step, fingerprint(), (height,))
+        if cycle is not None:
+            step, (height,) = cycle.fast_forward(step, total, (height,))
+            break
+    # ...then simulate the remaining steps, fewer than one period
+
+The fingerprint must identify everything the rest of the simulation depends
+on; two states with equal fingerprints are assumed to behave identically.
+"""
+
+class Cycle:
+    __slots__ = ('start', 'length', 'deltas')
+
+    def __init__(self, start: int, length: int, deltas: 'tuple[int, ...]'):
+        # The step the repeated state was first seen at
+        self.start = start
+        # Steps per period
+        self.length = length
+        # How much each counter grows per period
+        self.deltas = deltas
+
+    def __repr__(self):
+        return f'Cycle(start={self.start}, length={self.length}, deltas={self.deltas})'
+
+    def fast_forward(self, step: int, total: int, values: 'tuple[int, ...]' = ()) -> 'tuple[int, tuple[int, ...]]':
+        """
+        Skips as many whole periods as fit between `step` and `total`,
+        returning the new step and the counters advanced to match.
+        """
+        repeats = (total - step) // self.length
+        return step + repeats * self.length, tuple(v + d * repeats for v, d in zip(values, self.deltas))
+
+class CycleDetector:
+    def __init__(self):
+        # fingerprint -> (step, counters) at its first sighting
+        self.seen: 'dict[Hashable, tuple[int, tuple[int, ...]]]' = {}
+
+    def observe(self, step: int, fingerprint: 'Hashable', values: 'tuple[int, ...]' = ()) -> 'Cycle|None':
+        """
+        Records the state at `step`, returning the cycle it closes if the
+        same fingerprint was seen before.
+        """
+        first = self.seen.get(fingerprint)
+        if first is None:
+            self.seen[fingerprint] = (step, values)
+            return None
+        first_step, first_values = first
+        return Cycle(first_step, step - first_step, tuple(v - f for v, f in zip(values, first_values)))
+
+    def __len__(self):
+        return len(self.seen)
@@ -0,0 +1,97 @@
+"""
+Discovery and loading of the per-day solution modules.
+
+Every `day_XX/solution.py` exposes the same interface:
+
+    parse(text) -> parsed
+    part1(parsed) -> answer
+    part2(parsed) -> answer
+    solve(text) -> (part1 answer, part2 answer)
+
+Parts may cache derived data in the parsed input (day 7 remembers directory
+sizes) but must give the same answer when run again on it, since the runner
+feeds one parsed input to both parts and `aoc.serve` keeps it for later
+queries.
+
+A day whose parsed input needs heavy derived state before either part can run
+(day 16's valve powerset, day 24's blizzard configurations) also exposes
+
+    precompute(parsed) -> parsed
+
+so the tools can time and profile that work as a phase of its own (`solve`
+and the script entry point call it themselves). Modules only read `input.txt`
+and print when run as a script. Next to each, `day_XX/generate.py` exposes
+`generate(size, seed=0) -> str`, which produces a valid synthetic input of the
+given size.
+"""
+from pathlib import Path
+import importlib
+import sys
+from types import ModuleType
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PHASES = ('parse', 'precompute', 'part1', 'part2')
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+def find_days() -> 'dict[int, Path]':
+    days = {}
+    for solution in sorted(ROOT.glob('day_*/solution.py')):
+        days[int(solution.parent.name[4:])] = solution
+    return days
+
+def precompile() -> bool:
+    """
+    Writes bytecode for the shared package and every day, so that worker
+    processes load it instead of compiling the sources again. Python does
+    this on its own on first import, except when it runs with
+    PYTHONDONTWRITEBYTECODE set, and then every run pays for compiling. Only
+    stale files are recompiled. Returns False if any file failed to compile.
+    """
+    # Only the parent process needs compileall, so workers don't import it
+    import compileall
+    ok = compileall.compile_dir(ROOT / 'aoc', maxlevels=0, quiet=1)
+    for solution in find_days().values():
+        ok = compileall.compile_dir(solution.parent, maxlevels=0, quiet=1) and ok
+    return bool(ok)
+
+def load_day(day: int) -> ModuleType:
+    return importlib.import_module(f'day_{day:02d}.solution')
+
+def load_generator(day: int) -> ModuleType:
+    return importlib.import_module(f'day_{day:02d}.generate')
+
+def input_path(day: int) -> Path:
+    return ROOT / f'day_{day:02d}' / 'input.txt'
+
+def load_input(day: int, module: 'ModuleType|None' = None) -> str:
+    """
+    Returns the text a day is normally run against: its `sample_input` when
+    the module has `USE_SAMPLE_INPUT` set, otherwise `input.txt`.
+    """
+    if module is None:
+        module = load_day(day)
+    if getattr(module, 'USE_SAMPLE_INPUT', False):
+        return module.sample_input
+    with input_path(day).open('r') as inf:
+        return inf.read()
+
+def day_phases(module: ModuleType) -> 'list[str]':
+    """
+    The phases `module` has, in order: all of `PHASES` except `precompute`
+    for days that don't define it.
+    """
+    return [phase for phase in PHASES if phase != 'precompute' or hasattr(module, 'precompute')]
+
+def run_phase(module: ModuleType, phase: str, text: str, parsed) -> 'tuple[object, object]':
+    """
+    Runs one phase and returns the (possibly new) parsed input along with the
+    phase's answer, which is None for `parse` and `precompute`.
+    """
+    if phase == 'parse':
+        return module.parse(text), None
+    if phase == 'precompute':
+        return module.precompute(parsed), None
+    return parsed, getattr(module, phase)(parsed)
@@ -0,0 +1,36 @@
+"""
+Write a synthetic input for one day.
+
+    python -m aoc.generate 20 50000              # 50000 numbers for day 20 to stdout
+    python -m aoc.generate 23 300 --seed 7 -o big.txt
+
+What `size` means depends on the day (number of elves, grid dimension, number
+of packets, sensor count, valve count, ...); see the docstring at the top of
+each `day_XX/generate.py`. The same day, size and seed always produce the same
+input.
+"""
+import argparse
+import sys
+
+from aoc.days import find_days, load_generator
+
+def main(argv: 'list[str]|None' = None):
+    parser = argparse.ArgumentParser(prog='python -m aoc.generate', description='Generate a synthetic puzzle input.')
+    parser.add_argument('day', type=int)
+    parser.add_argument('size', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help='file to write to (default: stdout)')
+    args = parser.parse_args(argv)
+
+    if args.day not in find_days():
+        parser.error(f'no solution for day {args.day}')
+
+    text = load_generator(args.day).generate(args.size, args.seed)
+    if args.output is None:
+        sys.stdout.write(text)
+    else:
+        with open(args.output, 'w') as outf:
+            outf.write(text)
+
+if __name__ == '__main__':
+    main()
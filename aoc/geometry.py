@@ -0,0 +1,105 @@
+"""
+Small integer vectors shared by the grid and simulation days.
+
+These end up by the hundred thousand in sets and dicts (the day 17 chamber,
+the day 18 cubes, the day 23 elves), so they are built for that: `__slots__`
+instead of a `__dict__`, a hash computed once at construction, and no type
+checks in the operators. They are treated as immutable; nothing may assign to
+`x`/`y`/`z` after construction, or the cached hash goes stale.
+
+When a set of points is only ever tested for membership, the packed encoding
+(`x + y * width`, see `packed`/`from_packed`) is cheaper still: a plain int
+per point.
+"""
+
+class Vector2:
+    __slots__ = ('x', 'y', '_hash')
+
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
+        self._hash = hash((x, y))
+
+    def __str__(self):
+        return f'({self.x}, {self.y})'
+
+    def __repr__(self):
+        return f'Vector2({self.x}, {self.y})'
+
+    def __eq__(self, other):
+        try:
+            return self._hash == other._hash and self.x == other.x and self.y == other.y
+        except AttributeError:
+            return NotImplemented
+
+    def __hash__(self):
+        return self._hash
+
+    def __add__(self, other: 'Vector2') -> 'Vector2':
+        return Vector2(self.x + other.x, self.y + other.y)
+
+    def __sub__(self, other: 'Vector2') -> 'Vector2':
+        return Vector2(self.x - other.x, self.y - other.y)
+
+    def __mod__(self, other: 'Vector2') -> 'Vector2':
+        return Vector2(self.x % other.x, self.y % other.y)
+
+    def __mul__(self, scalar: int) -> 'Vector2':
+        return Vector2(self.x * scalar, self.y * scalar)
+
+    __rmul__ = __mul__
+
+    def packed(self, width: int) -> int:
+        """
+        Encodes the vector as `x + y * width`. Only round-trips through
+        `from_packed` for 0 <= x < width.
+        """
+        return self.x + self.y * width
+
+    @staticmethod
+    def from_packed(value: int, width: int) -> 'Vector2':
+        y, x = divmod(value, width)
+        return Vector2(x, y)
+
+class Vector3:
+    __slots__ = ('x', 'y', 'z', '_hash')
+
+    def __init__(self, x: int, y: int, z: int):
+        self.x = x
+        self.y = y
+        self.z = z
+        self._hash = hash((x, y, z))
+
+    def __str__(self):
+        return f'({self.x}, {self.y}, {self.z})'
+
+    def __repr__(self):
+        return f'Vector3({self.x}, {self.y}, {self.z})'
+
+    def __eq__(self, other):
+        try:
+            return self._hash == other._hash and self.x == other.x and self.y == other.y and self.z == other.z
+        except AttributeError:
+            return NotImplemented
+
+    def __hash__(self):
+        return self._hash
+
+    def __add__(self, other: 'Vector3') -> 'Vector3':
+        return Vector3(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other: 'Vector3') -> 'Vector3':
+        return Vector3(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def packed(self, width: int, depth: int) -> int:
+        """
+        Encodes the vector as `x + (y + z * depth) * width`. Only round-trips
+        through `from_packed` for 0 <= x < width and 0 <= y < depth.
+        """
+        return self.x + (self.y + self.z * depth) * width
+
+    @staticmethod
+    def from_packed(value: int, width: int, depth: int) -> 'Vector3':
+        rest, x = divmod(value, width)
+        z, y = divmod(rest, depth)
+        return Vector3(x, y, z)
@@ -0,0 +1,94 @@
+"""
+A rectangular grid of bytes stored in one flat `bytearray`.
+
+Cell (x, y) lives at index `x + y * width`, so a lookup is one multiply-add
+and one byte load instead of two list indirections, and a cell costs one byte
+instead of a pointer plus an object. Hot loops should work on flat indices
+directly: step by `offsets()` to reach neighbors and by `width` to move
+between rows.
+"""
+
+# (dx, dy) steps, clockwise from up
+ORTHOGONAL = ((0, -1), (1, 0), (0, 1), (-1, 0))
+DIAGONAL = ((1, -1), (1, 1), (-1, 1), (-1, -1))
+ALL_DIRECTIONS = ((0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1))
+
+class Grid2D:
+    def __init__(self, width: int, height: int, fill: int = 0, cells: 'bytearray|None' = None):
+        self.width = width
+        self.height = height
+        if cells is None:
+            cells = bytearray([fill]) * (width * height)
+        assert len(cells) == width * height
+        self.cells = cells
+
+    @staticmethod
+    def from_text(text: str, pad: str = ' ') -> 'Grid2D':
+        """
+        Builds a grid from newline-separated rows, padding short rows on the
+        right with `pad`.
+        """
+        lines = text.split('\n')
+        width = max(len(line) for line in lines)
+        cells = bytearray(''.join(line.ljust(width, pad) for line in lines).encode())
+        return Grid2D(width, len(lines), cells=cells)
+
+    def index(self, x: int, y: int) -> int:
+        return x + y * self.width
+
+    def coords(self, index: int) -> 'tuple[int, int]':
+        y, x = divmod(index, self.width)
+        return x, y
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def __getitem__(self, pos: 'tuple[int, int]') -> int:
+        x, y = pos
+        return self.cells[x + y * self.width]
+
+    def __setitem__(self, pos: 'tuple[int, int]', value: int):
+        x, y = pos
+        self.cells[x + y * self.width] = value
+
+    def get(self, x: int, y: int, default: 'int|None' = None) -> 'int|None':
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cells[x + y * self.width]
+        return default
+
+    def row(self, y: int) -> memoryview:
+        """
+        A writable view of row `y` that shares memory with the grid.
+        """
+        start = y * self.width
+        return memoryview(self.cells)[start:start + self.width]
+
+    def row_indices(self, y: int) -> range:
+        return range(y * self.width, (y + 1) * self.width)
+
+    def column_indices(self, x: int) -> range:
+        return range(x, self.width * self.height, self.width)
+
+    def offsets(self, directions: 'tuple[tuple[int, int], ...]' = ORTHOGONAL) -> 'tuple[int, ...]':
+        """
+        Flat index deltas for `directions`. Adding one to an index only lands
+        on the intended neighbor when the cell isn't on the edge the step
+        crosses; use `neighbors` when that isn't known.
+        """
+        return tuple(dx + dy * self.width for dx, dy in directions)
+
+    def neighbors(self, index: int, directions: 'tuple[tuple[int, int], ...]' = ORTHOGONAL) -> 'list[int]':
+        y, x = divmod(index, self.width)
+        out = []
+        for dx, dy in directions:
+            nx = x + dx
+            ny = y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                out.append(nx + ny * self.width)
+        return out
+
+    def copy(self) -> 'Grid2D':
+        return Grid2D(self.width, self.height, cells=bytearray(self.cells))
+
+    def __str__(self):
+        return '\n'.join(self.cells[i:i + self.width].decode() for i in range(0, len(self.cells), self.width))
@@ -0,0 +1,155 @@
+"""
+Sets of integers stored as sorted, disjoint, inclusive intervals.
+
+An `IntervalSet` keeps the starts and ends of its intervals in two parallel
+`array('q')`s, merging overlapping and adjacent intervals as they are added,
+so membership ("stabbing") and containment queries are a bisect. A loop
+building one set per row can reuse a single set: `clear` it and `add` the
+row's intervals, which keeps the arrays' storage and, for intervals added
+roughly in order, only appends to or extends the last one. `assign` replaces
+the contents from an iterable in any order, at the cost of sorting a copy.
+
+The free functions `contains` and `overlaps` answer the same questions for
+two bare `(start, end)` pairs, for code that only ever has two intervals.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+
+def contains(outer: 'tuple[int, int]', inner: 'tuple[int, int]') -> bool:
+    return outer[0] <= inner[0] and inner[1] <= outer[1]
+
+def overlaps(a: 'tuple[int, int]', b: 'tuple[int, int]') -> bool:
+    return a[0] <= b[1] and b[0] <= a[1]
+
+class IntervalSet:
+    __slots__ = ('starts', 'ends')
+
+    def __init__(self, intervals=()):
+        self.starts = array('q')
+        self.ends = array('q')
+        self.assign(intervals)
+
+    def assign(self, intervals):
+        """
+        Replaces the contents with the union of `intervals`, an iterable of
+        inclusive `(start, end)` pairs in any order.
+        """
+        starts = self.starts
+        ends = self.ends
+        self.clear()
+        curr_end = None
+        for start, end in sorted(intervals):
+            if curr_end is not None and start <= curr_end + 1:
+                if end > curr_end:
+                    curr_end = ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+                curr_end = end
+
+    def add(self, start: int, end: int):
+        """
+        Adds the inclusive interval [start, end], merging it with every
+        interval it overlaps or touches.
+        """
+        starts = self.starts
+        ends = self.ends
+        # Intervals added roughly in order mostly land at the end
+        if not starts or start > ends[-1] + 1:
+            starts.append(start)
+            ends.append(end)
+            return
+        if start >= starts[-1]:
+            if end > ends[-1]:
+                ends[-1] = end
+            return
+        # First interval that ends at or after start - 1, and first that
+        # starts after end + 1
+        lo = bisect_left(ends, start - 1)
+        hi = bisect_right(starts, end + 1)
+        if lo == hi:
+            starts.insert(lo, start)
+            ends.insert(lo, end)
+            return
+        # Merge into the first overlapped interval in place and drop the rest
+        if starts[lo] < start:
+            start = starts[lo]
+        if ends[hi - 1] > end:
+            end = ends[hi - 1]
+        starts[lo] = start
+        ends[lo] = end
+        if hi - lo > 1:
+            del starts[lo + 1:hi]
+            del ends[lo + 1:hi]
+
+    def clear(self):
+        """
+        Empties the set, keeping its storage for refilling with `add`.
+        """
+        del self.starts[:]
+        del self.ends[:]
+
+    def __contains__(self, value: int) -> bool:
+        i = bisect_right(self.starts, value) - 1
+        return i >= 0 and value <= self.ends[i]
+
+    def covers(self, start: int, end: int) -> bool:
+        """
+        Whether every integer in [start, end] is in the set.
+        """
+        i = bisect_right(self.starts, start) - 1
+        return i >= 0 and end <= self.ends[i]
+
+    def clip(self, lo: int, hi: int) -> 'IntervalSet':
+        """
+        The part of the set inside [lo, hi].
+        """
+        out = IntervalSet()
+        for start, end in self:
+            if end >= lo and start <= hi:
+                out.starts.append(max(start, lo))
+                out.ends.append(min(end, hi))
+        return out
+
+    def complement(self, lo: int, hi: int) -> 'IntervalSet':
+        """
+        The integers in [lo, hi] that are not in the set.
+        """
+        out = IntervalSet()
+        curr = lo
+        for start, end in self:
+            if end < curr:
+                continue
+            if start > hi:
+                break
+            if start > curr:
+                out.starts.append(curr)
+                out.ends.append(start - 1)
+            curr = end + 1
+        if curr <= hi:
+            out.starts.append(curr)
+            out.ends.append(hi)
+        return out
+
+    def length(self) -> int:
+        """
+        The number of integers in the set.
+        """
+        return sum(self.ends) - sum(self.starts) + len(self.starts)
+
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __bool__(self):
+        return len(self.starts) > 0
+
+    def __eq__(self, other):
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self.starts == other.starts and self.ends == other.ends
+
+    def __repr__(self):
+        return f'IntervalSet({list(self)})'
@@ -0,0 +1,65 @@
+"""
+Memoized answers for the runner.
+
+A day's answers only change when its input or its code does, so the runner
+remembers them keyed by the SHA-256 of the day's `input.txt` together with
+its `solution.py` and the shared `aoc` modules it may import (a day that runs
+its sample input has it in `solution.py`, so that is covered too). Entries live
+in one JSON file, ordered from least to most recently used; once there are
+more than `max_entries` the least recently used ones are dropped.
+"""
+from pathlib import Path
+import hashlib
+import json
+import os
+
+from aoc.days import ROOT, find_days, input_path
+
+MEMO_PATH = ROOT / '.cache' / 'answers.json'
+DEFAULT_MAX_ENTRIES = 128
+
+def source_digest(day: int) -> str:
+    digest = hashlib.sha256(find_days()[day].read_bytes())
+    for shared in sorted((ROOT / 'aoc').glob('*.py')):
+        digest.update(shared.read_bytes())
+    return digest.hexdigest()
+
+def input_digest(day: int) -> str:
+    try:
+        return hashlib.sha256(input_path(day).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return 'no input'
+
+def memo_key(day: int) -> str:
+    return f'{day}:{input_digest(day)}:{source_digest(day)}'
+
+class AnswerMemo:
+    def __init__(self, path: Path = MEMO_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        try:
+            with path.open('r') as inf:
+                self.entries: 'dict[str, list]' = json.load(inf)
+        except (FileNotFoundError, ValueError):
+            self.entries = {}
+
+    def get(self, key: str) -> 'tuple[str, str]|None':
+        answers = self.entries.pop(key, None)
+        if answers is None:
+            return None
+        # Re-inserting moves the entry to the most recently used end
+        self.entries[key] = answers
+        return tuple(answers)
+
+    def put(self, key: str, answers: 'tuple[str, str]'):
+        self.entries.pop(key, None)
+        self.entries[key] = list(answers)
+        while len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        with tmp_path.open('w') as outf:
+            json.dump(self.entries, outf, indent=1)
+        os.replace(tmp_path, self.path)
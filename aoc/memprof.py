@@ -0,0 +1,166 @@
+"""
+Profile the memory each day's phases allocate.
+
+    python -m aoc.memprof                   # profile every day
+    python -m aoc.memprof 16 17 24 -n 5     # show the top 5 allocation sites per phase
+    python -m aoc.memprof 17 --size 5000    # profile a generated input
+    python -m aoc.memprof -o memory.json    # save results
+
+Each day runs in a fresh worker process with `tracemalloc` tracing every
+allocation, and the parse cache is bypassed so that parse and precompute are
+really measured. For every phase this reports:
+
+- the traced peak: the most memory Python had allocated at once during the
+  phase, counting what earlier phases still hold;
+- the retained size: how much more is allocated at the end of the phase than
+  at its start (what it leaves behind for the next phase);
+- the peak RSS of the process once the phase is done;
+- the source lines responsible for most of the retained size.
+
+Allocation sites are only known for memory that is still alive when the phase
+ends, so a phase that builds a large temporary and frees it shows up in its
+peak but not in its sites. Tracing slows the days down several times and its
+own bookkeeping counts towards RSS (not towards the traced sizes).
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from aoc.days import ROOT, day_phases, find_days, load_day, load_generator, load_input, run_phase
+from aoc.runner import peak_rss_kb, render_table
+
+DEFAULT_TOP = 3
+
+# Allocations made by the profiler, the worker's executor threads and the
+# import machinery (the day module importing its dependencies) aren't the
+# day's doing
+IGNORED_FRAMES = (
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, threading.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+def format_site(frame: tracemalloc.Frame) -> str:
+    try:
+        filename = os.path.relpath(frame.filename, ROOT)
+    except ValueError:
+        filename = frame.filename
+    return f'{filename}:{frame.lineno}'
+
+def top_sites(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, top: int) -> 'list[dict]':
+    """
+    The `top` source lines whose live allocations grew the most between the
+    two snapshots.
+    """
+    sites = []
+    for stat in after.compare_to(before, 'lineno')[:top]:
+        if stat.size_diff <= 0:
+            break
+        sites.append({'site': format_site(stat.traceback[0]), 'size': stat.size_diff, 'count': stat.count_diff})
+    return sites
+
+def profile_day(day: int, top: int = DEFAULT_TOP, size: 'int|None' = None, seed: int = 0) -> dict:
+    """
+    Returns the JSON record for one day: per-phase memory figures, or the
+    error that stopped the day from running. Meant to run in a process of its
+    own, since it starts and stops `tracemalloc`.
+    """
+    phases = {}
+    try:
+        module = load_day(day)
+        if size is None:
+            text = load_input(day, module)
+        else:
+            text = load_generator(day).generate(size, seed)
+
+        # Snapshots are only compared once tracing has stopped, so that the
+        # comparison's own allocations don't show up as allocation sites
+        snapshots = []
+        tracemalloc.start()
+        try:
+            parsed = None
+            snapshots.append(tracemalloc.take_snapshot())
+            for phase in day_phases(module):
+                start_size, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                parsed, _ = run_phase(module, phase, text, parsed)
+                end_size, peak = tracemalloc.get_traced_memory()
+                snapshots.append(tracemalloc.take_snapshot())
+                phases[phase] = {
+                    'peak': peak,
+                    'retained': end_size - start_size,
+                    'rss_kb': peak_rss_kb(),
+                }
+        finally:
+            tracemalloc.stop()
+            snapshots = [snapshot.filter_traces(IGNORED_FRAMES) for snapshot in snapshots]
+            for i, stats in enumerate(phases.values()):
+                stats['sites'] = top_sites(snapshots[i], snapshots[i + 1], top)
+    except Exception as e:
+        return {'phases': phases, 'error': f'{e.__class__.__name__}: {e}'}
+    return {'phases': phases}
+
+def format_mb(size: int) -> str:
+    return f'{size / (1024 * 1024):.1f}'
+
+def format_results(results: 'dict[int, dict]') -> str:
+    rows = [('Day', 'Phase', 'Traced peak (MB)', 'Retained (MB)', 'Peak RSS (MB)', 'Top allocation sites')]
+    for day, record in results.items():
+        for phase, stats in record['phases'].items():
+            sites = stats['sites'] or [None]
+            for i, site in enumerate(sites):
+                if i == 0:
+                    row = (f'{day:02d}', phase, format_mb(stats['peak']), format_mb(stats['retained']), f'{stats["rss_kb"] / 1024:.1f}')
+                else:
+                    row = ('', '', '', '', '')
+                if site is not None:
+                    row += (f'{site["size"] / 1024:.1f} kB in {site["count"]} blocks at {site["site"]}',)
+                else:
+                    row += ('',)
+                rows.append(row)
+        if 'error' in record:
+            rows.append((f'{day:02d}', 'error', '', '', '', record['error']))
+    return render_table(rows)
+
+def main(argv: 'list[str]|None' = None):
+    parser = argparse.ArgumentParser(prog='python -m aoc.memprof', description='Profile the memory used by each phase of Advent of Code solutions.')
+    parser.add_argument('days', nargs='*', type=int, help='days to profile (default: all)')
+    parser.add_argument('-n', '--top', type=int, default=DEFAULT_TOP, help=f'allocation sites to report per phase (default: {DEFAULT_TOP})')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='number of worker processes (default: core count)')
+    parser.add_argument('--size', type=int, help='profile a generated input of this size instead of input.txt')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the generated input (default: 0)')
+    parser.add_argument('-o', '--output', help='write results to this JSON file')
+    args = parser.parse_args(argv)
+
+    days = list(find_days())
+    if args.days:
+        missing = [d for d in args.days if d not in days]
+        if missing:
+            parser.error(f'no solution for day(s) {", ".join(str(d) for d in missing)}')
+        days = args.days
+
+    results = {}
+    # A fresh process per day, as in the runner, so that RSS and tracing
+    # start from a clean slate
+    with ProcessPoolExecutor(max_workers=args.jobs, max_tasks_per_child=1) as executor:
+        futures = {executor.submit(profile_day, day, args.top, args.size, args.seed): day for day in days}
+        for future in as_completed(futures):
+            print(f'Day {futures[future]:02d} profiled', file=sys.stderr)
+            results[futures[future]] = future.result()
+    results = dict(sorted(results.items()))
+
+    if args.output is not None:
+        with open(args.output, 'w') as outf:
+            json.dump({'meta': {'size': args.size, 'seed': args.seed}, 'days': {str(day): record for day, record in results.items()}}, outf, indent=2)
+
+    print(format_results(results))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+CPU profiles of a day's phases, for `python -m aoc --profile DIR`.
+
+Two profiles are written per day, both covering only the phases (not the
+module-level code or the runner around them):
+
+- `day_XX-<phase>.pstats`: a deterministic cProfile profile of each phase,
+  for `python -m pstats`, snakeviz and friends. It comes from a separate run
+  of the day, since cProfile's per-call overhead would skew the timings.
+- `day_XX.collapsed`: stacks sampled during the timed run, one
+  `phase;outer;...;inner count` line per distinct stack, which is the input
+  format of flamegraph.pl, speedscope and inferno. Samples are taken about
+  every millisecond of CPU time (the kernel rounds the interval up to its
+  timer tick), which costs little enough that the runner's timings stay
+  meaningful.
+
+Sampling uses `SIGPROF`, so it is only available on Unix, and only in the
+main thread of the process (which is where the runner's workers run days).
+"""
+from pathlib import Path
+from types import ModuleType
+import cProfile
+import os
+import signal
+import sys
+
+from aoc.days import ROOT, day_phases, run_phase
+
+DEFAULT_INTERVAL = 0.001
+
+def frame_label(code) -> str:
+    filename = code.co_filename
+    if filename.startswith(str(ROOT)):
+        filename = os.path.relpath(filename, ROOT)
+    # ';' separates frames in the collapsed format
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'.replace(';', ':')
+
+class StackSampler:
+    """
+    Counts the Python stacks seen every `interval` seconds of CPU time while
+    started. Stacks are cut off at the frame that called `start`, and rooted
+    at the label given to it.
+    """
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self.counts: 'dict[str, int]' = {}
+        self.labels: 'dict[object, str]' = {}
+        self.label = ''
+        self.base = None
+
+    def start(self, label: str):
+        self.label = label
+        self.base = sys._getframe(1)
+        signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, signal.SIG_DFL)
+        self.base = None
+
+    def _sample(self, signum, frame):
+        stack = []
+        labels = self.labels
+        while frame is not None and frame is not self.base:
+            code = frame.f_code
+            label = labels.get(code)
+            if label is None:
+                label = labels[code] = frame_label(code)
+            stack.append(label)
+            frame = frame.f_back
+        stack.append(self.label)
+        stack.reverse()
+        key = ';'.join(stack)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def write_collapsed(self, path: Path):
+        with path.open('w') as outf:
+            for stack, count in sorted(self.counts.items()):
+                outf.write(f'{stack} {count}\n')
+
+def write_pstats(day: int, module: ModuleType, text: str, out_dir: Path) -> 'list[Path]':
+    """
+    Runs every phase of the day under cProfile and writes one `.pstats` file
+    per phase.
+    """
+    paths = []
+    parsed = None
+    for phase in day_phases(module):
+        profiler = cProfile.Profile()
+        parsed, _ = profiler.runcall(run_phase, module, phase, text, parsed)
+        path = out_dir / f'day_{day:02d}-{phase}.pstats'
+        profiler.dump_stats(path)
+        paths.append(path)
+    return paths
@@ -0,0 +1,86 @@
+"""
+Progress bars that stay out of hot loops.
+
+A `Progress` is told where a loop has got to every so often rather than on
+every iteration: the loop reports a batch with `update(n)` once per outer
+iteration, or its absolute position with `set(count)` every few thousand
+iterations. Like `aoc.trace.Tracer`, inner loops should test `enabled` once
+up front so that a disabled bar costs nothing at all:
+
+    with Progress(len(rows), enabled=progress) as bar:
+        reporting = bar.enabled
+        for i, row in enumerate(rows):
+            ...
+            if reporting and i % 1024 == 0:
+                bar.set(i)
+
+tqdm is only imported once a bar is actually shown, so importing a day never
+pays for it; without tqdm installed, a percentage is printed instead.
+"""
+import sys
+import time
+
+class _PercentBar:
+    """
+    Stands in for tqdm when it isn't installed: rewrites one line on stderr
+    at most every `min_interval` seconds.
+    """
+    def __init__(self, total: int, desc: str, min_interval: float):
+        self.total = total
+        self.desc = f'{desc}: ' if desc else ''
+        self.min_interval = min_interval
+        self.n = 0
+        self.last_print = 0.0
+
+    def update(self, n: int):
+        self.n += n
+        now = time.monotonic()
+        if now - self.last_print >= self.min_interval:
+            self.last_print = now
+            print(f'\r{self.desc}{self.n / max(self.total, 1):.0%}', end='', file=sys.stderr)
+
+    def close(self):
+        print(f'\r{self.desc}{self.n / max(self.total, 1):.0%}', file=sys.stderr)
+
+class Progress:
+    def __init__(self, total: int, desc: str = '', enabled: bool = True, min_interval: float = 0.1):
+        self.total = total
+        self.desc = desc
+        self.enabled = enabled
+        self.min_interval = min_interval
+        self.count = 0
+        self._bar = None
+
+    def __enter__(self) -> 'Progress':
+        if self.enabled:
+            try:
+                from tqdm import tqdm
+            except ImportError:
+                self._bar = _PercentBar(self.total, self.desc, self.min_interval)
+            else:
+                self._bar = tqdm(total=self.total, desc=self.desc or None, mininterval=self.min_interval)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._bar is not None:
+            self._bar.close()
+            self._bar = None
+
+    def update(self, n: int = 1):
+        """
+        Advances the bar by a batch of `n` steps.
+        """
+        if self._bar is not None:
+            self.count += n
+            self._bar.update(n)
+
+    def set(self, count: int):
+        """
+        Moves the bar to `count` steps done.
+        """
+        if self._bar is not None and count != self.count:
+            self._bar.update(count - self.count)
+            self.count = count
+
+    def __bool__(self):
+        return self.enabled
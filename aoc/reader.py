@@ -0,0 +1,93 @@
+"""
+Lazy record readers for puzzle input.
+
+`text.strip().split('\n')` builds a list with every line of the input before
+the first one is looked at, on top of the text itself. These readers yield one
+record at a time instead, so a parser that folds them into its own structure
+never holds more than that structure and the current line.
+
+Every reader accepts the input as a `str`, or as `bytes`/an `mmap` of the
+input file (see `map_file`). A mapped file is paged in by the OS on demand
+and never copied into the process as a whole, which matters for inputs of
+hundreds of megabytes. Days whose `parse` goes through these readers set
+`MAPPED_INPUT = True`; tools may then hand them a mapped file instead of the
+text.
+
+    iter_lines(source)     every line, without its line ending
+    nonblank_lines(source) stripped lines, skipping blank ones
+    iter_blocks(source)    runs of non-blank lines separated by blank lines
+
+`chunk_spans` cuts bytes or a mapped file into pieces of about a given size
+that never split a record, for parsers that work a chunk at a time.
+"""
+from contextlib import contextmanager
+from pathlib import Path
+import io
+import mmap
+
+def iter_lines(source: 'str|bytes|mmap.mmap'):
+    if isinstance(source, str):
+        lines = io.StringIO(source)
+    else:
+        if isinstance(source, mmap.mmap):
+            source.seek(0)
+            lines = iter(source.readline, b'')
+        else:
+            lines = io.BytesIO(source)
+        lines = (line.decode() for line in lines)
+    for line in lines:
+        yield line.rstrip('\r\n')
+
+def nonblank_lines(source: 'str|bytes|mmap.mmap'):
+    """
+    Yields the stripped non-blank lines: the same records as
+    `[line.strip() for line in text.strip().split('\\n')]` for input without
+    blank lines in the middle.
+    """
+    for line in iter_lines(source):
+        line = line.strip()
+        if line:
+            yield line
+
+def iter_blocks(source: 'str|bytes|mmap.mmap'):
+    """
+    Yields each group of consecutive non-blank lines as a list of stripped
+    lines (the elves of day 1, the monkeys of day 11, the packet pairs of day
+    13).
+    """
+    block = []
+    for line in iter_lines(source):
+        line = line.strip()
+        if line:
+            block.append(line)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+def chunk_spans(source: 'bytes|mmap.mmap', chunk_size: int, separator: bytes = b'\n'):
+    """
+    Yields (start, end) spans covering `source`, each about `chunk_size`
+    bytes long and ending just after a `separator` (or at the end of
+    `source`), so that records ending in `separator` are never split.
+    """
+    start = 0
+    while start < len(source):
+        end = source.find(separator, start + chunk_size)
+        end = len(source) if end < 0 else end + len(separator)
+        yield start, end
+        start = end
+
+@contextmanager
+def map_file(path: Path):
+    """
+    Maps `path` read-only for the duration of the `with` block. An empty file
+    maps to empty bytes, since `mmap` refuses zero-length mappings.
+    """
+    with open(path, 'rb') as inf:
+        if inf.seek(0, io.SEEK_END) == 0:
+            yield b''
+            return
+        with mmap.mmap(inf.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
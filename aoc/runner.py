@@ -0,0 +1,236 @@
+"""
+Run every day's solution in parallel and print a timing table.
+
+    python -m aoc                 # run all days
+    python -m aoc 15 16 17        # run only the listed days
+    python -m aoc -j 4            # limit the number of worker processes
+
+Each day runs in its own worker process (one process per day, so the peak RSS
+reported for a day is not polluted by whatever ran before it). The worker
+imports the day's solution module and times its parse, precompute (for days
+that have one), part 1 and part 2 phases separately. The sources are compiled
+to bytecode once up front so that the workers don't each compile them again
+(see `aoc.days.precompile`).
+
+Parsed inputs are cached on disk (see `aoc.cache`), so a second run of an
+unchanged input skips parsing and precomputation; pass `--no-cache` to always
+parse. Answers are memoized as well (see `aoc.memo`): a day whose input and
+code haven't changed since it last ran successfully isn't run again unless
+`--recompute` is given.
+
+    python -m aoc 19 --profile profiles/
+
+also profiles the listed days' phases (see `aoc.profiling`), writing
+cProfile `.pstats` files and collapsed stacks for flamegraph tools to
+`profiles/`. Profiling always runs the days and always parses.
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from aoc.cache import load_cached, store_cached
+from aoc.days import day_phases, find_days, load_day, load_input, precompile, run_phase
+from aoc.memo import DEFAULT_MAX_ENTRIES, AnswerMemo, memo_key
+from aoc.profiling import StackSampler, write_pstats
+
+def peak_rss_kb() -> int:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss //= 1024
+    return rss
+
+class PhaseRecord:
+    def __init__(self, phase: str, answer: str, wall: float, cpu: float, rss_kb: int):
+        self.phase = phase
+        self.answer = answer
+        self.wall = wall
+        self.cpu = cpu
+        self.rss_kb = rss_kb
+
+class DayResult:
+    def __init__(self, day: int, phases: 'list[PhaseRecord]', wall: float, cpu: float, rss_kb: int, error: 'str|None' = None, memoized: bool = False):
+        self.day = day
+        self.phases = phases
+        self.wall = wall
+        self.cpu = cpu
+        self.rss_kb = rss_kb
+        self.error = error
+        self.memoized = memoized
+
+    @staticmethod
+    def from_memo(day: int, answers: 'tuple[str, str]') -> 'DayResult':
+        phases = [PhaseRecord(phase, answer, 0, 0, 0) for phase, answer in zip(('part1', 'part2'), answers)]
+        return DayResult(day, phases, 0, 0, 0, memoized=True)
+
+    @property
+    def answers(self) -> 'tuple[str|None, str|None]':
+        answers = {record.phase: record.answer for record in self.phases}
+        return (answers.get('part1'), answers.get('part2'))
+
+def format_answer(answer) -> str:
+    if answer is None:
+        return ''
+    # Day 10's part 2 answer is drawn on a CRT
+    return ' / '.join(str(answer).split('\n'))
+
+def run_day(day: int, use_cache: bool = True, profile_dir: 'Path|None' = None) -> DayResult:
+    """
+    Runs and times one day. With `profile_dir`, the timed run is sampled for
+    collapsed stacks and the day is then run again under cProfile.
+    """
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    phases = []
+    error = None
+    sampler = StackSampler() if profile_dir is not None else None
+    try:
+        module = load_day(day)
+        text = load_input(day, module)
+
+        parsed, hit = load_cached(day, module, text) if use_cache else (None, False)
+        # The cache holds the input as the parts receive it, so it is stored
+        # after the last phase that builds it
+        prepared_by = 'precompute' if hasattr(module, 'precompute') else 'parse'
+        for phase in day_phases(module):
+            if hit and phase == 'precompute':
+                continue
+            phase_wall = time.perf_counter()
+            phase_cpu = time.process_time()
+            if hit and phase == 'parse':
+                answer = 'cached'
+            else:
+                if sampler is not None:
+                    sampler.start(phase)
+                try:
+                    parsed, answer = run_phase(module, phase, text, parsed)
+                finally:
+                    if sampler is not None:
+                        sampler.stop()
+                answer = format_answer(answer)
+                if use_cache and phase == prepared_by:
+                    store_cached(day, module, text, parsed)
+            phases.append(PhaseRecord(phase, answer, time.perf_counter() - phase_wall, time.process_time() - phase_cpu, peak_rss_kb()))
+    except Exception as e:
+        error = f'{e.__class__.__name__}: {e}'
+    result = DayResult(
+        day,
+        phases,
+        time.perf_counter() - start_wall,
+        time.process_time() - start_cpu,
+        peak_rss_kb(),
+        error
+    )
+
+    if profile_dir is not None and error is None:
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        sampler.write_collapsed(profile_dir / f'day_{day:02d}.collapsed')
+        try:
+            write_pstats(day, module, text, profile_dir)
+        except Exception as e:
+            result.error = f'profiling failed: {e.__class__.__name__}: {e}'
+    return result
+
+def format_table(results: 'list[DayResult]') -> str:
+    rows = [('Day', 'Phase', 'Wall (s)', 'CPU (s)', 'Peak RSS (MB)', 'Answer')]
+    for result in results:
+        for record in result.phases:
+            rows.append((
+                f'{result.day:02d}',
+                record.phase,
+                f'{record.wall:.3f}',
+                f'{record.cpu:.3f}',
+                f'{record.rss_kb / 1024:.1f}',
+                record.answer
+            ))
+        rows.append((
+            f'{result.day:02d}',
+            'total',
+            f'{result.wall:.3f}',
+            f'{result.cpu:.3f}',
+            f'{result.rss_kb / 1024:.1f}',
+            result.error or ('memoized' if result.memoized else '')
+        ))
+
+    return render_table(rows)
+
+def render_table(rows: 'list[tuple[str, ...]]') -> str:
+    """
+    Lays out `rows` (the first one being the header) as a text table. Every
+    column but the last is right-aligned; the last is left ragged since it
+    holds free-form text like answers or errors.
+    """
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]) - 1)]
+    out = ''
+    for i, row in enumerate(rows):
+        out += ' | '.join(cell.rjust(width) for cell, width in zip(row, widths)) + ' | ' + row[-1] + '\n'
+        if i == 0:
+            out += '-+-'.join('-' * width for width in widths) + '-+-' + ('-' * len(row[-1])) + '\n'
+    return out
+
+def run_days(days: 'list[int]', jobs: int, use_cache: bool = True, profile_dir: 'Path|None' = None) -> 'list[DayResult]':
+    results = []
+    # max_tasks_per_child=1 gives every day a fresh interpreter so that
+    # ru_maxrss is the peak of that day alone
+    with ProcessPoolExecutor(max_workers=jobs, max_tasks_per_child=1) as executor:
+        futures = {executor.submit(run_day, day, use_cache, profile_dir): day for day in days}
+        for future in as_completed(futures):
+            result = future.result()
+            print(f'Day {result.day:02d} finished in {result.wall:.3f}s', file=sys.stderr)
+            results.append(result)
+    results.sort(key=lambda r: r.day)
+    return results
+
+def main(argv: 'list[str]|None' = None):
+    parser = argparse.ArgumentParser(prog='python -m aoc', description='Run Advent of Code solutions in parallel.')
+    parser.add_argument('days', nargs='*', type=int, help='days to run (default: all)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='number of worker processes (default: core count)')
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false', help='always parse instead of loading cached parsed inputs')
+    parser.add_argument('--recompute', action='store_true', help='run every day even if its answers are memoized')
+    parser.add_argument('--profile', type=Path, metavar='DIR', help='write per-phase .pstats files and collapsed stacks of the days to DIR (implies --recompute and --no-cache)')
+    parser.add_argument('--memo-size', type=int, default=DEFAULT_MAX_ENTRIES, help=f'number of memoized answers to keep (default: {DEFAULT_MAX_ENTRIES})')
+    args = parser.parse_args(argv)
+
+    days = list(find_days())
+    if args.days:
+        missing = [d for d in args.days if d not in days]
+        if missing:
+            parser.error(f'no solution for day(s) {", ".join(str(d) for d in missing)}')
+        days = args.days
+    if args.profile is not None:
+        args.recompute = True
+        args.use_cache = False
+
+    start = time.perf_counter()
+    memo = AnswerMemo(max_entries=args.memo_size)
+    keys = {day: memo_key(day) for day in days}
+    results = []
+    to_run = []
+    for day in days:
+        answers = None if args.recompute else memo.get(keys[day])
+        if answers is None:
+            to_run.append(day)
+        else:
+            results.append(DayResult.from_memo(day, answers))
+
+    if to_run:
+        precompile()
+    for result in run_days(to_run, args.jobs, args.use_cache, args.profile):
+        if result.error is None:
+            memo.put(keys[result.day], result.answers)
+        results.append(result)
+    memo.save()
+    results.sort(key=lambda r: r.day)
+    elapsed = time.perf_counter() - start
+
+    print(format_table(results))
+    print(f'Ran {len(results)} day(s) in {elapsed:.3f}s wall clock')
+    if args.profile is not None:
+        print(f'Profiles written to {args.profile}')
+
+if __name__ == '__main__':
+    main()
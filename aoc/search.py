@@ -0,0 +1,146 @@
+"""
+Graph search over integer node ids.
+
+Nodes are ints in `range(node_count)` (a flat grid index, a packed
+coordinate, a time-expanded state, ...) and the graph is whatever the
+`neighbors` callback says it is, so a search allocates nothing per node
+beyond the queue entry: distances and predecessors live in flat arrays.
+
+    bfs(sources, neighbors, node_count, is_goal=None)
+    dijkstra(sources, neighbors, node_count, is_goal=None, heuristic=None)
+
+Both accept several sources (multi-source search) and stop as soon as a node
+satisfying `is_goal` is settled. `dijkstra` takes `(node, cost)` pairs from
+`neighbors` and becomes A* when given a heuristic. `TimeExpanded` numbers
+(position, time) states for graphs that change over time with some period.
+"""
+from array import array
+import heapq
+
+UNREACHED = -1
+
+class SearchResult:
+    def __init__(self, dist: array, pred: array, visited: 'list[int]', goal: 'int|None'):
+        # dist[node] is the distance from the nearest source, or UNREACHED
+        self.dist = dist
+        # pred[node] is the node it was reached from; sources are their own
+        # predecessor
+        self.pred = pred
+        # Nodes in the order they were settled
+        self.visited = visited
+        # The goal node the search stopped at, if any
+        self.goal = goal
+
+    @property
+    def found(self) -> bool:
+        return self.goal is not None
+
+    def path(self, node: 'int|None' = None) -> 'list[int]':
+        """
+        The nodes from a source to `node` (default: the goal), inclusive.
+        """
+        if node is None:
+            if self.goal is None:
+                raise ValueError('The search never reached a goal')
+            node = self.goal
+        elif self.dist[node] == UNREACHED:
+            raise ValueError(f'Node {node} was never reached')
+        out = [node]
+        while self.pred[node] != node:
+            node = self.pred[node]
+            out.append(node)
+        out.reverse()
+        return out
+
+def _new_arrays(node_count: int) -> 'tuple[array, array]':
+    return array('q', [UNREACHED]) * node_count, array('q', [UNREACHED]) * node_count
+
+def bfs(sources, neighbors, node_count: int, is_goal=None) -> SearchResult:
+    """
+    Breadth-first search for unit-cost edges. `neighbors(node)` returns an
+    iterable of adjacent node ids.
+    """
+    dist, pred = _new_arrays(node_count)
+    frontier = []
+    for source in sources:
+        if dist[source] == UNREACHED:
+            dist[source] = 0
+            pred[source] = source
+            frontier.append(source)
+
+    visited = []
+    depth = 0
+    while frontier:
+        next_frontier = []
+        depth += 1
+        for node in frontier:
+            visited.append(node)
+            if is_goal is not None and is_goal(node):
+                return SearchResult(dist, pred, visited, node)
+            for neighbor in neighbors(node):
+                if dist[neighbor] == UNREACHED:
+                    dist[neighbor] = depth
+                    pred[neighbor] = node
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+
+    return SearchResult(dist, pred, visited, None)
+
+def dijkstra(sources, neighbors, node_count: int, is_goal=None, heuristic=None) -> SearchResult:
+    """
+    Shortest paths for non-negative edge costs. `neighbors(node)` returns an
+    iterable of `(node, cost)` pairs. With `heuristic(node)` (an estimate of
+    the remaining cost to the goal) this is A*; nodes are never reopened, so
+    the heuristic must be consistent (never dropping by more than the cost of
+    an edge), not just admissible, for the distances to be shortest.
+    """
+    dist, pred = _new_arrays(node_count)
+    open_set = []
+    for source in sources:
+        dist[source] = 0
+        pred[source] = source
+        open_set.append((heuristic(source) if heuristic else 0, source))
+    heapq.heapify(open_set)
+
+    settled = bytearray(node_count)
+    visited = []
+    while open_set:
+        _, node = heapq.heappop(open_set)
+        if settled[node]:
+            continue
+        settled[node] = 1
+        visited.append(node)
+        if is_goal is not None and is_goal(node):
+            return SearchResult(dist, pred, visited, node)
+
+        node_dist = dist[node]
+        for neighbor, cost in neighbors(node):
+            new_dist = node_dist + cost
+            if not settled[neighbor] and (dist[neighbor] == UNREACHED or new_dist < dist[neighbor]):
+                dist[neighbor] = new_dist
+                pred[neighbor] = node
+                priority = new_dist + heuristic(neighbor) if heuristic else new_dist
+                heapq.heappush(open_set, (priority, neighbor))
+
+    return SearchResult(dist, pred, visited, None)
+
+class TimeExpanded:
+    """
+    Numbers the states of a graph whose edges repeat every `period` steps:
+    state (position, t) is node `(t % period) * positions + position`, so a
+    search over it has `positions * period` nodes. The distance a search
+    reports for a state is the time elapsed since its source.
+    """
+    def __init__(self, positions: int, period: int):
+        self.positions = positions
+        self.period = period
+        self.node_count = positions * period
+
+    def node(self, position: int, t: int) -> int:
+        return (t % self.period) * self.positions + position
+
+    def position(self, node: int) -> int:
+        return node % self.positions
+
+    def phase(self, node: int) -> int:
+        return node // self.positions
@@ -0,0 +1,176 @@
+"""
+A long-lived process that answers questions about the days, keeping each
+input's parsed (and precomputed) form in memory between questions.
+
+    python -m aoc.serve                       # requests on stdin, answers on stdout
+    python -m aoc.serve --socket /tmp/aoc.sock
+
+Requests and responses are JSON objects, one per line. A request names a day
+and optionally which parts to run, the input (a file relative to the
+repository root, which it may not leave, inline text, or by default the day's
+usual input) and keyword arguments for the part functions. Arguments given
+directly apply to the one part requested; with both parts, give them per part:
+
+    {"day": 15, "parts": ["part1"], "args": {"count_row": 10}, "text": "Sensor at ..."}
+    {"day": 15, "args": {"part1": {"count_row": 10}, "part2": {"search_size": 20}}}
+    {"day": 17, "parts": ["part1"], "args": {"num_blocks": 5000}}
+    {"day": 24, "input": "day_24/other_input.txt"}
+
+The response echoes the request's `id` if it had one and holds each answer
+as a string, the time every phase took and whether the parsed input was
+already resident:
+
+    {"id": 1, "part1": "26", "timings": {"part1": 0.0001}, "resident": true}
+
+or `{"id": 1, "error": "..."}`. The first question about an input parses it
+(or loads it from the on-disk parse cache, see `aoc.cache`); later ones only
+run the parts. Resident inputs are keyed like the parse cache and the least
+recently used ones are dropped beyond `--max-resident`.
+
+With `--socket`, clients connect to a Unix socket (never the network) and
+may stay connected; requests from all clients are answered one at a time.
+"""
+from pathlib import Path
+from types import ModuleType
+import argparse
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+
+from aoc.cache import cache_key, load_cached, store_cached
+from aoc.days import ROOT, day_phases, find_days, load_day, load_input, run_phase
+
+DEFAULT_MAX_RESIDENT = 32
+
+class Server:
+    def __init__(self, max_resident: int = DEFAULT_MAX_RESIDENT):
+        self.max_resident = max_resident
+        self.modules: 'dict[int, ModuleType]' = {}
+        # Parsed inputs by parse cache key, least recently used first
+        self.resident: 'dict[str, object]' = {}
+        self.lock = threading.Lock()
+
+    def module(self, day: int) -> ModuleType:
+        if day not in self.modules:
+            if day not in find_days():
+                raise ValueError(f'no solution for day {day}')
+            self.modules[day] = load_day(day)
+        return self.modules[day]
+
+    def parsed_input(self, day: int, module: ModuleType, text: str, timings: 'dict[str, float]') -> 'tuple[object, bool]':
+        """
+        Returns the parsed input for `text` and whether it was resident,
+        parsing it (and recording the phase timings) if it wasn't.
+        """
+        key = cache_key(day, module, text)
+        parsed = self.resident.pop(key, None)
+        hit = parsed is not None
+        if not hit:
+            parsed, hit_disk = load_cached(day, module, text)
+            if not hit_disk:
+                for phase in day_phases(module):
+                    if phase in ('part1', 'part2'):
+                        break
+                    start = time.perf_counter()
+                    parsed, _ = run_phase(module, phase, text, parsed)
+                    timings[phase] = time.perf_counter() - start
+                store_cached(day, module, text, parsed)
+        # Re-inserting moves the entry to the most recently used end
+        self.resident[key] = parsed
+        while len(self.resident) > self.max_resident:
+            del self.resident[next(iter(self.resident))]
+        return parsed, hit
+
+    def answer(self, request: dict) -> dict:
+        day = request['day']
+        module = self.module(day)
+        if 'text' in request:
+            text = request['text']
+        elif 'input' in request:
+            # Clients may only read inputs inside the repository
+            path = (ROOT / request['input']).resolve()
+            if not path.is_relative_to(ROOT):
+                raise ValueError(f'input {request["input"]!r} is outside the repository')
+            text = path.read_text()
+        else:
+            text = load_input(day, module)
+
+        timings = {}
+        parsed, hit = self.parsed_input(day, module, text, timings)
+        response = {}
+        parts = request.get('parts', ('part1', 'part2'))
+        for part in parts:
+            if part not in ('part1', 'part2'):
+                raise ValueError(f'unknown part {part!r}')
+        args = request.get('args', {})
+        if args and set(args) <= {'part1', 'part2'}:
+            part_args = args
+        elif not args or len(parts) == 1:
+            part_args = {part: args for part in parts}
+        else:
+            raise ValueError('args for more than one part must be given per part')
+        for part in parts:
+            start = time.perf_counter()
+            response[part] = str(getattr(module, part)(parsed, **part_args.get(part, {})))
+            timings[part] = time.perf_counter() - start
+        response['timings'] = timings
+        response['resident'] = hit
+        return response
+
+    def handle_line(self, line: str) -> str:
+        response = {}
+        try:
+            request = json.loads(line)
+            if 'id' in request:
+                response['id'] = request['id']
+            with self.lock:
+                response.update(self.answer(request))
+        except Exception as e:
+            response['error'] = f'{e.__class__.__name__}: {e}'
+        return json.dumps(response)
+
+def serve_stdio(server: Server):
+    for line in sys.stdin:
+        if line.strip():
+            print(server.handle_line(line), flush=True)
+
+def serve_socket(server: Server, path: Path):
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if line.strip():
+                    self.wfile.write(server.handle_line(line.decode()).encode() + b'\n')
+                    self.wfile.flush()
+
+    if path.exists():
+        path.unlink()
+    # Shut down through the finally below on SIGTERM as well as Ctrl-C, so
+    # that the socket file is removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    with socketserver.ThreadingUnixStreamServer(str(path), Handler) as unix_server:
+        print(f'Listening on {path}', file=sys.stderr)
+        try:
+            unix_server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+
+def main(argv: 'list[str]|None' = None):
+    parser = argparse.ArgumentParser(prog='python -m aoc.serve', description='Answer Advent of Code questions from a warm process.')
+    parser.add_argument('--socket', type=Path, help='listen on this Unix socket instead of stdin')
+    parser.add_argument('--max-resident', type=int, default=DEFAULT_MAX_RESIDENT, help=f'parsed inputs to keep in memory (default: {DEFAULT_MAX_RESIDENT})')
+    args = parser.parse_args(argv)
+
+    server = Server(args.max_resident)
+    if args.socket is None:
+        serve_stdio(server)
+    else:
+        serve_socket(server, args.socket)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""
+Debug tracing that costs nothing when it's off.
+
+A `Tracer` formats its message only when enabled: the message is a
+`str.format` template and its arguments are passed through untouched, so a
+disabled tracer never builds a string. Inner loops should go one step further
+and test `enabled` once up front, which skips the call entirely:
+
+    tracing = trace.enabled
+    for item in items:
+        if tracing:
+            trace('inspecting {}', item)
+
+`NO_TRACE` is the shared disabled tracer to use as a default argument.
+"""
+import sys
+
+class Tracer:
+    def __init__(self, enabled: bool = True, indent: str = '  ', file=None):
+        self.enabled = enabled
+        self.indent = indent
+        self.file = file
+
+    def __call__(self, message: str, *args, depth: int = 0):
+        if self.enabled:
+            print(self.indent * depth + message.format(*args), file=self.file or sys.stdout)
+
+    def __bool__(self):
+        return self.enabled
+
+NO_TRACE = Tracer(False)
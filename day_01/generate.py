@@ -0,0 +1,11 @@
+"""
+Synthetic input generator: `size` is the number of elves.
+"""
+import random
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    elves = []
+    for _ in range(max(size, 3)):
+        elves.append('\n'.join(str(rng.randint(1000, 60000)) for _ in range(rng.randint(1, 15))))
+    return '\n\n'.join(elves) + '\n'
@@ -1,23 +1,164 @@
 from pathlib import Path
+import heapq
+import os
+import sys
 
-in_path = Path.cwd() / "input.txt"
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.accel import numpy
+from aoc.reader import chunk_spans, iter_lines, map_file
 
-with in_path.open("r") as inf:
-    lines = inf.readlines()
-    elves = []
-    curr_elf = []
-    for line in lines:
-        if line.strip() == "":
-            if curr_elf != []:
-                elves.append(curr_elf)
-                curr_elf = []
-        else:
-            curr_elf.append(int(line.strip()))
+in_path = Path(__file__).parent / "input.txt"
+MAPPED_INPUT = True
+PARSER_VERSION = 2
+# Inputs smaller than this many bytes are parsed in pure Python
+NUMPY_MIN_SIZE = 1 << 20
 
-sums = [sum(elf) for elf in elves]
+# Bytes of input the vectorized parser looks at at a time, which bounds its
+# temporary arrays to a few dozen megabytes
+NUMPY_CHUNK_SIZE = 1 << 22
 
-print("Part 1:", max(sums))
+# Files smaller than this many bytes are solved in one process
+PARALLEL_MIN_SIZE = 1 << 23
+# Bytes of input handed to a worker process at a time
+PARALLEL_CHUNK_SIZE = 1 << 24
 
-sums.sort(reverse=True)
+def chunk_totals_numpy(np, data) -> 'list[int]|None':
+    """
+    The calories carried by each elf in `data`, a uint8 array holding whole
+    elves, or None if it holds anything but digits and newlines.
+    """
+    digits = (data >= ord('0')) & (data <= ord('9'))
+    if not (digits | (data == ord('\n'))).all():
+        return None
 
-print("Part 2:", sums[0] + sums[1] + sums[2])
+    # Every run of digits is a number; the bounds of the runs alternate
+    bounds = np.flatnonzero(np.diff(digits.view(np.int8), prepend=0, append=0))
+    starts = bounds[0::2]
+    ends = bounds[1::2]
+    if len(starts) == 0:
+        return []
+    width = int((ends - starts).max())
+    if width > 18:
+        # Wouldn't fit in an int64
+        return None
+
+    # Read the numbers a digit at a time, right-aligned so that shorter
+    # numbers see leading zeros
+    values = np.zeros(len(starts), dtype=np.int64)
+    for offset in range(width, 0, -1):
+        positions = ends - offset
+        digit = data[np.maximum(positions, 0)].astype(np.int64) - ord('0')
+        values = values * 10 + np.where(positions >= starts, digit, 0)
+
+    # Only newlines lie between numbers; more than one is a blank line,
+    # which starts a new elf
+    new_elf = np.empty(len(starts), dtype=bool)
+    new_elf[0] = True
+    new_elf[1:] = starts[1:] - ends[:-1] > 1
+    return np.add.reduceat(values, np.flatnonzero(new_elf)).tolist()
+
+def elf_totals_python(source: 'str|bytes|mmap.mmap'):
+    """
+    Yields each elf's total once its last line has been read, holding
+    nothing but the running sum.
+    """
+    total = None
+    for line in iter_lines(source):
+        line = line.strip()
+        if line:
+            total = int(line) if total is None else total + int(line)
+        elif total is not None:
+            yield total
+            total = None
+    if total is not None:
+        yield total
+
+def elf_totals_numpy(np, source: 'str|bytes|mmap.mmap'):
+    """
+    Vectorized `elf_totals_python`, a chunk of input at a time.
+    """
+    if isinstance(source, str):
+        source = source.encode()
+    # Cut at blank lines, so that no elf is split between chunks
+    for start, end in chunk_spans(source, NUMPY_CHUNK_SIZE, b'\n\n'):
+        data = np.frombuffer(source, dtype=np.uint8, count=end - start, offset=start)
+        totals = chunk_totals_numpy(np, data)
+        if totals is None:
+            # Not just digits and newlines (CRLF line endings, say)
+            totals = elf_totals_python(data.tobytes())
+        yield from totals
+
+def elf_totals(source: 'str|bytes|mmap.mmap'):
+    """
+    Yields the calories carried by each elf, in input order.
+    """
+    np = numpy(len(source), NUMPY_MIN_SIZE)
+    if np is not None:
+        return elf_totals_numpy(np, source)
+    return elf_totals_python(source)
+
+def top_totals(source: 'str|bytes|mmap.mmap', k: int = 3) -> 'list[int]':
+    """
+    The `k` largest elf totals, largest first. Only a heap of `k` totals is
+    kept while the input streams past, so memory doesn't grow with it.
+    """
+    return heapq.nlargest(k, elf_totals(source))
+
+def parse(text: str) -> 'list[int]':
+    return list(elf_totals(text))
+
+def part1(totals: 'list[int]') -> int:
+    return max(totals)
+
+def part2(totals: 'list[int]', k: int = 3) -> int:
+    return sum(heapq.nlargest(k, totals))
+
+def solve(text: str) -> 'tuple[int, int]':
+    totals = parse(text)
+    return part1(totals), part2(totals)
+
+def span_top_totals(path: Path, start: int, end: int, k: int) -> 'list[int]':
+    """
+    `top_totals` of the elves between byte offsets `start` and `end` of the
+    file, which must fall between elves.
+    """
+    with map_file(path) as source:
+        return top_totals(source[start:end], k)
+
+def top_totals_parallel(path: Path, k: int = 3, jobs: 'int|None' = None) -> 'list[int]':
+    """
+    `top_totals` of a file, with the file split at blank lines into chunks
+    that `jobs` worker processes (default: one per core) reduce to their own
+    top `k`. The largest `k` of those are the largest overall.
+    """
+    # Only this path needs a process pool, so importing the day doesn't pay
+    # for multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    import itertools
+
+    with map_file(path) as source:
+        spans = list(chunk_spans(source, PARALLEL_CHUNK_SIZE, b'\n\n'))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(span_top_totals, path, start, end, k) for start, end in spans]
+        return heapq.nlargest(k, itertools.chain.from_iterable(future.result() for future in futures))
+
+def solve_file(path: Path, k: int = 3, jobs: 'int|None' = None) -> 'tuple[int, int]':
+    """
+    `solve` for an input file of any size: the file is memory-mapped and
+    streamed through `top_totals` rather than parsed, split between `jobs`
+    processes (default: one per core) once it is large enough.
+    """
+    jobs = jobs or os.cpu_count()
+    if jobs > 1 and path.stat().st_size >= PARALLEL_MIN_SIZE:
+        top = top_totals_parallel(path, k, jobs)
+    else:
+        with map_file(path) as source:
+            top = top_totals(source, k)
+    return top[0], sum(top)
+
+if __name__ == "__main__":
+    part1_answer, part2_answer = solve_file(in_path)
+
+    print("Part 1:", part1_answer)
+    print("Part 2:", part2_answer)
@@ -0,0 +1,8 @@
+"""
+Synthetic input generator: `size` is the number of rounds in the strategy guide.
+"""
+import random
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return ''.join(f'{rng.choice("ABC")} {rng.choice("XYZ")}\n' for _ in range(size))
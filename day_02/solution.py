@@ -1,8 +1,22 @@
+from collections import Counter
 from pathlib import Path
+import sys
+
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.reader import chunk_spans, nonblank_lines
 
 USE_SAMPLE_INPUT = False
 
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
+MAPPED_INPUT = True
+PARSER_VERSION = 2
+
+sample_input = """
+A Y
+B X
+C Z
+""".strip()
 
 other_moves = {
     'A': 1, # Rock
@@ -29,24 +43,6 @@ def calculate_score(move):
         score += 6
     return score
 
-moves = []
-
-if USE_SAMPLE_INPUT:
-    moves = [
-        (other_moves['A'], your_moves['Y']),
-        (other_moves['B'], your_moves['X']),
-        (other_moves['C'], your_moves['Z'])
-    ]
-else:
-    with in_path.open("r") as inf:
-        for line in inf.readlines():
-            line = line.strip()
-            other_move, your_move = line.split()
-            moves.append((other_moves[other_move], your_moves[your_move]))
-
-total_score = sum([calculate_score(move) for move in moves])
-print("Part 1:", total_score)
-
 def calculate_move(move):
     opponent_move = move[0]
     required_outcome = move[1]
@@ -63,6 +59,86 @@ def calculate_move(move):
 
     return (opponent_move, your_move)
 
-moves_2 = [calculate_move(move) for move in moves]
-total_score_2 = sum([calculate_score(move) for move in moves_2])
-print("Part 2:", total_score_2)
+# Every kind of round, (opponent's move, your column), and how it scores in
+# each part
+ROUNDS = [(other, yours) for other in other_moves.values() for yours in your_moves.values()]
+PART1_SCORES = {move: calculate_score(move) for move in ROUNDS}
+PART2_SCORES = {move: calculate_score(calculate_move(move)) for move in ROUNDS}
+
+# The text of each kind of round, to count them with
+ROUND_TEXTS = {
+    (other_moves[other], your_moves[yours]): f'{other} {yours}'
+    for other in other_moves for yours in your_moves
+}
+ROUND_BYTES = {move: text.encode() for move, text in ROUND_TEXTS.items()}
+
+# Memory-mapped input is counted this many bytes at a time
+COUNT_CHUNK_SIZE = 1 << 24
+
+def count_rounds_bulk(buffer: 'str|bytes') -> 'Counter[tuple[int, int]]|None':
+    """
+    Counts each kind of round with one `count` per kind, or returns None
+    unless `buffer` is exactly one round per line, written as "A X", with
+    nothing else on any line and no blank lines.
+    """
+    if isinstance(buffer, str):
+        texts, space, newline = ROUND_TEXTS, ' ', '\n'
+    else:
+        texts, space, newline = ROUND_BYTES, b' ', b'\n'
+    counts = Counter({move: buffer.count(text) for move, text in texts.items()})
+    rounds = counts.total()
+    newlines = buffer.count(newline)
+    # The last line need not end in a newline
+    lines = newlines + (len(buffer) > 0 and not buffer.endswith(newline))
+    # Each round is two letters and a space, and everything else has to be
+    # newlines; with as many lines as rounds and no blank ones, every line is
+    # one round
+    if (buffer.count(space) != rounds or len(buffer) != 3 * rounds + newlines
+            or lines != rounds or buffer.startswith(newline) or 2 * newline in buffer):
+        return None
+    return counts
+
+def count_rounds(source: 'str|bytes|mmap.mmap') -> 'Counter[tuple[int, int]]':
+    if isinstance(source, (str, bytes)):
+        counts = count_rounds_bulk(source)
+    else:
+        # Count a mapped file a chunk at a time
+        counts = Counter()
+        for start, end in chunk_spans(source, COUNT_CHUNK_SIZE):
+            chunk_counts = count_rounds_bulk(source[start:end])
+            if chunk_counts is None:
+                counts = None
+                break
+            counts.update(chunk_counts)
+    if counts is not None:
+        return counts
+
+    counts = Counter()
+    for line in nonblank_lines(source):
+        other_move, your_move = line.split()
+        counts[(other_moves[other_move], your_moves[your_move])] += 1
+    return counts
+
+def parse(text: str) -> 'Counter[tuple[int, int]]':
+    return count_rounds(text)
+
+def part1(rounds: 'Counter[tuple[int, int]]') -> int:
+    return sum(PART1_SCORES[move] * count for move, count in rounds.items())
+
+def part2(rounds: 'Counter[tuple[int, int]]') -> int:
+    return sum(PART2_SCORES[move] * count for move, count in rounds.items())
+
+def solve(text: str) -> 'tuple[int, int]':
+    rounds = parse(text)
+    return part1(rounds), part2(rounds)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
+
+    part1_answer, part2_answer = solve(input)
+    print("Part 1:", part1_answer)
+    print("Part 2:", part2_answer)
@@ -0,0 +1,39 @@
+"""
+Synthetic input generator: `size` is the number of groups of three rucksacks.
+
+Every rucksack has exactly one item type in both compartments, and every group
+shares exactly one badge, as the puzzle guarantees.
+"""
+import random
+import string
+
+ITEMS = string.ascii_lowercase + string.ascii_uppercase
+
+def generate_sack(rng: random.Random, pool: 'list[str]', badge: str) -> str:
+    common = rng.choice(pool + [badge])
+    rest = [item for item in pool + [badge] if item != common]
+    rng.shuffle(rest)
+    half = len(rest) // 2
+    compartments = [rest[:half], rest[half:]]
+
+    length = rng.randint(8, 16)
+    sack = ''
+    for items in compartments:
+        required = [common] + [item for item in items if item == badge]
+        compartment = required + [rng.choice(items + [common]) for _ in range(length - len(required))]
+        rng.shuffle(compartment)
+        sack += ''.join(compartment)
+    return sack
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    out = ''
+    for _ in range(size):
+        items = list(ITEMS)
+        rng.shuffle(items)
+        badge = items.pop()
+        # Each sack in the group draws from its own disjoint pool, so the badge
+        # is the only item the three have in common
+        for i in range(3):
+            out += generate_sack(rng, items[i*17:(i+1)*17], badge) + '\n'
+    return out
@@ -1,58 +1,152 @@
 from pathlib import Path
+import string
+import sys
+
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.accel import numpy
+from aoc.reader import chunk_spans
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
-
-if USE_SAMPLE_INPUT:
-    rucksacks = [
-        'vJrwpWtwJgWrhcsFMMfFFhFp',
-        'jqHRNqRjqzjGDLGLrsFMfFZSrLrFZsSL',
-        'PmmdzqPrVvPwwTWBwg',
-        'wMqvLMZHhHMvwLHjbvcjnnSBnvTQFn',
-        'ttgJtRGJQctTZtZT',
-        'CrZsJsPPZsGzwwsLwLmpwMDw',
-    ]
-else:
-    with in_path.open('r') as inf:
-        rucksacks = [line.strip() for line in inf.readlines()]
-
-def item_to_priority(item):
-    assert len(item) == 1
-    itemcode = ord(item)
-
-    if itemcode >= ord('a') and itemcode <= ord('z'):
-        itemcode = itemcode - ord('a') + 1
-    elif itemcode >= ord('A') and itemcode <= ord('Z'):
-        itemcode = itemcode - ord('A') + 27
-    else:
-        raise ValueError(f'Invalid item {item}')
+in_path = Path(__file__).parent / 'input.txt'
+MAPPED_INPUT = True
+PARSER_VERSION = 2
+# Input is translated and parsed this many bytes at a time
+PARSE_CHUNK_SIZE = 1 << 22
+# Inputs smaller than this many bytes are parsed in pure Python
+NUMPY_MIN_SIZE = 1 << 20
+
+sample_input = """
+vJrwpWtwJgWrhcsFMMfFFhFp
+jqHRNqRjqzjGDLGLrsFMfFZSrLrFZsSL
+PmmdzqPrVvPwwTWBwg
+wMqvLMZHhHMvwLHjbvcjnnSBnvTQFn
+ttgJtRGJQctTZtZT
+CrZsJsPPZsGzwwsLwLmpwMDw
+""".strip()
+
+# Every byte of input translated to the priority of the item it is (1-52),
+# NEWLINE, BLANK for other whitespace, or INVALID
+NEWLINE = 0xff
+BLANK = 0xfe
+INVALID = 0
+PRIORITIES = bytearray([INVALID]) * 256
+for priority, item in enumerate(string.ascii_letters.encode(), 1):
+    PRIORITIES[item] = priority
+PRIORITIES[ord('\n')] = NEWLINE
+for blank in b' \t\r\v\f':
+    PRIORITIES[blank] = BLANK
+PRIORITIES = bytes(PRIORITIES)
+VALID_PRIORITIES = frozenset(range(1, len(string.ascii_letters) + 1))
+
+# A set of items is a mask with bit `priority` set for each item in it, so
+# that the items two sets have in common are `a & b` and the priority of a
+# lone item is `mask.bit_length() - 1`. Bit 0 is never set.
 
-    return itemcode
+PRIORITY_BITS = {priority: 1 << priority for priority in range(256)}
 
-common_items = []
+def priorities_mask(priorities: bytes) -> int:
+    """
+    The mask of a run of translated items.
+    """
+    present = set(priorities)
+    if not present <= VALID_PRIORITIES:
+        raise ValueError('Invalid item in rucksack')
+    # The bits of distinct items never overlap, so summing them ORs them
+    return sum(map(PRIORITY_BITS.__getitem__, present))
 
-for sack in rucksacks:
-    split_point = len(sack) // 2
-    c1 = sack[:split_point]
-    c2 = sack[split_point:]
+def mask_priority(mask: int) -> int:
+    """
+    The priority of the only item in `mask`.
+    """
+    assert mask and mask & (mask - 1) == 0
+    return mask.bit_length() - 1
 
-    for item in c1:
-        if item in c2:
-            common_items.append(item)
-            break
+def chunk_masks(translated: bytes) -> 'list[tuple[int, int]]':
+    if translated.count(BLANK) or translated.count(INVALID):
+        rucksacks = []
+        for sack in translated.split(bytes([NEWLINE])):
+            sack = sack.strip(bytes([BLANK]))
+            if sack:
+                split_point = len(sack) // 2
+                rucksacks.append((priorities_mask(sack[:split_point]), priorities_mask(sack[split_point:])))
+        return rucksacks
 
-print("Part 1:", sum([item_to_priority(item) for item in common_items]))
+    # Only items and newlines, so nothing needs checking or stripping
+    bits = PRIORITY_BITS.__getitem__
+    return [
+        (sum(map(bits, set(sack[:len(sack) // 2]))), sum(map(bits, set(sack[len(sack) // 2:]))))
+        for sack in translated.split(bytes([NEWLINE])) if sack
+    ]
+
+def chunk_masks_numpy(np, translated: bytes) -> 'list[tuple[int, int]]|None':
+    """
+    `chunk_masks` for every sack at once, or None unless every line is a
+    bare run of at least two items.
+    """
+    if translated.count(BLANK) or translated.count(INVALID):
+        return None
+    priorities = np.frombuffer(translated, dtype=np.uint8)
+    line_ends = np.flatnonzero(priorities == NEWLINE)
+    starts = np.concatenate(([0], line_ends + 1))
+    ends = np.append(line_ends, len(priorities))
+    lengths = ends - starts
+    # Blank lines hold no sack
+    starts = starts[lengths > 0]
+    lengths = lengths[lengths > 0]
+    if len(starts) == 0:
+        return []
+    if lengths.min() < 2:
+        return None
+
+    newlines = priorities == NEWLINE
+    bits = np.left_shift(np.uint64(1), np.where(newlines, 0, priorities).astype(np.uint64))
+    bits[newlines] = 0
+    # OR together each sack's [start, middle) and [middle, next start)
+    bounds = np.empty(2 * len(starts), dtype=np.int64)
+    bounds[0::2] = starts
+    bounds[1::2] = starts + lengths // 2
+    masks = np.bitwise_or.reduceat(bits, bounds).tolist()
+    return list(zip(masks[0::2], masks[1::2]))
 
-badges = []
-for i in range(0, len(rucksacks), 3):
-    sack_1 = set(rucksacks[i])
-    sack_2 = set(rucksacks[i+1])
-    sack_3 = set(rucksacks[i+2])
+def parse(text: 'str|bytes|mmap.mmap') -> 'list[tuple[int, int]]':
+    """
+    Returns the item masks of each rucksack's two compartments.
+    """
+    if isinstance(text, str):
+        text = text.encode()
+    np = numpy(len(text), NUMPY_MIN_SIZE)
+    rucksacks = []
+    for start, end in chunk_spans(text, PARSE_CHUNK_SIZE):
+        translated = text[start:end].translate(PRIORITIES)
+        masks = None if np is None else chunk_masks_numpy(np, translated)
+        rucksacks.extend(chunk_masks(translated) if masks is None else masks)
+    return rucksacks
 
-    badge = sack_1.intersection(sack_2).intersection(sack_3)
-    assert len(badge) == 1
-    badge = badge.pop()
+def part1(rucksacks: 'list[tuple[int, int]]') -> int:
+    return sum(mask_priority(c1 & c2) for c1, c2 in rucksacks)
 
-    badges.append(badge)
+def part2(rucksacks: 'list[tuple[int, int]]', group_size: int = 3) -> int:
+    assert len(rucksacks) % group_size == 0
+    total = 0
+    for i in range(0, len(rucksacks), group_size):
+        badge = -1
+        for c1, c2 in rucksacks[i:i + group_size]:
+            badge &= c1 | c2
+        total += mask_priority(badge)
+    return total
+
+def solve(text: str) -> 'tuple[int, int]':
+    rucksacks = parse(text)
+    return part1(rucksacks), part2(rucksacks)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open('r') as inf:
+            input = inf.read()
 
-print("Part 2:", sum([item_to_priority(item) for item in badges]))
+    part1_answer, part2_answer = solve(input)
+    print("Part 1:", part1_answer)
+    print("Part 2:", part2_answer)
@@ -0,0 +1,13 @@
+"""
+Synthetic input generator: `size` is the number of assignment pairs.
+"""
+import random
+
+def generate_range(rng: random.Random) -> str:
+    start = rng.randint(1, 99)
+    end = rng.randint(start, 99)
+    return f'{start}-{end}'
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return ''.join(f'{generate_range(rng)},{generate_range(rng)}\n' for _ in range(size))
@@ -1,48 +1,59 @@
 from pathlib import Path
+import sys
+
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.intervals import contains, overlaps
+from aoc.reader import nonblank_lines
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
-
-assignments = []
-if USE_SAMPLE_INPUT:
-    assignments = [
-        ((2, 4), (6, 8)),
-        ((2, 3), (4, 5)),
-        ((5, 7), (7, 9)),
-        ((2, 8), (3, 7)),
-        ((6, 6), (4, 6)),
-        ((2, 6), (4, 8))
-    ]
-else:
-    with in_path.open("r") as inf:
-        for line in inf.readlines():
-            ass1, ass2 = line.strip().split(',')
-            ass1 = [int(i) for i in ass1.split('-')]
-            ass2 = [int(i) for i in ass2.split('-')]
-            assert ass1[0] <= ass1[1] and ass2[0] <= ass2[1]
-            assignments.append((ass1, ass2))
-
-def ass1_in_ass2(ass1, ass2):
-    if ass1[0] >= ass2[0] and ass1[1] <= ass2[1]:
-        return True
-    return False
-
-def ass1_overlap_ass2(ass1, ass2):
-    if ass1[0] < ass2[0]:
-        return ass1[1] >= ass2[0]
+in_path = Path(__file__).parent / 'input.txt'
+MAPPED_INPUT = True
+
+sample_input = """
+2-4,6-8
+2-3,4-5
+5-7,7-9
+2-8,3-7
+6-6,4-6
+2-6,4-8
+""".strip()
+
+def parse(text: str) -> 'list[tuple[list[int], list[int]]]':
+    assignments = []
+    for line in nonblank_lines(text):
+        ass1, ass2 = line.split(',')
+        ass1 = [int(i) for i in ass1.split('-')]
+        ass2 = [int(i) for i in ass2.split('-')]
+        assert ass1[0] <= ass1[1] and ass2[0] <= ass2[1]
+        assignments.append((ass1, ass2))
+    return assignments
+
+def part1(assignments) -> int:
+    count = 0
+    for ass1, ass2 in assignments:
+        if contains(ass2, ass1) or contains(ass1, ass2):
+            count += 1
+    return count
+
+def part2(assignments) -> int:
+    count = 0
+    for ass1, ass2 in assignments:
+        if overlaps(ass1, ass2):
+            count += 1
+    return count
+
+def solve(text: str) -> 'tuple[int, int]':
+    assignments = parse(text)
+    return part1(assignments), part2(assignments)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
     else:
-        return ass1[0] <= ass2[1]
-
-count = 0
-for ass1, ass2 in assignments:
-    if ass1_in_ass2(ass1, ass2) or ass1_in_ass2(ass2, ass1):
-        count += 1
-
-print("Part 1:", count)
-
-count = 0
-for ass1, ass2 in assignments:
-    if ass1_overlap_ass2(ass1, ass2):
-        count += 1
+        with in_path.open("r") as inf:
+            input = inf.read()
 
-print("Part 2:", count)
+    part1_answer, part2_answer = solve(input)
+    print("Part 1:", part1_answer)
+    print("Part 2:", part2_answer)
@@ -0,0 +1,29 @@
+"""
+Synthetic input generator: `size` is the number of rearrangement steps.
+
+Moves never empty a stack, so both parts always have a crate on top of every
+stack at the end.
+"""
+import random
+import string
+
+STACK_COUNT = 9
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    stacks = [[rng.choice(string.ascii_uppercase) for _ in range(rng.randint(1, 8))] for _ in range(STACK_COUNT)]
+
+    out = ''
+    for row in range(max(len(stack) for stack in stacks) - 1, -1, -1):
+        out += ' '.join(f'[{stack[row]}]' if len(stack) > row else '   ' for stack in stacks) + '\n'
+    out += ' '.join(f' {i+1} ' for i in range(STACK_COUNT)) + '\n\n'
+
+    heights = [len(stack) for stack in stacks]
+    for _ in range(size):
+        from_stack = rng.choice([i for i in range(STACK_COUNT) if heights[i] > 1])
+        to_stack = rng.choice([i for i in range(STACK_COUNT) if i != from_stack])
+        count = rng.randint(1, heights[from_stack] - 1)
+        heights[from_stack] -= count
+        heights[to_stack] += count
+        out += f'move {count} from {from_stack+1} to {to_stack+1}\n'
+    return out
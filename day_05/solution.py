@@ -4,7 +4,19 @@ import math
 import copy
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
+
+sample_input = """
+    [D]    
+[N] [C]    
+[Z] [M] [P]
+ 1   2   3 
+
+move 1 from 2 to 1
+move 3 from 1 to 3
+move 2 from 2 to 1
+move 1 from 1 to 2
+"""[1:]
 
 class CrateStack:
     def __init__(self, crates = []):
@@ -29,8 +41,6 @@ class PuzzleState:
     @staticmethod
     def from_lines(lines):
         num_stacks = math.ceil(len(lines[-1]) / 4)
-        print(lines[-1])
-        print(num_stacks)
         stacks = [[] for i in range(num_stacks)]
 
         for line in lines[:-1][::-1]:
@@ -73,48 +83,65 @@ class PuzzleState:
         out += "\n"
         return out
 
-if USE_SAMPLE_INPUT:
-    state = PuzzleState([CrateStack(stack) for stack in [['Z', 'N'], ['M', 'C', 'D'], ['P']]])
-    moves = [
-        (1, 2, 1),
-        (3, 1, 3),
-        (2, 2, 1),
-        (1, 1, 2)
-    ]
-else:
-    with in_path.open("r") as inf:
-        read_moves = False
-        state_lines = []
-        moves = []
-        for line in inf.readlines():
-            line = line[:-1]
-            if not read_moves:
-                if line == "":
-                    read_moves = True
-                    state = PuzzleState.from_lines(state_lines)
-                else:
-                    state_lines.append(line)
+def parse(text: str) -> 'tuple[PuzzleState, list[tuple[int, int, int]]]':
+    read_moves = False
+    state_lines = []
+    moves = []
+    for line in text.split("\n"):
+        if not read_moves:
+            if line == "":
+                read_moves = True
+                state = PuzzleState.from_lines(state_lines)
             else:
-                parts = line.split()
-                assert parts[0] == "move" and parts[2] == "from" and parts[4] == "to"
-                move = (int(parts[1]), int(parts[3]), int(parts[5]))
-                moves.append(move)
-
-part1_state = copy.deepcopy(state)
-
-print(part1_state)
-for move in moves:
-    part1_state.move(move[0], move[1], move[2])
-print(part1_state)
-
-print("Part 1:", "".join([stack.crates[-1] for stack in part1_state.stacks]))
-
-print("\n\n")
-
-part2_state = copy.deepcopy(state)
-print(part2_state)
-for move in moves:
-    part2_state.move_2(move[0], move[1], move[2])
-print(part2_state)
-
-print("Part 2:", "".join([stack.crates[-1] for stack in part2_state.stacks]))
+                state_lines.append(line)
+        elif line != "":
+            parts = line.split()
+            assert parts[0] == "move" and parts[2] == "from" and parts[4] == "to"
+            move = (int(parts[1]), int(parts[3]), int(parts[5]))
+            moves.append(move)
+    return state, moves
+
+def part1(puzzle: 'tuple[PuzzleState, list[tuple[int, int, int]]]', verbose: bool = False) -> str:
+    state, moves = puzzle
+    part1_state = copy.deepcopy(state)
+
+    if verbose:
+        print(part1_state)
+    for move in moves:
+        part1_state.move(move[0], move[1], move[2])
+    if verbose:
+        print(part1_state)
+
+    return "".join([stack.crates[-1] for stack in part1_state.stacks])
+
+def part2(puzzle: 'tuple[PuzzleState, list[tuple[int, int, int]]]', verbose: bool = False) -> str:
+    state, moves = puzzle
+    part2_state = copy.deepcopy(state)
+
+    if verbose:
+        print(part2_state)
+    for move in moves:
+        part2_state.move_2(move[0], move[1], move[2])
+    if verbose:
+        print(part2_state)
+
+    return "".join([stack.crates[-1] for stack in part2_state.stacks])
+
+def solve(text: str) -> 'tuple[str, str]':
+    puzzle = parse(text)
+    return part1(puzzle), part2(puzzle)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
+
+    puzzle = parse(input)
+
+    print("Part 1:", part1(puzzle, verbose=True))
+
+    print("\n\n")
+
+    print("Part 2:", part2(puzzle, verbose=True))
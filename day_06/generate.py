@@ -0,0 +1,20 @@
+"""
+Synthetic input generator: `size` is the length of the datastream.
+
+The first half only uses three letters and the second half twelve, so the
+start-of-packet and start-of-message markers appear at roughly the middle and
+the end of the stream.
+"""
+import random
+import string
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    half = max(size // 2, 1)
+    stream = ''.join(rng.choice('abc') for _ in range(half))
+    stream += 'wxyz'
+    stream += ''.join(rng.choice(string.ascii_lowercase[:12]) for _ in range(half))
+    marker = list(string.ascii_lowercase[:14])
+    rng.shuffle(marker)
+    stream += ''.join(marker) + 'a'
+    return stream + '\n'
@@ -1,13 +1,15 @@
 from pathlib import Path
+import sys
+
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.reader import iter_lines
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
+MAPPED_INPUT = True
 
-if USE_SAMPLE_INPUT:
-    input = "mjqjpqmgbljsphdztnvjfqwrcgsmlb"
-else:
-    with in_path.open("r") as inf:
-        input = inf.readlines()[0]
+sample_input = "mjqjpqmgbljsphdztnvjfqwrcgsmlb"
 
 def check_uniq(str):
     for i in range(len(str)-1):
@@ -21,5 +23,26 @@ def first_uniq_substr(instr, strlen):
         if check_uniq(substr):
             return (i, substr)
 
-print("Part 1:", first_uniq_substr(input, 4))
-print("Part 2:", first_uniq_substr(input, 14))
+def parse(text: str) -> str:
+    return next(iter_lines(text), '')
+
+def part1(signal: str) -> int:
+    return first_uniq_substr(signal, 4)[0]
+
+def part2(signal: str) -> int:
+    return first_uniq_substr(signal, 14)[0]
+
+def solve(text: str) -> 'tuple[int, int]':
+    signal = parse(text)
+    return part1(signal), part2(signal)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
+
+    signal = parse(input)
+    print("Part 1:", first_uniq_substr(signal, 4))
+    print("Part 2:", first_uniq_substr(signal, 14))
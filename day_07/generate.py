@@ -0,0 +1,49 @@
+"""
+Synthetic input generator: `size` is the number of directories.
+
+File sizes are scaled so that the disk is somewhat over 40000000 full, which
+means part 2 always has to free some space.
+"""
+import random
+import string
+
+def random_name(rng: random.Random) -> str:
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(1, 8)))
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    # children[i] = subdirectories of directory i; directory 0 is /
+    children: 'list[list[int]]' = [[]]
+    for i in range(1, max(size, 1)):
+        children[rng.randrange(i)].append(i)
+        children.append([])
+
+    files = [[(random_name(rng) + rng.choice(['', '.txt', '.dat', '.log']), rng.randint(1000, 300000)) for _ in range(rng.randint(0, 5))] for _ in children]
+    total = sum(file_size for dir_files in files for _, file_size in dir_files) or 1
+    scale = 45000000 / total
+
+    out = '$ cd /\n'
+    def visit(dir_idx: int):
+        nonlocal out
+        out += '$ ls\n'
+        names = {}
+        for child in children[dir_idx]:
+            name = random_name(rng)
+            while name in names:
+                name += rng.choice(string.ascii_lowercase)
+            names[name] = child
+            out += f'dir {name}\n'
+        for name, file_size in files[dir_idx]:
+            if name in names:
+                continue
+            names[name] = None
+            out += f'{max(1, int(file_size * scale))} {name}\n'
+        for name, child in names.items():
+            if child is None:
+                continue
+            out += f'$ cd {name}\n'
+            visit(child)
+            out += '$ cd ..\n'
+    visit(0)
+    return out
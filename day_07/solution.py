@@ -1,7 +1,7 @@
 from pathlib import Path
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
 
 class DirectoryNode:
     def __init__(self, name, parent):
@@ -86,59 +86,71 @@ $ ls
 7214296 k
 """[1:]
 
-if USE_SAMPLE_INPUT:
-    input = sample_input.split("\n")
-else:
-    with in_path.open("r") as inf:
-        input = [line[:-1] for line in inf.readlines()]
-
-root = DirectoryNode("/", None)
-curr = root
-
-for line in input:
-    if line == "":
-        continue
-    elif line[0] == "$":
-        if line[2:4] == "cd":
-            to = line[5:]
-            if to == "..":
-                curr = curr.parent
-            elif to == "/":
-                curr = root
+def parse(text: str) -> DirectoryNode:
+    root = DirectoryNode("/", None)
+    curr = root
+
+    for line in text.split("\n"):
+        if line == "":
+            continue
+        elif line[0] == "$":
+            if line[2:4] == "cd":
+                to = line[5:]
+                if to == "..":
+                    curr = curr.parent
+                elif to == "/":
+                    curr = root
+                else:
+                    curr = curr.children[to]
+            elif line[2:4] == "ls":
+                pass
             else:
-                curr = curr.children[to]
-        elif line[2:4] == "ls":
-            pass
+                raise ValueError(f"Unrecognized cmd: \"{line[2:4]}\"")
+        elif line[0:3] == "dir":
+            dirname = line[4:]
+            if dirname not in curr.children:
+                curr.children[dirname] = DirectoryNode(dirname, curr)
         else:
-            raise ValueError(f"Unrecognized cmd: \"{line[2:4]}\"")
-    elif line[0:3] == "dir":
-        dirname = line[4:]
-        if dirname not in curr.children:
-            curr.children[dirname] = DirectoryNode(dirname, curr)
-    else:
-        size, name = line.split()
-        size = int(size)
-        if name in curr.children:
-            assert curr.children[name].size == size
-        else:
-            curr.children[name] = FileNode(name, curr, size)
+            size, name = line.split()
+            size = int(size)
+            if name in curr.children:
+                assert curr.children[name].size == size
+            else:
+                curr.children[name] = FileNode(name, curr, size)
+    return root
 
-totalsize = 0
-for d in root.subdirs:
-    if d.size < 100000:
-        totalsize += d.size
+def part1(root: DirectoryNode) -> int:
+    totalsize = 0
+    for d in root.subdirs:
+        if d.size < 100000:
+            totalsize += d.size
+    return totalsize
 
-print("Part 1:", totalsize)
+def part2(root: DirectoryNode) -> int:
+    free_space = 70000000 - root.size
+    space_needed = 30000000 - free_space
 
-free_space = 70000000 - root.size
-space_needed = 30000000 - free_space
+    min_d = root
 
-min_d = root
+    for d in root.subdirs:
+        if d.size < space_needed:
+            continue
+        if d.size < min_d.size:
+            min_d = d
 
-for d in root.subdirs:
-    if d.size < space_needed:
-        continue
-    if d.size < min_d.size:
-        min_d = d
+    return min_d.size
+
+def solve(text: str) -> 'tuple[int, int]':
+    root = parse(text)
+    return part1(root), part2(root)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
 
-print("Part 2:", min_d.size)
+    part1_answer, part2_answer = solve(input)
+    print("Part 1:", part1_answer)
+    print("Part 2:", part2_answer)
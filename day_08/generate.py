@@ -0,0 +1,8 @@
+"""
+Synthetic input generator: `size` is the width and height of the forest.
+"""
+import random
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return ''.join(''.join(str(rng.randint(0, 9)) for _ in range(size)) + '\n' for _ in range(size))
@@ -1,12 +1,16 @@
 from pathlib import Path
+import sys
 
-USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.accel import numpy
+from aoc.grid import Grid2D
 
-class Tree:
-    def __init__(self, height):
-        self.height = height
-        self.visible = False
+USE_SAMPLE_INPUT = False
+in_path = Path(__file__).parent / 'input.txt'
+PARSER_VERSION = 2
+# Forests with fewer trees than this are searched in pure Python
+NUMPY_MIN_CELLS = 50000
 
 sample_input = """
 30373
@@ -16,100 +20,141 @@ sample_input = """
 35390
 """.strip()
 
-def print_forrest(forrest):
-    for row in forrest:
-        for tree in row:
-            if tree.visible:
+def print_forrest(forrest: Grid2D, visible: bytearray):
+    for y in range(forrest.height):
+        for i in forrest.row_indices(y):
+            if visible[i]:
                 print("\u001b[31m", end="")
             else:
                 print("\u001b[32m", end="")
-            print(tree.height, end="")
+            print(chr(forrest.cells[i]), end="")
         print()
     print("\u001b[0m", end="")
 
-if USE_SAMPLE_INPUT:
-    forrest = [[Tree(int(c)) for c in row] for row in sample_input.split("\n")]
-else:
-    forrest = []
-    with in_path.open("r") as inf:
-        for line in inf.readlines():
-            forrest.append([Tree(int(c)) for c in line.strip()])
+def parse(text: str) -> Grid2D:
+    # Heights stay as their ASCII digits, which compare the same way
+    return Grid2D.from_text(text.strip())
 
-def process_row(row):
+def process_row(heights: bytearray, indices: range, visible: bytearray):
     max_height_so_far = -1
-    for tree in row:
-        if tree.height > max_height_so_far:
-            max_height_so_far = tree.height
-            tree.visible = True
-
-for row in forrest:
-    process_row(row)
-for row in forrest:
-    process_row(row[::-1])
-for i in range(len(forrest[0])):
-    process_row([row[i] for row in forrest])
-for i in range(len(forrest[0])):
-    process_row([row[i] for row in forrest[::-1]])
-
-
-#print_forrest(forrest)
-
-visible_count = 0
-for row in forrest:
-    for tree in row:
-        if tree.visible:
-            visible_count += 1
-
-print("Part 1:", visible_count)
-
-def calculate_scenic_score(forrest, pos):
-    calc_tree = forrest[pos[1]][pos[0]]
-    #print(calc_tree.height)
-    total_score = 1
-    curr_score = 0
-    # RIGHT
-    for i in range(pos[0]+1, len(forrest[0])):
-        curr_tree = forrest[pos[1]][i]
-        curr_score += 1
-        if curr_tree.height >= calc_tree.height:
-            break
-    total_score *= curr_score
-    #print(f"{curr_score} * ", end = "")
-    curr_score = 0
-    # LEFT
-    for i in range(pos[0]-1, -1, -1):
-        curr_tree = forrest[pos[1]][i]
-        curr_score += 1
-        if curr_tree.height >= calc_tree.height:
-            break
-    total_score *= curr_score
-    #print(f"{curr_score} * ", end = "")
-    curr_score = 0
-    # DOWN
-    for i in range(pos[1]+1, len(forrest)):
-        curr_tree = forrest[i][pos[0]]
-        curr_score += 1
-        if curr_tree.height >= calc_tree.height:
-            break
-    total_score *= curr_score
-    #print(f"{curr_score} * ", end = "")
-    curr_score = 0
-    # UP
-    for i in range(pos[1]-1, -1, -1):
-        curr_tree = forrest[i][pos[0]]
-        curr_score += 1
-        if curr_tree.height >= calc_tree.height:
+    for i in indices:
+        if heights[i] > max_height_so_far:
+            max_height_so_far = heights[i]
+            visible[i] = 1
+
+def heights_array(np, forrest: Grid2D):
+    return np.frombuffer(forrest.cells, dtype=np.uint8).reshape(forrest.height, forrest.width)
+
+def find_visible_numpy(np, forrest: Grid2D) -> bytearray:
+    heights = heights_array(np, forrest)
+    visible = np.zeros(heights.shape, dtype=bool)
+    # Look along the rows of each view: from the left, right, top and bottom
+    for view, seen in ((heights, visible), (heights[:, ::-1], visible[:, ::-1]),
+                       (heights.T, visible.T), (heights.T[:, ::-1], visible.T[:, ::-1])):
+        tallest_so_far = np.maximum.accumulate(view, axis=1)
+        seen[:, 0] = True
+        seen[:, 1:] |= view[:, 1:] > tallest_so_far[:, :-1]
+    return bytearray(visible.astype(np.uint8).tobytes())
+
+def find_visible(forrest: Grid2D) -> bytearray:
+    np = numpy(len(forrest.cells), NUMPY_MIN_CELLS)
+    if np is not None:
+        return find_visible_numpy(np, forrest)
+
+    heights = forrest.cells
+    visible = bytearray(len(heights))
+    for y in range(forrest.height):
+        row = forrest.row_indices(y)
+        process_row(heights, row, visible)
+        process_row(heights, row[::-1], visible)
+    for x in range(forrest.width):
+        column = forrest.column_indices(x)
+        process_row(heights, column, visible)
+        process_row(heights, column[::-1], visible)
+    return visible
+
+def part1(forrest: Grid2D, verbose: bool = False) -> int:
+    visible = find_visible(forrest)
+
+    if verbose:
+        print_forrest(forrest, visible)
+
+    return visible.count(1)
+
+def viewing_distance(heights: bytearray, indices: range, height: int) -> int:
+    distance = 0
+    for i in indices:
+        distance += 1
+        if heights[i] >= height:
             break
-    total_score *= curr_score
-    #print(f"{curr_score} = {total_score} ")
-    return total_score
+    return distance
+
+def calculate_scenic_score(forrest: Grid2D, pos: 'tuple[int, int]') -> int:
+    heights = forrest.cells
+    width = forrest.width
+    x, y = pos
+    i = forrest.index(x, y)
+    height = heights[i]
+
+    right = viewing_distance(heights, range(i + 1, i + width - x), height)
+    left = viewing_distance(heights, range(i - 1, i - x - 1, -1), height)
+    down = viewing_distance(heights, range(i + width, len(heights), width), height)
+    up = viewing_distance(heights, range(i - width, -1, -width), height)
+    return right * left * down * up
+
+def viewing_distances_numpy(np, heights):
+    """
+    How far every tree can see towards the start of its row, sweeping all
+    rows at once one column at a time.
+    """
+    levels = np.unique(heights)
+    # Ranks by column, so that each step of the sweep reads contiguous memory
+    ranks_by_column = np.ascontiguousarray(np.searchsorted(levels, heights).T)
+    rows = np.arange(heights.shape[0])
+    # For every row and height level, the column of the last tree at least
+    # that tall, or 0 (the edge) if there is none yet
+    last_blocker = np.zeros((heights.shape[0], len(levels)), dtype=np.int64)
+    level_ranks = np.arange(len(levels))
+    distances_by_column = np.empty(ranks_by_column.shape, dtype=np.int64)
+    for column, rank in enumerate(ranks_by_column):
+        distances_by_column[column] = column - last_blocker[rows, rank]
+        np.copyto(last_blocker, column, where=level_ranks <= rank[:, None])
+    return distances_by_column.T
+
+def max_scenic_score_numpy(np, forrest: Grid2D) -> int:
+    heights = heights_array(np, forrest)
+    left = viewing_distances_numpy(np, heights)
+    right = viewing_distances_numpy(np, heights[:, ::-1])[:, ::-1]
+    up = viewing_distances_numpy(np, heights.T).T
+    down = viewing_distances_numpy(np, heights.T[:, ::-1])[:, ::-1].T
+    return int((left * right * up * down).max())
+
+def part2(forrest: Grid2D) -> int:
+    np = numpy(len(forrest.cells), NUMPY_MIN_CELLS)
+    if np is not None:
+        return max_scenic_score_numpy(np, forrest)
+
+    max_score = 0
+
+    for y in range(forrest.height):
+        for x in range(forrest.width):
+            score = calculate_scenic_score(forrest, (x, y))
+            if score > max_score:
+                max_score = score
+
+    return max_score
 
-max_score = 0
+def solve(text: str) -> 'tuple[int, int]':
+    forrest = parse(text)
+    return part1(forrest), part2(forrest)
 
-for i in range(0, len(forrest)):
-    for j in range(0, len(forrest[0])):
-        score = calculate_scenic_score(forrest, (j, i))
-        if score > max_score:
-            max_score = score
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
 
-print("Part 2:", max_score)
+    part1_answer, part2_answer = solve(input)
+    print("Part 1:", part1_answer)
+    print("Part 2:", part2_answer)
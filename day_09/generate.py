@@ -0,0 +1,8 @@
+"""
+Synthetic input generator: `size` is the number of head motions.
+"""
+import random
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return ''.join(f'{rng.choice("UDLR")} {rng.randint(1, 20)}\n' for _ in range(size))
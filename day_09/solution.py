@@ -1,7 +1,13 @@
 from pathlib import Path
+import sys
+
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.reader import nonblank_lines
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
+MAPPED_INPUT = True
 
 sample_input = """
 R 4
@@ -14,11 +20,16 @@ L 5
 R 2
 """.strip()
 
-if USE_SAMPLE_INPUT:
-    cmds = sample_input.split("\n")
-else:
-    with in_path.open('r') as inf:
-        cmds = [line.strip() for line in inf.readlines()]
+sample_input_2 = """
+R 5
+U 8
+L 8
+D 3
+R 17
+D 10
+L 25
+U 20
+""".strip()
 
 class Knot:
     def __init__(self):
@@ -189,61 +200,66 @@ class Rope:
             out += '\n'
         return out
 
-rope = Rope(1)
+def parse(text: str) -> 'list[tuple[str, int]]':
+    cmds = []
+    for line in nonblank_lines(text):
+        dir, count = line.split()
+        cmds.append((dir, int(count)))
+    return cmds
 
-if USE_SAMPLE_INPUT:
-    print("== Initial State ==")
-    print(rope.plot((6, 5), (0, 0)))
+def part1(cmds: 'list[tuple[str, int]]', verbose: bool = False) -> int:
+    rope = Rope(1)
 
-for cmd in cmds:
-    if USE_SAMPLE_INPUT:
-        print(f"== {cmd} ==", end="\n\n")
-
-    dir, count = cmd.split()
-    count = int(count)
-    for i in range(count):
-        rope.step(dir)
-        if USE_SAMPLE_INPUT:
-            print(rope.plot((6, 5), (0, 0)))
-
-if USE_SAMPLE_INPUT:
-    print("\n")
-    print(rope.knots[0].plot_visited((6, 5), (0, 0)))
-
-print("Part 1:", len(rope.knots[0].tail_visited))
-
-# Part 2
-
-if USE_SAMPLE_INPUT:
-    cmds = """
-    R 5
-    U 8
-    L 8
-    D 3
-    R 17
-    D 10
-    L 25
-    U 20
-    """.strip().split('\n')
-
-rope = Rope(9)
-if USE_SAMPLE_INPUT:
-    print("== Initial State ==")
-    print(rope.plot((26, 21), (-11, -5)))
-
-for cmd in cmds:
-    if USE_SAMPLE_INPUT:
-        print(f"== {cmd} ==", end="\n\n")
+    if verbose:
+        print("== Initial State ==")
+        print(rope.plot((6, 5), (0, 0)))
 
-    dir, count = cmd.split()
-    count = int(count)
-    for i in range(count):
-        rope.step(dir)
-    if USE_SAMPLE_INPUT:
+    for dir, count in cmds:
+        if verbose:
+            print(f"== {dir} {count} ==", end="\n\n")
+
+        for i in range(count):
+            rope.step(dir)
+            if verbose:
+                print(rope.plot((6, 5), (0, 0)))
+
+    if verbose:
+        print("\n")
+        print(rope.knots[0].plot_visited((6, 5), (0, 0)))
+
+    return len(rope.knots[0].tail_visited)
+
+def part2(cmds: 'list[tuple[str, int]]', verbose: bool = False) -> int:
+    rope = Rope(9)
+    if verbose:
+        print("== Initial State ==")
         print(rope.plot((26, 21), (-11, -5)))
 
-if USE_SAMPLE_INPUT:
-    print("\n")
-    print(rope.knots[-1].plot_visited((26, 21), (-11, -5)))
+    for dir, count in cmds:
+        if verbose:
+            print(f"== {dir} {count} ==", end="\n\n")
+
+        for i in range(count):
+            rope.step(dir)
+        if verbose:
+            print(rope.plot((26, 21), (-11, -5)))
+
+    if verbose:
+        print("\n")
+        print(rope.knots[-1].plot_visited((26, 21), (-11, -5)))
 
-print("Part 2:", len(rope.knots[-1].tail_visited))
+    return len(rope.knots[-1].tail_visited)
+
+def solve(text: str) -> 'tuple[int, int]':
+    cmds = parse(text)
+    return part1(cmds), part2(cmds)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        print("Part 1:", part1(parse(sample_input), verbose=True))
+        print("Part 2:", part2(parse(sample_input_2), verbose=True))
+    else:
+        with in_path.open('r') as inf:
+            part1_answer, part2_answer = solve(inf.read())
+        print("Part 1:", part1_answer)
+        print("Part 2:", part2_answer)
@@ -0,0 +1,22 @@
+"""
+Synthetic input generator: `size` is the number of instructions.
+
+The X register is kept within the 40-pixel CRT row so the image stays
+meaningful.
+"""
+import random
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    x = 1
+    out = ''
+    for _ in range(size):
+        if rng.random() < 0.3:
+            out += 'noop\n'
+        else:
+            value = rng.randint(-10, 10)
+            if not 0 <= x + value < 40 or value == 0:
+                value = 20 - x
+            x += value
+            out += f'addx {value}\n'
+    return out
@@ -1,7 +1,13 @@
 from pathlib import Path
+import sys
+
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.reader import nonblank_lines
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
+MAPPED_INPUT = True
 
 sample_input = """
 addx 15
@@ -193,42 +199,52 @@ class CPU:
         except StopIteration:
             pass
 
+important_clocks = [20, 60, 100, 140, 180, 220]
 
+def parse(text: str) -> 'list[str]':
+    return list(nonblank_lines(text))
 
-if USE_SAMPLE_INPUT:
-    input = sample_input.split('\n')
-else:
-    with in_path.open("r") as inf:
-        input = [line.strip() for line in inf.readlines()]
+def part1(instructions: 'list[str]', verbose: bool = False) -> int:
+    sum = 0
 
-important_clocks = [20, 60, 100, 140, 180, 220]
-sum = 0
-
-def sum_cb(cpu):
-    global sum
-    if cpu.clock in important_clocks:
-        print(f"{cpu.clock} * {cpu.X} = {cpu.clock * cpu.X}")
-        sum += cpu.clock * cpu.X
-
-cpu = CPU(input, sum_cb)
-cpu.run()
-print("Part 1:", sum)
-
-# PART 2
-crt = [([' '] * 40) for i in range(6)]
-def write_crt(cpu):
-    global crt
-    crt_pos = (cpu.clock-1) % 40
-    crt_row = ((cpu.clock-1) // 40) % 6
-
-    if abs(cpu.X - crt_pos) <= 1:
-        crt[crt_row][crt_pos] = '#'
-    else:
-        crt[crt_row][crt_pos] = '.'
+    def sum_cb(cpu):
+        nonlocal sum
+        if cpu.clock in important_clocks:
+            if verbose:
+                print(f"{cpu.clock} * {cpu.X} = {cpu.clock * cpu.X}")
+            sum += cpu.clock * cpu.X
+
+    cpu = CPU(instructions, sum_cb)
+    cpu.run()
+    return sum
 
+def part2(instructions: 'list[str]') -> str:
+    crt = [([' '] * 40) for i in range(6)]
+    def write_crt(cpu):
+        crt_pos = (cpu.clock-1) % 40
+        crt_row = ((cpu.clock-1) // 40) % 6
 
-cpu = CPU(input, write_crt)
-cpu.run()
+        if abs(cpu.X - crt_pos) <= 1:
+            crt[crt_row][crt_pos] = '#'
+        else:
+            crt[crt_row][crt_pos] = '.'
+
+    cpu = CPU(instructions, write_crt)
+    cpu.run()
+
+    return '\n'.join([''.join(row) for row in crt])
+
+def solve(text: str) -> 'tuple[int, str]':
+    instructions = parse(text)
+    return part1(instructions), part2(instructions)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
 
-for row in crt:
-    print(''.join(row))
+    instructions = parse(input)
+    print("Part 1:", part1(instructions, verbose=True))
+    print(part2(instructions))
@@ -0,0 +1,49 @@
+"""
+Synthetic input generator: `size` is the number of monkeys, at least 3 (so
+that every monkey has someone other than itself and the `old * old` monkey to
+throw to).
+
+Each monkey tests divisibility by a different prime, like the real inputs, so
+the part 2 modulus trick keeps working. Nobody throws to the `old * old`
+monkey, so part 1 worry levels (which are never reduced modulo anything) only
+get squared once and stay small.
+"""
+import random
+
+def primes(count: int) -> 'list[int]':
+    found = []
+    candidate = 2
+    while len(found) < count:
+        if all(candidate % p != 0 for p in found):
+            found.append(candidate)
+        candidate += 1
+    return found
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    size = max(size, 3)
+    divisors = primes(size)
+    rng.shuffle(divisors)
+    squarer = rng.randrange(size)
+
+    monkeys = []
+    for i in range(size):
+        items = ', '.join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 8)))
+        if i == squarer:
+            operation = 'old * old'
+        elif rng.random() < 0.5:
+            operation = f'old * {rng.randint(2, 19)}'
+        else:
+            operation = f'old + {rng.randint(1, 8)}'
+        others = [j for j in range(size) if j != i and j != squarer]
+        true_monkey = rng.choice(others)
+        false_monkey = rng.choice([j for j in others if j != true_monkey] or others)
+        monkeys.append(
+            f'Monkey {i}:\n'
+            f'  Starting items: {items}\n'
+            f'  Operation: new = {operation}\n'
+            f'  Test: divisible by {divisors[i]}\n'
+            f'    If true: throw to monkey {true_monkey}\n'
+            f'    If false: throw to monkey {false_monkey}\n'
+        )
+    return '\n'.join(monkeys)
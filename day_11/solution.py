@@ -1,8 +1,16 @@
 from pathlib import Path
 import copy
+import sys
+
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.cycles import CycleDetector
+from aoc.reader import iter_blocks
+from aoc.trace import NO_TRACE, Tracer
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
+MAPPED_INPUT = True
 
 sample_input = """
 Monkey 0:
@@ -34,17 +42,6 @@ Monkey 3:
     If false: throw to monkey 1
 """.strip()
 
-def maybe_print(should_print, message):
-    if should_print:
-        print(message)
-
-disable_global_worry_operation = False
-def global_worry_operation(item):
-    if disable_global_worry_operation:
-        return item
-    else:
-        return item // 3
-
 class Monkey:
     def __init__(self, monkey_id, items, operation, test, true_monkey_idx, false_monkey_idx):
         self.monkey_id = monkey_id
@@ -56,13 +53,19 @@ class Monkey:
         self.inspect_count = 0
 
         self.mod_base = -1
+        self.disable_worry_operation = False
 
     def set_mod_base(self, mod_base):
         self.mod_base = mod_base
 
+    def worry_operation(self, item):
+        if self.disable_worry_operation:
+            return item
+        else:
+            return item // 3
+
     @staticmethod
-    def from_str(monkey_str):
-        lines = [line.strip() for line in monkey_str.split("\n")]
+    def from_lines(lines: 'list[str]'):
         monkey_id = int(lines[0][7:-1])
         starting_items = [int(item) for item in (lines[1][16:]).split(',')]
         operation = lines[2][17:]
@@ -83,26 +86,36 @@ class Monkey:
         old = item
         result = eval(self.operation)
         if self.mod_base > 0:
-            result = result % mod_base
+            result = result % self.mod_base
         return result
 
-    def take_turn(self, quiet=True):
+    def throw_target(self, item) -> int:
+        return self.true_monkey_idx if item % self.test == 0 else self.false_monkey_idx
+
+    def take_turn(self, trace: Tracer = NO_TRACE):
         items = self.items
         self.items = []
-        maybe_print(not quiet, f"Monkey {self.monkey_id}:")
+        tracing = trace.enabled
+        if tracing:
+            trace("Monkey {}:", self.monkey_id)
         for item in items:
-            maybe_print(not quiet, f"  Monkey inspects an item with a worry level of {item}.")
+            if tracing:
+                trace("Monkey inspects an item with a worry level of {}.", item, depth=1)
             item = self.apply_operation(item)
-            maybe_print(not quiet, f"    Worry level becomes {item}.")
-            item = global_worry_operation(item)
-            maybe_print(not quiet, f"    Monkey gets bored with item. Worry level is divided by 3 to {item}.")
+            if tracing:
+                trace("Worry level becomes {}.", item, depth=2)
+            item = self.worry_operation(item)
+            if tracing:
+                trace("Monkey gets bored with item. Worry level is divided by 3 to {}.", item, depth=2)
             if item % self.test == 0:
-                maybe_print(not quiet, f"    Current worry level is divisible by {self.test}.")
-                maybe_print(not quiet, f"    Item with worry level {item} is thrown to monkey {self.true_monkey_idx}.")
+                if tracing:
+                    trace("Current worry level is divisible by {}.", self.test, depth=2)
+                    trace("Item with worry level {} is thrown to monkey {}.", item, self.true_monkey_idx, depth=2)
                 self.true_monkey.catch(item)
             else:
-                maybe_print(not quiet, f"    Current worry level is not divisible by {self.test}.")
-                maybe_print(not quiet, f"    Item with worry level {item} is thrown to monkey {self.false_monkey_idx}.")
+                if tracing:
+                    trace("Current worry level is not divisible by {}.", self.test, depth=2)
+                    trace("Item with worry level {} is thrown to monkey {}.", item, self.false_monkey_idx, depth=2)
                 self.false_monkey.catch(item)
 
     def __str__(self):
@@ -113,75 +126,126 @@ class Monkey:
             + f"    If true: throw to monkey {self.true_monkey_idx}\n" \
             + f"    If false: throw to monkey {self.false_monkey_idx}"
 
+def parse(text: str) -> 'list[Monkey]':
+    return [Monkey.from_lines(block) for block in iter_blocks(text)]
 
-if USE_SAMPLE_INPUT:
-    orig_monkeys = [Monkey.from_str(m) for m in sample_input.split("\n\n")]
-else:
-    with in_path.open("r") as inf:
-        orig_monkeys = [Monkey.from_str(m) for m in inf.read().split("\n\n")]
-
-monkeys = copy.deepcopy(orig_monkeys)
-for monkey in monkeys:
-    monkey.reference_monkeys(monkeys)
-
-
-for round in range(20):
+def part1(orig_monkeys: 'list[Monkey]', verbose: bool = False, trace_items: bool = False) -> int:
+    monkeys = copy.deepcopy(orig_monkeys)
     for monkey in monkeys:
-        monkey.take_turn()
-    if USE_SAMPLE_INPUT:
-        print(f"After round {round+1}, the monkeys are holding items with these worry levels:")
+        monkey.reference_monkeys(monkeys)
+
+    trace = Tracer(trace_items)
+    for round in range(20):
+        for monkey in monkeys:
+            monkey.take_turn(trace)
+        if verbose:
+            print(f"After round {round+1}, the monkeys are holding items with these worry levels:")
+            for monkey in monkeys:
+                print(f"Monkey {monkey.monkey_id}: {', '.join([str(item) for item in monkey.items])}")
+            print()
+
+    if verbose:
         for monkey in monkeys:
-            print(f"Monkey {monkey.monkey_id}: {', '.join([str(item) for item in monkey.items])}")
-        print()
-
-for monkey in monkeys:
-    print(f'Monkey {monkey.monkey_id} inspected items {monkey.inspect_count} times.')
-
-sorted_monkeys = sorted(monkeys, key=lambda m: m.inspect_count, reverse=True)
-print("Part 1:", sorted_monkeys[0].inspect_count * sorted_monkeys[1].inspect_count)
-
-# Part 2
-
-monkeys = copy.deepcopy(orig_monkeys)
-for monkey in monkeys:
-    monkey.reference_monkeys(monkeys)
-
-# We need to find a way to prevent worry levels from becoming too large. If we just leave the
-# worry levels as-is, they rapidly become so large that it takes a significant amount of processor
-# time to perform even basic multiplication or addition.
-#
-# The goal is to find a sort of "representative" number that is smaller, but will satisfy the
-# divisibility tests in the same way as the original number. Also, this property needs to be
-# maintained across addition and multiplication.
-#
-# Let f(x) be the function that returns the representative number.
-# Let S be the set of integers used by the monkeys in their various divisibility tests.
-# We need the following to be true:
-#   1. For any x and any s in S, then if x = 0 mod s, then f(x) = 0 mod s
-#   2. For any x and any s in S, then if x != 0 mod s, then f(x) != 0 mod s
-#   3. For any x,k and any s in S, then if (x+k) = 0 mod s, then f(f(x) + k) = 0 mod s
-#   4. For any x,k and any s in S, then if (x+k) != 0 mod s, then f(f(x) + k) != 0 mod s
-#   5. For any x,k and any s in S, then if kx = 0 mod s, then f(k*f(x)) = 0 mod s
-#   6. For any x,k and any s in S, then if kx != 0 mod s, then f(k*f(x)) != 0 mod s
-#
-# Let m be the product of all values in S.
-# It can be shown (aka, I don't want to prove it rn) that f(x) = x % m satisfies the above
-# properties.
-
-mod_base = 1
-for monkey in monkeys:
-    mod_base *= monkey.test
-for monkey in monkeys:
-    monkey.set_mod_base(mod_base)
-
-disable_global_worry_operation = True
-
-for round in range(10000):
+            print(f'Monkey {monkey.monkey_id} inspected items {monkey.inspect_count} times.')
+
+    sorted_monkeys = sorted(monkeys, key=lambda m: m.inspect_count, reverse=True)
+    return sorted_monkeys[0].inspect_count * sorted_monkeys[1].inspect_count
+
+def follow_item(monkeys: 'list[Monkey]', monkey_idx: int, item: int, rounds: int) -> 'list[int]':
+    """
+    Returns how many times each monkey inspects one item over `rounds`
+    rounds. Items never affect each other, so every item can be followed on
+    its own, and since worry levels are kept modulo the monkeys' tests the
+    item soon returns to a (monkey, worry level) it has started a round with
+    before, after which the rounds repeat.
+    """
+    counts = [0] * len(monkeys)
+    detector = CycleDetector()
+    found_cycle = False
+    round = 0
+    while round < rounds:
+        # Monkeys take their turns in order, so an item thrown to a later
+        # monkey is inspected again in the same round
+        while True:
+            monkey = monkeys[monkey_idx]
+            counts[monkey_idx] += 1
+            item = monkey.worry_operation(monkey.apply_operation(item))
+            target = monkey.throw_target(item)
+            if target < monkey_idx:
+                monkey_idx = target
+                break
+            monkey_idx = target
+        round += 1
+
+        if not found_cycle:
+            cycle = detector.observe(round, (monkey_idx, item), tuple(counts))
+            if cycle is not None:
+                # Fewer than one period's rounds are left after this
+                found_cycle = True
+                round, counts = cycle.fast_forward(round, rounds, tuple(counts))
+                counts = list(counts)
+    return counts
+
+def part2(orig_monkeys: 'list[Monkey]', verbose: bool = False) -> int:
+    monkeys = copy.deepcopy(orig_monkeys)
+    for monkey in monkeys:
+        monkey.reference_monkeys(monkeys)
+
+    # We need to find a way to prevent worry levels from becoming too large. If we just leave the
+    # worry levels as-is, they rapidly become so large that it takes a significant amount of processor
+    # time to perform even basic multiplication or addition.
+    #
+    # The goal is to find a sort of "representative" number that is smaller, but will satisfy the
+    # divisibility tests in the same way as the original number. Also, this property needs to be
+    # maintained across addition and multiplication.
+    #
+    # Let f(x) be the function that returns the representative number.
+    # Let S be the set of integers used by the monkeys in their various divisibility tests.
+    # We need the following to be true:
+    #   1. For any x and any s in S, then if x = 0 mod s, then f(x) = 0 mod s
+    #   2. For any x and any s in S, then if x != 0 mod s, then f(x) != 0 mod s
+    #   3. For any x,k and any s in S, then if (x+k) = 0 mod s, then f(f(x) + k) = 0 mod s
+    #   4. For any x,k and any s in S, then if (x+k) != 0 mod s, then f(f(x) + k) != 0 mod s
+    #   5. For any x,k and any s in S, then if kx = 0 mod s, then f(k*f(x)) = 0 mod s
+    #   6. For any x,k and any s in S, then if kx != 0 mod s, then f(k*f(x)) != 0 mod s
+    #
+    # Let m be the product of all values in S.
+    # It can be shown (aka, I don't want to prove it rn) that f(x) = x % m satisfies the above
+    # properties.
+
+    mod_base = 1
     for monkey in monkeys:
-        monkey.take_turn()
+        mod_base *= monkey.test
+    for monkey in monkeys:
+        monkey.set_mod_base(mod_base)
+        monkey.disable_worry_operation = True
+
+    inspect_counts = [0] * len(monkeys)
+    for monkey_idx, monkey in enumerate(monkeys):
+        for item in monkey.items:
+            for i, count in enumerate(follow_item(monkeys, monkey_idx, item, 10000)):
+                inspect_counts[i] += count
+    for monkey, count in zip(monkeys, inspect_counts):
+        monkey.inspect_count = count
+
+    if verbose:
+        for monkey in monkeys:
+            print(f'Monkey {monkey.monkey_id} inspected items {monkey.inspect_count} times.')
 
-for monkey in monkeys:
-    print(f'Monkey {monkey.monkey_id} inspected items {monkey.inspect_count} times.')
+    sorted_monkeys = sorted(monkeys, key=lambda m: m.inspect_count, reverse=True)
+    return sorted_monkeys[0].inspect_count * sorted_monkeys[1].inspect_count
+
+def solve(text: str) -> 'tuple[int, int]':
+    monkeys = parse(text)
+    return part1(monkeys), part2(monkeys)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
 
-sorted_monkeys = sorted(monkeys, key=lambda m: m.inspect_count, reverse=True)
-print("Part 2:", sorted_monkeys[0].inspect_count * sorted_monkeys[1].inspect_count)
+    monkeys = parse(input)
+    print("Part 1:", part1(monkeys, verbose=True, trace_items=USE_SAMPLE_INPUT))
+    print("Part 2:", part2(monkeys, verbose=True))
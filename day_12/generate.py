@@ -0,0 +1,54 @@
+"""
+Synthetic input generator: `size` is the width of the heightmap (the height is
+a third of that). Widths below 32 are rounded up to 32, the narrowest map
+whose path from S to E is long enough to climb from 'a' to 'z'.
+
+A monotone staircase path leads from S to E, rising by one level per step over
+its last 25 steps (and staying at 'a' before that), so the summit is always
+reachable; everything off that path is noise around a slope towards E.
+"""
+import random
+import string
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    width = max(size, 32)
+    height = max(width // 3, 4)
+
+    start = (0, height // 2)
+    goal = (width - width // 4, height // 4)
+
+    def distance(x, y):
+        return abs(x - goal[0]) + abs(y - goal[1])
+
+    # Scale so that the terrain is still at 'a' around S
+    scale = max(1, distance(*start) // 26)
+    def base_height(x, y):
+        return max(0, 25 - distance(x, y) // scale)
+
+    # Heights go by the number of steps left to E, so that each step along
+    # the path rises at most one level
+    path_height = {}
+    x, y = start
+    while (x, y) != goal:
+        path_height[x, y] = max(0, 25 - distance(x, y))
+        steps = []
+        if x != goal[0]:
+            steps.append((x + (1 if goal[0] > x else -1), y))
+        if y != goal[1]:
+            steps.append((x, y + (1 if goal[1] > y else -1)))
+        x, y = rng.choice(steps)
+
+    out = ''
+    for y in range(height):
+        for x in range(width):
+            if (x, y) == start:
+                out += 'S'
+            elif (x, y) == goal:
+                out += 'E'
+            elif (x, y) in path_height:
+                out += string.ascii_lowercase[path_height[x, y]]
+            else:
+                out += string.ascii_lowercase[min(25, max(0, base_height(x, y) + rng.randint(-3, 3)))]
+        out += '\n'
+    return out
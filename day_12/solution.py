@@ -1,9 +1,14 @@
 from pathlib import Path
-import heapq
-import time
+import sys
+
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.grid import Grid2D
+from aoc.search import SearchResult, bfs
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
+PARSER_VERSION = 2
 
 sample_input = """
 Sabqponm
@@ -13,75 +18,27 @@ acctuvwj
 abdefghi
 """.strip()
 
-if USE_SAMPLE_INPUT:
-    input = sample_input.split('\n')
-else:
-    with in_path.open("r") as inf:
-        input = inf.read().strip().split('\n')
-
-class GridNode:
-    def __init__(self, height, gridPos):
-        self.height = height
-        self.gridPos = gridPos
-
-    def set_reachable_nodes(self, nodes):
-        self.neighbors = nodes
-
-    def __eq__(self, other):
-        if not isinstance(other, GridNode):
-            return False
-        return self.gridPos == other.gridPos
-
-    def __repr__(self):
-        return f"GridNode(height={self.height.__repr__()}, gridPos={self.gridPos.__repr__()})"
-
-class AStarNode:
-    def __init__(self, gridNode, prev, pathlen, totalcost):
-        self.gridNode = gridNode
-        self.prev = prev
-        self.pathlen = pathlen
-        self.totalcost = totalcost
-
-    def __lt__(self, other):
-        return self.totalcost < other.totalcost
-
-start = None
-goal = None
-
-grid = []
-for y, row in enumerate(input):
-    curr = []
-    for x, c in enumerate(row):
-        if c == 'E':
-            goal = GridNode(ord('z') - ord('a'), (x, y))
-            curr.append(goal)
-        elif c == 'S':
-            start = GridNode(0, (x, y))
-            curr.append(start)
-        else:
-            curr.append(GridNode(ord(c) - ord('a'), (x, y)))
-    grid.append(curr)
-
-for y, row in enumerate(grid):
-    for x, node in enumerate(row):
-        adjacent_nodes = []
-        if y > 0:
-            adjacent_nodes.append(grid[y-1][x])
-        if y < len(grid)-1:
-            adjacent_nodes.append(grid[y+1][x])
-        if x > 0:
-            adjacent_nodes.append(grid[y][x-1])
-        if x < len(row)-1:
-            adjacent_nodes.append(grid[y][x+1])
-
-        reachable_nodes = []
-        for candidate_node in adjacent_nodes:
-            if candidate_node.height <= node.height + 1:
-                reachable_nodes.append(candidate_node)
-        node.set_reachable_nodes(reachable_nodes)
-
-def estimate_cost(node) -> float:
-    return ((node.gridPos[0] - goal.gridPos[0])**2 + (node.gridPos[1] - goal.gridPos[1])**2)**0.5
+class Heightmap:
+    def __init__(self, grid: Grid2D, start: int, goal: int):
+        # Heights 0-25, with start and goal as flat indices into the grid
+        self.grid = grid
+        self.start = start
+        self.goal = goal
+
+    def reachable_neighbors(self, index: int) -> 'list[int]':
+        heights = self.grid.cells
+        max_height = heights[index] + 1
+        return [n for n in self.grid.neighbors(index) if heights[n] <= max_height]
+
+def parse(text: str) -> Heightmap:
+    grid = Grid2D.from_text(text.strip())
+    start = grid.cells.index(ord('S'))
+    goal = grid.cells.index(ord('E'))
+    grid.cells[start] = ord('a')
+    grid.cells[goal] = ord('z')
+    # Store heights as 0-25 rather than as letters
+    grid.cells[:] = bytes(c - ord('a') for c in grid.cells)
+    return Heightmap(grid, start, goal)
 
 def get_dir_chr(fromPoint, toPoint):
     assert (fromPoint[0] == toPoint[0]) != (fromPoint[1] == toPoint[1])
@@ -97,91 +54,48 @@ def get_dir_chr(fromPoint, toPoint):
         else:
             return '<'
 
-should_clear = False
+def path_to_goal(heightmap: Heightmap, starts: 'list[int]') -> SearchResult:
+    goal = heightmap.goal
+    result = bfs(starts, heightmap.reachable_neighbors, len(heightmap.grid.cells), lambda i: i == goal)
+    if not result.found:
+        raise ValueError('No path to the summit')
+    return result
 
-def plot_progress(curr, openset, seen):
-    global should_clear
-    time.sleep(0.001)
-    if should_clear:
-        for _ in range(len(grid)):
-            print("\u001b[1F\u001b[2K", end="")
-    else:
-        should_clear = True
-
-    output = [ ['.' for _ in row] for row in grid]
-    for x,y in seen:
-        output[y][x] = 'X'
-    for node in openset:
-        output[node.gridNode.gridPos[1]][node.gridNode.gridPos[0]] = '?'
-
-    output[curr.gridNode.gridPos[1]][curr.gridNode.gridPos[0]] = '!'
-
-    # while curr.prev is not None:
-    #     char = get_dir_chr(curr.prev.gridNode.gridPos, curr.gridNode.gridPos)
-    #     output[curr.prev.gridNode.gridPos[1]][curr.prev.gridNode.gridPos[0]] = char
-    #     curr = curr.prev
-
-    for row in output:
-        print(''.join(row))
-
-def path_to_goal(start, plot=False):
-    if not isinstance(start, list):
-        start = [start]
-    openset = [AStarNode(s, None, 0, estimate_cost(s)) for s in start]
-    seen = set()
-
-    path = []
-
-    while len(openset) > 0:
-        curr = heapq.heappop(openset)
-        if plot:
-            plot_progress(curr, openset, seen)
-
-        if curr.gridNode == goal:
-            while curr is not None:
-                path.append(curr.gridNode)
-                curr = curr.prev
-            path.reverse()
-            return path
-
-        for gridNode in curr.gridNode.neighbors:
-            if gridNode.gridPos in seen:
-                continue
-            seen.add(gridNode.gridPos)
-            stepCost = 1
-            newNode = AStarNode(gridNode, curr, curr.pathlen + 1, curr.pathlen + stepCost + estimate_cost(gridNode))
-            heapq.heappush(openset, newNode)
-
-    return None
-
-def plot_path(path):
-    output = [ ['.' for _ in row] for row in grid]
+def plot_path(heightmap: Heightmap, path: 'list[int]'):
+    grid = heightmap.grid
+    output = Grid2D(grid.width, grid.height, ord('.'))
     for i in range(len(path) - 1):
-        curr = path[i]
-        next = path[i+1]
+        output.cells[path[i]] = ord(get_dir_chr(grid.coords(path[i]), grid.coords(path[i+1])))
 
-        output[curr.gridPos[1]][curr.gridPos[0]] = get_dir_chr(curr.gridPos, next.gridPos)
+    output.cells[heightmap.goal] = ord('E')
 
-    output[goal.gridPos[1]][goal.gridPos[0]] = 'E'
+    print(output)
 
-    for row in output:
-        print(''.join(row))
+def part1(heightmap: Heightmap, verbose: bool = False) -> int:
+    result = path_to_goal(heightmap, [heightmap.start])
+    if verbose:
+        plot_path(heightmap, result.path())
+    return result.dist[heightmap.goal]
 
-path = path_to_goal(start)
-plot_path(path)
+def part2(heightmap: Heightmap, verbose: bool = False) -> int:
+    starts = [i for i, height in enumerate(heightmap.grid.cells) if height == 0]
 
-print("Part 1:", len(path)-1)
+    result = path_to_goal(heightmap, starts)
+    if verbose:
+        plot_path(heightmap, result.path())
+    return result.dist[heightmap.goal]
 
-# PART 2
+def solve(text: str) -> 'tuple[int, int]':
+    heightmap = parse(text)
+    return part1(heightmap), part2(heightmap)
 
-starts = []
-for row in grid:
-    for node in row:
-        if node.height == 0:
-            starts.append(node)
-
-path = path_to_goal(starts)
-
-plot_path(path)
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
 
-print("Part 2:", len(path) - 1)
+    heightmap = parse(input)
+    print("Part 1:", part1(heightmap, verbose=True))
+    print("Part 2:", part2(heightmap, verbose=True))
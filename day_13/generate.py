@@ -0,0 +1,32 @@
+"""
+Synthetic input generator: `size` is the number of packet pairs.
+
+Every packet starts with a distinct integer (never 2 or 6), so no two packets
+(or a packet and a divider) ever compare equal.
+"""
+import random
+
+def random_value(rng: random.Random, depth: int):
+    if depth >= 4 or rng.random() < 0.5:
+        return rng.randint(0, 10)
+    return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+
+def packet_str(packet) -> str:
+    if isinstance(packet, int):
+        return str(packet)
+    return '[' + ','.join(packet_str(p) for p in packet) + ']'
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    firsts = [n for n in range(20 * size + 20) if n not in (2, 6)]
+    firsts = rng.sample(firsts, 2 * size)
+
+    packets = []
+    for first in firsts:
+        head = first
+        for _ in range(rng.randint(0, 2)):
+            head = [head]
+        packets.append(packet_str([head] + [random_value(rng, 1) for _ in range(rng.randint(0, 4))]))
+
+    pairs = [f'{packets[2*i]}\n{packets[2*i+1]}\n' for i in range(size)]
+    return '\n'.join(pairs)
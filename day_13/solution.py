@@ -1,7 +1,14 @@
 from pathlib import Path
+import sys
+
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.reader import iter_blocks
+from aoc.trace import NO_TRACE, Tracer
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
+MAPPED_INPUT = True
 
 sample_input = """
 [1,1,3,1,1]
@@ -29,80 +36,58 @@ sample_input = """
 [1,[2,[3,[4,[5,6,0]]]],8,9]
 """.strip()
 
-if USE_SAMPLE_INPUT:
-    input = sample_input.split("\n\n")
-else:
-    with in_path.open("r") as inf:
-        input = inf.read().strip().split("\n\n")
-
-enable_printd = True
-
 class NoComparisonResult(Exception):
     pass
 
-def printd(msg, depth):
-    if enable_printd:
-        print(("  " * depth) + msg)
-
-def packet_lt(a, b, depth=0):
-    printd(f"- Compare {a} vs {b}", depth)
+def packet_lt(a, b, depth=0, trace: Tracer = NO_TRACE):
+    tracing = trace.enabled
+    if tracing:
+        trace("- Compare {} vs {}", a, b, depth=depth)
     if isinstance(a, int) and isinstance(b, int):
         if a < b:
-            printd("- Left side is smaller, so inputs are in the right order", depth+1)
+            if tracing:
+                trace("- Left side is smaller, so inputs are in the right order", depth=depth+1)
             return True
         else:
-            printd("- Right side is smaller, so inputs are not in the right order", depth+1)
+            if tracing:
+                trace("- Right side is smaller, so inputs are not in the right order", depth=depth+1)
             return False
     elif isinstance(a, list) and isinstance(b, list):
         for i in range(min(len(a), len(b))):
             if a[i] == b[i]:
-                printd(f"- Compare {a[i]} vs {b[i]} (=)", depth+1)
+                if tracing:
+                    trace("- Compare {} vs {} (=)", a[i], b[i], depth=depth+1)
             else:
                 try:
-                    if packet_lt(a[i], b[i], depth+1):
-                        printd("- Left side is smaller, so inputs are in the right order", depth+1)
+                    if packet_lt(a[i], b[i], depth+1, trace):
+                        if tracing:
+                            trace("- Left side is smaller, so inputs are in the right order", depth=depth+1)
                         return True
                     else:
-                        printd("- Right side is smaller, so inputs are not in the right order", depth+1)
+                        if tracing:
+                            trace("- Right side is smaller, so inputs are not in the right order", depth=depth+1)
                         return False
                 except NoComparisonResult:
                     pass
         if len(a) < len(b):
-            printd("- Left side ran out of items, so inputs are in the right order", depth+1)
+            if tracing:
+                trace("- Left side ran out of items, so inputs are in the right order", depth=depth+1)
             return True
         elif len(b) < len(a):
-            printd("- Right side ran out of items, so inputs are not in the right order", depth+1)
+            if tracing:
+                trace("- Right side ran out of items, so inputs are not in the right order", depth=depth+1)
             return False
     elif isinstance(a, list) and isinstance(b, int):
-        printd(f"- Mixed types; convert right to [{b}] and retry comparison", depth+1)
-        return packet_lt(a, [b], depth+1)
+        if tracing:
+            trace("- Mixed types; convert right to [{}] and retry comparison", b, depth=depth+1)
+        return packet_lt(a, [b], depth+1, trace)
     elif isinstance(a, int) and isinstance(b, list):
-        printd(f"- Mixed types; convert left to [{a}] and retry comparison", depth+1)
-        return packet_lt([a], b, depth+1)
+        if tracing:
+            trace("- Mixed types; convert left to [{}] and retry comparison", a, depth=depth+1)
+        return packet_lt([a], b, depth+1, trace)
 
     raise NoComparisonResult()
 
-pairs = []
-
-for pair in input:
-    first, second = pair.split("\n")
-    first = eval(first)
-    second = eval(second)
-
-    pairs.append((first, second))
-
-in_order_indices = []
-for i, (first, second) in enumerate(pairs):
-    print(f"== Pair {i+1} ==")
-    if packet_lt(first, second):
-        in_order_indices.append(i+1)
-    print()
-
-print("In order indices:", ", ".join(str(i) for i in in_order_indices))
-print("Part 1:", sum(in_order_indices))
-
-# PART 2
-
 def mergesort(a):
     if len(a) == 1:
         return a
@@ -131,25 +116,65 @@ def mergesort(a):
             assert packet_lt(merged[i], merged[j])
     return merged
 
+def parse(text: str) -> 'list[tuple[list, list]]':
+    pairs = []
 
-packets = []
-for first, second in pairs:
-    packets.append(first)
-    packets.append(second)
+    for block in iter_blocks(text):
+        first, second = block
+        first = eval(first)
+        second = eval(second)
 
-enable_printd = False
+        pairs.append((first, second))
+    return pairs
 
-divider_packets = [[[2]], [[6]]]
+def part1(pairs: 'list[tuple[list, list]]', verbose: bool = False) -> int:
+    in_order_indices = []
+    for i, (first, second) in enumerate(pairs):
+        if verbose:
+            print(f"== Pair {i+1} ==")
+        if packet_lt(first, second, trace=Tracer(verbose)):
+            in_order_indices.append(i+1)
+        if verbose:
+            print()
+
+    if verbose:
+        print("In order indices:", ", ".join(str(i) for i in in_order_indices))
+    return sum(in_order_indices)
 
-sorted_packets = mergesort(packets + divider_packets)
+divider_packets = [[[2]], [[6]]]
 
-decoder_key = 1
-for i, packet in enumerate(sorted_packets):
-    if packet == [[2]] or packet == [[6]]:
-        decoder_key *= (i+1)
-        print("-> ", end='')
+def part2(pairs: 'list[tuple[list, list]]', verbose: bool = False) -> int:
+    packets = []
+    for first, second in pairs:
+        packets.append(first)
+        packets.append(second)
+
+    sorted_packets = mergesort(packets + divider_packets)
+
+    decoder_key = 1
+    for i, packet in enumerate(sorted_packets):
+        if packet == [[2]] or packet == [[6]]:
+            decoder_key *= (i+1)
+            if verbose:
+                print("-> ", end='')
+        elif verbose:
+            print('   ', end='')
+        if verbose:
+            print(f"{ i:2d})", packet)
+
+    return decoder_key
+
+def solve(text: str) -> 'tuple[int, int]':
+    pairs = parse(text)
+    return part1(pairs), part2(pairs)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
     else:
-        print('   ', end='')
-    print(f"{ i:2d})", packet)
+        with in_path.open("r") as inf:
+            input = inf.read()
 
-print("Part 2:", decoder_key)
+    pairs = parse(input)
+    print("Part 1:", part1(pairs, verbose=True))
+    print("Part 2:", part2(pairs, verbose=True))
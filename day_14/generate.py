@@ -0,0 +1,23 @@
+"""
+Synthetic input generator: `size` is the number of rock paths.
+
+Paths stay within the depth range of the real inputs.
+"""
+import random
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    out = ''
+    for _ in range(size):
+        x = rng.randint(440, 560)
+        y = rng.randint(10, 160)
+        points = [(x, y)]
+        for i in range(rng.randint(1, 6)):
+            step = rng.choice((-1, 1)) * rng.randint(1, 8)
+            if i % 2 == 0:
+                x = x + step if 400 <= x + step <= 600 else x - step
+            else:
+                y = y + step if 5 <= y + step <= 165 else y - step
+            points.append((x, y))
+        out += ' -> '.join(f'{x},{y}' for x, y in points) + '\n'
+    return out
@@ -1,27 +1,34 @@
 from pathlib import Path
+import sys
 import time
 
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.grid import Grid2D
+from aoc.search import bfs
+
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
 
 sample_input = """
 498,4 -> 498,6 -> 496,6
 503,4 -> 502,4 -> 502,9 -> 494,9
 """.strip()
 
-if USE_SAMPLE_INPUT:
-    input = sample_input.split('\n')
-else:
-    with in_path.open("r") as inf:
-        input = inf.read().strip().split('\n')
+AIR = ord('.')
+ROCK = ord('#')
+SAND = ord('o')
+SOURCE = ord('+')
 
-lines = []
-for row in input:
-    line = []
-    for point in row.split(' -> '):
-        x, y = point.split(',')
-        line.append((int(x), int(y)))
-    lines.append(line)
+def parse(text: str) -> 'list[list[tuple[int, int]]]':
+    lines = []
+    for row in text.strip().split('\n'):
+        line = []
+        for point in row.split(' -> '):
+            x, y = point.split(',')
+            line.append((int(x), int(y)))
+        lines.append(line)
+    return lines
 
 
 class Cave:
@@ -55,7 +62,7 @@ class Cave:
         origin = (bounds[0][0], bounds[1][0])
         size = (bounds[0][1] - bounds[0][0] + 1, bounds[1][1] - bounds[1][0] + 1)
 
-        self.grid = [ ['.' for _ in range(size[0])] for _ in range(size[1])]
+        self.grid = Grid2D(size[0], size[1], AIR)
         for line in self.lines:
             for i in range(1, len(line)):
                 curr_point = line[i]
@@ -84,74 +91,87 @@ class Cave:
                     else:
                         dy = -1
                 for _ in range(linelen+1):
-                    self.grid[py][px] = '#'
+                    self.grid[px, py] = ROCK
                     py += dy
                     px += dx
-        self.grid[self.sand_point[1] - origin[1]][self.sand_point[0] - origin[0]] = '+'
+        self.grid[self.rel_sand_point] = SOURCE
 
     def add_floor(self):
-        half_width = (len(self.grid) + 2)
-        self.bounds = ((self.sand_point[0] - half_width, self.sand_point[0] + half_width), (self.sand_point[1], len(self.grid) + 1))
+        half_width = (self.grid.height + 2)
+        self.bounds = ((self.sand_point[0] - half_width, self.sand_point[0] + half_width), (self.sand_point[1], self.grid.height + 1))
         self.origin = (self.bounds[0][0], self.bounds[1][0])
         self.rel_sand_point = (self.sand_point[0] - self.origin[0], self.sand_point[1] - self.origin[1])
         self._calculate_grid()
-        for i in range(len(self.grid[-1])):
-            self.grid[-1][i] = '#'
+        self.grid.row(self.grid.height - 1)[:] = bytes([ROCK]) * self.grid.width
 
     def simulate_sand_drop(self, show=False):
-        curr_sand = self.rel_sand_point
+        grid = self.grid
+        cells = grid.cells
+        width = grid.width
+        source = grid.index(*self.rel_sand_point)
+        curr = source
         while True:
             if show:
                 print(self)
                 time.sleep(0.005)
-                for _ in range(len(self.grid) + 4):
+                for _ in range(grid.height + 4):
                     print("\u001b[1F\u001b[2K", end="")
-            if curr_sand[0] == self.rel_sand_point[0] and curr_sand[1] == self.rel_sand_point[1]:
-                self.grid[curr_sand[1]][curr_sand[0]] = '+'
+            if curr == source:
+                cells[curr] = SOURCE
             else:
-                self.grid[curr_sand[1]][curr_sand[0]] = '.'
+                cells[curr] = AIR
 
-            test_point = (curr_sand[0], curr_sand[1]+1)
-            if test_point[1] == len(self.grid):
+            x = curr % width
+            below = curr + width
+            if below >= len(cells):
                 return False
-            if self.grid[test_point[1]][test_point[0]] == '.':
-                curr_sand = test_point
-                self.grid[test_point[1]][test_point[0]] = 'o'
+            if cells[below] == AIR:
+                curr = below
+                cells[curr] = SAND
                 continue
 
-            test_point = (curr_sand[0]-1, curr_sand[1]+1)
-            if test_point[0] < 0:
+            if x == 0:
                 return False
-            if self.grid[test_point[1]][test_point[0]] == '.':
-                curr_sand = test_point
-                self.grid[test_point[1]][test_point[0]] = 'o'
+            if cells[below - 1] == AIR:
+                curr = below - 1
+                cells[curr] = SAND
                 continue
 
-            test_point = (curr_sand[0]+1, curr_sand[1]+1)
-            if test_point[0] == len(self.grid[0]):
+            if x == width - 1:
                 return False
-            if self.grid[test_point[1]][test_point[0]] == '.':
-                curr_sand = test_point
-                self.grid[test_point[1]][test_point[0]] = 'o'
+            if cells[below + 1] == AIR:
+                curr = below + 1
+                cells[curr] = SAND
                 continue
-            self.grid[curr_sand[1]][curr_sand[0]] = 'o'
+            cells[curr] = SAND
             return True
 
-    def _recursive_fill(self, point):
-        try:
-            if self.grid[point[1]][point[0]] == '.':
-                self.sand_count += 1
-                self.grid[point[1]][point[0]] = 'o'
-                self._recursive_fill((point[0], point[1]+1))
-                self._recursive_fill((point[0]-1, point[1]+1))
-                self._recursive_fill((point[0]+1, point[1]+1))
-        except IndexError:
-            pass
-
-    def recursive_fill(self):
-        self.grid[self.rel_sand_point[1]][self.rel_sand_point[0]] = '.'
-        self.sand_count = 0
-        self._recursive_fill(self.rel_sand_point)
+    def _fall_targets(self, index: int) -> 'list[int]':
+        cells = self.grid.cells
+        width = self.grid.width
+        below = index + width
+        if below >= len(cells):
+            return []
+        x = index % width
+        targets = []
+        if cells[below] == AIR:
+            targets.append(below)
+        if x > 0 and cells[below - 1] == AIR:
+            targets.append(below - 1)
+        if x < width - 1 and cells[below + 1] == AIR:
+            targets.append(below + 1)
+        return targets
+
+    def fill(self):
+        """
+        Fills every cell sand can reach from the source, which is where the
+        sand ends up once the source is blocked.
+        """
+        source = self.grid.index(*self.rel_sand_point)
+        reached = bfs([source], self._fall_targets, len(self.grid.cells))
+        for i in reached.visited:
+            self.grid.cells[i] = SAND
+        self.sand_count = len(reached.visited)
 
     def __str__(self):
         bounds = self._calculate_bounds()
@@ -166,27 +186,44 @@ class Cave:
             out += " " * (values[2] - values[1] - 1)
             out += str((values[2] // (10 ** digit))%10)
             out += "\n"
-        for i in range(len(self.grid)):
-            curr_row = self.grid[i]
-            out += f"{i:3d} {''.join(curr_row)}\n"
+        for i in range(self.grid.height):
+            out += f"{i:3d} {self.grid.row(i).tobytes().decode()}\n"
         return out
 
-c = Cave(lines)
-sand_count = 0
-while c.simulate_sand_drop():
-    sand_count += 1
+def part1(lines: 'list[list[tuple[int, int]]]', verbose: bool = False) -> int:
+    c = Cave(lines)
+    sand_count = 0
+    while c.simulate_sand_drop():
+        sand_count += 1
+
+    if verbose:
+        print(c)
+    return sand_count
+
+def part2(lines: 'list[list[tuple[int, int]]]', verbose: bool = False) -> int:
+    c = Cave(lines)
+    c.add_floor()
 
-print(c)
-print("Part 1:", sand_count)
+    c.fill()
 
-print('\n\n')
+    if verbose:
+        print(c)
+    return c.sand_count
 
-# Part 2
-c.add_floor()
+def solve(text: str) -> 'tuple[int, int]':
+    lines = parse(text)
+    return part1(lines), part2(lines)
 
-c.recursive_fill()
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
 
-print(c)
+    lines = parse(input)
+    print("Part 1:", part1(lines, verbose=True))
 
-print("Part 2:", c.sand_count)
+    print('\n\n')
 
+    print("Part 2:", part2(lines, verbose=True))
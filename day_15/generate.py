@@ -0,0 +1,42 @@
+"""
+Synthetic input generator: `size` is the number of sensors.
+
+The distress beacon is hidden somewhere in the 0..4000000 search square (the
+area `solve` searches by default). Four sensors sit diagonally off the hidden
+spot with radii that just miss it, which together cover every other point in
+the square; the rest are scattered randomly with radii that also stop short of
+the hidden spot.
+"""
+import random
+
+SEARCH_SIZE = 4000000
+
+def random_point_at_distance(rng: random.Random, x: int, y: int, dist: int) -> 'tuple[int, int]':
+    dx = rng.randint(-dist, dist)
+    dy = (dist - abs(dx)) * rng.choice((-1, 1))
+    return (x + dx, y + dy)
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    hidden = (rng.randint(1, SEARCH_SIZE - 1), rng.randint(1, SEARCH_SIZE - 1))
+
+    sensors = []
+    for sx in (-1, 1):
+        for sy in (-1, 1):
+            sensors.append((hidden[0] + sx * SEARCH_SIZE, hidden[1] + sy * SEARCH_SIZE))
+    while len(sensors) < size:
+        sensor = (rng.randint(0, SEARCH_SIZE), rng.randint(0, SEARCH_SIZE))
+        if abs(sensor[0] - hidden[0]) + abs(sensor[1] - hidden[1]) > 1:
+            sensors.append(sensor)
+    rng.shuffle(sensors)
+
+    out = ''
+    for sensor in sensors:
+        dist_to_hidden = abs(sensor[0] - hidden[0]) + abs(sensor[1] - hidden[1])
+        if dist_to_hidden == 2 * SEARCH_SIZE:
+            radius = dist_to_hidden - 1
+        else:
+            radius = rng.randint(1, dist_to_hidden - 1)
+        beacon = random_point_at_distance(rng, sensor[0], sensor[1], radius)
+        out += f'Sensor at x={sensor[0]}, y={sensor[1]}: closest beacon is at x={beacon[0]}, y={beacon[1]}\n'
+    return out
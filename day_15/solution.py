@@ -1,8 +1,16 @@
 from pathlib import Path
 import re
+import sys
+
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.geometry import Vector2
+from aoc.grid import Grid2D
+from aoc.intervals import IntervalSet
+from aoc.progress import Progress
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
 
 sample_input = """
 Sensor at x=2, y=18: closest beacon is at x=-2, y=15
@@ -21,54 +29,10 @@ Sensor at x=14, y=3: closest beacon is at x=15, y=3
 Sensor at x=20, y=1: closest beacon is at x=15, y=3
 """.strip()
 
-if USE_SAMPLE_INPUT:
-    input = sample_input
-else:
-    with in_path.open("r") as inf:
-        input = inf.read().strip()
-
-class Point:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-
-    def copy(self):
-        return Point(self.x, self.y)
-
-    def __str__(self):
-        return f"({self.x}, {self.y})"
-
-    def __repr__(self):
-        return f"Point({self.x.__repr__()}, {self.y.__repr__()})"
-
-    def __eq__(self, other):
-        if not isinstance(other, Point):
-            return False
-        return self.x == other.x and self.y == other.y
-
-    def __hash__(self):
-        return (self.x, self.y).__hash__()
-
-    def __add__(self, other):
-        if not isinstance(other, Point):
-            raise TypeError(f"Can only add Point (not \"{ other.__class__.__name__ }\") to Point")
-        return Point(self.x + other.x, self.y + other.y)
-
-    def __radd__(self, other):
-        return self.__add__(other)
-
-    def __sub__(self, other):
-        if not isinstance(other, Point):
-            raise TypeError(f"Can only add Point (not \"{ other.__class__.__name__ }\") to Point")
-        return Point(self.x - other.x, self.y - other.y)
-
-    def __rsub__(self, other):
-        return self.__sub__(other)
-
 class Sensor:
     FROM_STR_RE = re.compile(r'Sensor at x=(-?\d+), y=(-?\d+): closest beacon is at x=(-?\d+), y=(-?\d+)')
 
-    def __init__(self, sensor: Point, beacon: Point):
+    def __init__(self, sensor: Vector2, beacon: Vector2):
         self.sensor = sensor
         self.beacon = beacon
 
@@ -83,14 +47,14 @@ class Sensor:
         sy = int(match.group(2))
         bx = int(match.group(3))
         by = int(match.group(4))
-        return Sensor(Point(sx, sy), Point(bx, by))
+        return Sensor(Vector2(sx, sy), Vector2(bx, by))
 
     def get_bounding_box(self):
-        dist = Point(self.manhattan_distance, self.manhattan_distance)
+        dist = Vector2(self.manhattan_distance, self.manhattan_distance)
 
         return (self.sensor - dist, self.sensor + dist)
 
-    def point_in_range(self, test: Point):
+    def point_in_range(self, test: Vector2):
         dist = abs(test.x - self.sensor.x) + abs(test.y - self.sensor.y)
         return dist <= self.manhattan_distance
 
@@ -123,31 +87,31 @@ class Grid:
             min_y = min(min_y, bounding_box[0].y)
             max_y = max(max_y, bounding_box[1].y)
 
-        origin = Point(min_x, min_y)
+        origin = Vector2(min_x, min_y)
         size = (max_x - min_x + 1, max_y - min_y + 1)
 
-        self.bounds = (Point(min_x, min_y), Point(max_x, max_y))
+        self.bounds = (Vector2(min_x, min_y), Vector2(max_x, max_y))
         self.origin = origin
         self.size = size
 
-    def set_point(self, point: Point, value: str):
+    def set_point(self, point: Vector2, value: str):
         if self.grid is None:
             self.__plot_grid()
         dst = point - self.origin
-        if dst.y < 0 or dst.y >= len(self.grid) or dst.x < 0 or dst.x >= len(self.grid[0]):
+        if not self.grid.in_bounds(dst.x, dst.y):
             raise ValueError(f"Cannot set point {point} outside of grid")
-        self.grid[dst.y][dst.x] = value
+        self.grid[dst.x, dst.y] = ord(value)
 
-    def get_point(self, point: Point) -> str:
+    def get_point(self, point: Vector2) -> str:
         if self.grid is None:
             self.__plot_grid()
         dst = point - self.origin
-        if dst.y < 0 or dst.y >= len(self.grid) or dst.x < 0 or dst.x >= len(self.grid[0]):
+        if not self.grid.in_bounds(dst.x, dst.y):
             raise ValueError(f"Cannot get point {point} outside of grid")
-        return self.grid[dst.y][dst.x]
+        return chr(self.grid[dst.x, dst.y])
 
     def __plot_grid(self):
-        self.grid = [ ['.' for _ in range(self.size[0])] for _ in range(self.size[1]) ]
+        self.grid = Grid2D(self.size[0], self.size[1], ord('.'))
         for sensor in self.sensors:
             self.set_point(sensor.sensor, 'S')
             self.set_point(sensor.beacon, 'B')
@@ -172,17 +136,17 @@ class Grid:
                     out += "    "
             out += "\n"
 
-        for y, row in enumerate(self.grid):
+        for y in range(self.grid.height):
             out += str(y + self.origin.y).rjust(y_axis_digit_count) + " "
-            out += "".join(row)
+            out += self.grid.row(y).tobytes().decode()
             out += '\n'
         return out
 
-    def __draw_manhattan_ring(self, center: Point, radius: int):
+    def __draw_manhattan_ring(self, center: Vector2, radius: int):
         if self.grid is None:
             self.__plot_grid()
-        curr = Point(center.x, center.y - radius)
-        dirs = [Point(1, 1), Point(-1, 1), Point(-1, -1), Point(1, -1)]
+        curr = Vector2(center.x, center.y - radius)
+        dirs = [Vector2(1, 1), Vector2(-1, 1), Vector2(-1, -1), Vector2(1, -1)]
         for dir in dirs:
             while abs(curr.x - center.x) + abs(curr.y - center.y) == radius:
                 try:
@@ -203,25 +167,26 @@ class Grid:
         for sensor in self.sensors:
             self.draw_sensor(sensor)
 
-    def __get_nobeacon_ranges_for_row(self, row):
-        row_ranges = [sensor.get_xrange_for_row(row) for sensor in self.sensors]
-        row_ranges = [r for r in row_ranges if r is not None]
-        row_ranges.sort(key=lambda r: r[0])
-        curr_s, curr_e = row_ranges[0]
-        consolidated_ranges = []
-        for rang in row_ranges:
-            if rang[0] > curr_e+1:
-                consolidated_ranges.append((curr_s, curr_e))
-                curr_s, curr_e = rang
-            else:
-                curr_e = max(curr_e, rang[1])
-        consolidated_ranges.append((curr_s, curr_e))
-        return consolidated_ranges
+    def __sensor_circles(self) -> 'list[tuple[int, int, int]]':
+        # By x, so that each row's ranges mostly come in order and extend the
+        # end of the cover
+        return sorted((sensor.sensor.x, sensor.sensor.y, sensor.manhattan_distance) for sensor in self.sensors)
+
+    @staticmethod
+    def __fill_nobeacon_ranges_for_row(row: int, circles: 'list[tuple[int, int, int]]', cover: IntervalSet):
+        cover.clear()
+        add = cover.add
+        for x, y, radius in circles:
+            dist = radius - abs(y - row)
+            if dist >= 0:
+                # range is inclusive
+                add(x - dist, x + dist)
 
     def count_nobeacon_spots_in_row(self, row):
-        consolidated_ranges = self.__get_nobeacon_ranges_for_row(row)
+        cover = IntervalSet()
+        self.__fill_nobeacon_ranges_for_row(row, self.__sensor_circles(), cover)
 
-        count = sum([rang[1] - rang[0] + 1 for rang in consolidated_ranges])
+        count = cover.length()
 
         remove_points = set()
 
@@ -230,80 +195,80 @@ class Grid:
             remove_points.add(sensor.beacon)
 
         for point in remove_points:
-            if point.y == row:
-                for rang in consolidated_ranges:
-                    if point.x >= rang[0] and point.x <= rang[1]:
-                        count -= 1
+            if point.y == row and point.x in cover:
+                count -= 1
         return count
 
-    def find_nobeacon_spots_in_area(self, bounding_box):
+    def find_nobeacon_spots_in_area(self, bounding_box, verbose=False, progress=False):
         x_range = (bounding_box[0].x, bounding_box[1].x)
         y_range = (bounding_box[0].y, bounding_box[1].y)
         points = set()
 
-        print(f"0%")
-        for y in range(y_range[0], y_range[1]+1):
-            if y % 10000 == 0:
-                print(f"\u001b[1F\u001b[2K{(y / 4000000) * 100:.0f}%")
-            all_ranges = self.__get_nobeacon_ranges_for_row(y)
-            ranges = []
-            for rang in all_ranges:
-                if rang[1] < x_range[0] or rang[0] > x_range[1]:
+        circles = self.__sensor_circles()
+        # Refilled for every row rather than allocated anew
+        cover = IntervalSet()
+        show_rows = verbose and y_range[1] - y_range[0] < 100
+        with Progress(y_range[1] - y_range[0] + 1, enabled=progress) as bar:
+            reporting = bar.enabled
+            for y in range(y_range[0], y_range[1]+1):
+                if reporting and y % 10000 == 0:
+                    bar.set(y - y_range[0])
+                self.__fill_nobeacon_ranges_for_row(y, circles, cover)
+                if cover.covers(x_range[0], x_range[1]) and not show_rows:
                     continue
-                range_start = max(rang[0], x_range[0])
-                range_end = min(rang[1], x_range[1])
-                ranges.append((range_start, range_end))
-
-            uncovered_ranges = []
-            curr_x = x_range[0]
-            for rang in ranges:
-                if rang[0] > curr_x:
-                    uncovered_ranges.append((curr_x, rang[0]-1))
-                curr_x = rang[1]+1
-            if curr_x < x_range[1]:
-                uncovered_ranges.append((curr_x+1, x_range[1]))
-
-            if USE_SAMPLE_INPUT:
-                print(f"== Row {y} ==")
-                print("ranges:", all_ranges)
-                print("trimmed ranges:", ranges)
-                print("inverted:", uncovered_ranges)
-                print()
-
-            for rang in uncovered_ranges:
-                for x in range(rang[0], rang[1]+1):
-                    points.add(Point(x, y))
-        return points
 
+                uncovered = cover.complement(x_range[0], x_range[1])
+
+                if show_rows:
+                    print(f"== Row {y} ==")
+                    print("ranges:", list(cover))
+                    print("trimmed ranges:", list(cover.clip(x_range[0], x_range[1])))
+                    print("inverted:", list(uncovered))
+                    print()
+
+                for start, end in uncovered:
+                    for x in range(start, end+1):
+                        points.add(Vector2(x, y))
+            bar.set(y_range[1] - y_range[0] + 1)
+        return points
 
+def parse(text: str) -> Grid:
+    sensors = [Sensor.from_string(line) for line in text.strip().split('\n')]
+    return Grid(sensors)
 
+def part1(grid: Grid, count_row: int = 2000000) -> int:
+    return grid.count_nobeacon_spots_in_row(count_row)
 
-sensors = [Sensor.from_string(line) for line in input.split('\n')]
-grid = Grid(sensors)
+def part2(grid: Grid, search_size: int = 4000000, verbose: bool = False, progress: bool = False) -> int:
+    points = grid.find_nobeacon_spots_in_area((Vector2(0, 0), Vector2(search_size, search_size)), verbose, progress)
 
-if USE_SAMPLE_INPUT:
-    #grid.draw_sensor(sensors[6])
-    grid.cross_out_beacon_spots()
+    if verbose:
+        for point in points:
+            print(point)
 
-    print(grid)
+    assert len(points) == 1
 
-    count_row = 10
-else:
-    count_row = 2000000
+    point = next(iter(points))
+    return (point.x * 4000000) + point.y
 
-print("Part 1:", grid.count_nobeacon_spots_in_row(count_row))
+def solve(text: str, count_row: int = 2000000, search_size: int = 4000000) -> 'tuple[int, int]':
+    grid = parse(text)
+    return part1(grid, count_row), part2(grid, search_size)
 
-# PART 2
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        grid = parse(sample_input)
 
-if USE_SAMPLE_INPUT:
-    points = grid.find_nobeacon_spots_in_area((Point(0, 0), Point(20, 20)))
-else:
-    points = grid.find_nobeacon_spots_in_area((Point(0, 0), Point(4000000, 4000000)))
+        #grid.draw_sensor(grid.sensors[6])
+        grid.cross_out_beacon_spots()
 
-for point in points:
-    print(point)
+        print(grid)
 
-assert len(points) == 1
+        print("Part 1:", part1(grid, 10))
+        print("Part 2:", part2(grid, 20, verbose=True))
+    else:
+        with in_path.open("r") as inf:
+            grid = parse(inf.read())
 
-point = next(iter(points))
-print("Part 2:", (point.x * 4000000) + point.y)
+        print("Part 1:", part1(grid))
+        print("Part 2:", part2(grid, verbose=True, progress=True))
@@ -0,0 +1,37 @@
+"""
+Synthetic input generator: `size` is the number of valves.
+
+About a quarter of the valves have a non-zero flow rate (the real input has 15
+of 66); the tunnels form a connected, undirected graph.
+"""
+import random
+import string
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    size = max(size, 2)
+
+    labels = [a + b for a in string.ascii_uppercase for b in string.ascii_uppercase if a + b != 'AA']
+    labels = ['AA'] + rng.sample(labels, size - 1)
+
+    tunnels: 'list[set[int]]' = [set() for _ in range(size)]
+    def connect(a, b):
+        tunnels[a].add(b)
+        tunnels[b].add(a)
+    for i in range(1, size):
+        connect(i, rng.randrange(i))
+    for _ in range(size // 2):
+        a, b = rng.sample(range(size), 2)
+        connect(a, b)
+
+    flow_valves = set(rng.sample(range(1, size), max(1, size // 4)))
+
+    out = ''
+    for i, label in enumerate(labels):
+        flow_rate = rng.randint(2, 25) if i in flow_valves else 0
+        destinations = [labels[t] for t in sorted(tunnels[i])]
+        if len(destinations) == 1:
+            out += f'Valve {label} has flow rate={flow_rate}; tunnel leads to valve {destinations[0]}\n'
+        else:
+            out += f'Valve {label} has flow rate={flow_rate}; tunnels lead to valves {", ".join(destinations)}\n'
+    return out
@@ -1,12 +1,15 @@
 from pathlib import Path
 import re
 from itertools import chain, combinations
+import sys
 
-from tqdm import tqdm
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.progress import Progress
 
 USE_SAMPLE_INPUT = True
 SKIP_PART_1 = True
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
 
 sample_input = """
 Valve AA has flow rate=0; tunnels lead to valves DD, II, BB
@@ -21,12 +24,6 @@ Valve II has flow rate=0; tunnels lead to valves AA, JJ
 Valve JJ has flow rate=21; tunnel leads to valve II
 """.strip()
 
-if USE_SAMPLE_INPUT:
-    input = sample_input
-else:
-    with in_path.open("r") as inf:
-        input = inf.read().strip()
-
 
 def powerset(iterable):
     "powerset([1,2,3]) --> () (1,) (2,) (3,) (1,2) (1,3) (2,3) (1,2,3)"
@@ -65,86 +62,106 @@ class Valve:
     def __repr__(self):
         return f"Valve({self.label})"
 
-valves: 'dict[str, Valve]' = {}
+class Network:
+    def __init__(self, valves: 'dict[str, Valve]'):
+        self.valves = valves
+
+        self.significant_valves = [valve for valve in valves.values() if valve.flow_rate > 0]
+        self.possible_open_valves: 'list[frozenset[Valve]]|None' = None
+
+    def calculate_open_valve_sets(self):
+        self.possible_open_valves = [frozenset(s) for s in powerset(self.significant_valves)]
+
+def parse(text: str) -> Network:
+    valves: 'dict[str, Valve]' = {}
 
-for line in input.split('\n'):
-    valve = Valve.from_str(line)
-    valves[valve.label] = valve
+    for line in text.strip().split('\n'):
+        valve = Valve.from_str(line)
+        valves[valve.label] = valve
 
-for valve in valves.values():
-    print(valve)
+    return Network(valves)
 
-significant_valves = [valve for valve in valves.values() if valve.flow_rate > 0]
-possible_open_valves = [frozenset(s) for s in powerset(significant_valves)]
+def precompute(network: Network) -> Network:
+    network.calculate_open_valve_sets()
+    return network
 
-if not SKIP_PART_1:
+def part1(network: Network, progress: bool = False) -> int:
+    valves = network.valves
+    possible_open_valves = network.possible_open_valves
 
     solutions: 'list[dict[str, dict[set[Valve], int]]]' = []
 
-    for i in trange(30):
-        solutions.append({})
-        #if i > 2:
-        #    solutions[i-2] = []
-
-        for valve in valves.values():
-            solutions[i][valve.label] = {}
-            for open_valves in possible_open_valves:
-                sol = 0
-
-                if i > 0:
-                    for tunnel in valve.tunnels:
-                        sol = max(sol, solutions[i-1][tunnel][open_valves])
-
-                    if valve.flow_rate > 0 and valve not in open_valves:
-                        new_open_valves = frozenset(open_valves.union([valve]))
-                        sol = max(sol, solutions[i-1][valve.label][frozenset(new_open_valves)] + (valve.flow_rate * i))
-                solutions[i][valve.label][open_valves] = sol
-
-    solution = solutions[29]['AA'][frozenset()]
-    print("Part 1:", solution)
-
-    del solution
-    del solutions
-solutions: 'list[dict[str, dict[str, dict[set[Valve], int]]]]' = []
-with tqdm(total=26 * len(valves) * len(valves) * len(possible_open_valves)) as pbar:
-    for i in range(26):
-        solutions.append({})
-        if i > 2:
-            solutions[i-2] = []
-
-        for uvalve in valves.values():
-            solutions[i][uvalve.label] = {}
-            for evalve in valves.values():
-                solutions[i][uvalve.label][evalve.label] = {}
+    with Progress(30, 'Part 1', enabled=progress) as bar:
+        for i in range(30):
+            solutions.append({})
+            #if i > 2:
+            #    solutions[i-2] = []
+
+            for valve in valves.values():
+                solutions[i][valve.label] = {}
                 for open_valves in possible_open_valves:
-                    pbar.update()
                     sol = 0
 
                     if i > 0:
-                        # 1. you move, elephant moves
-                        for ut in uvalve.tunnels:
-                            for et in evalve.tunnels:
-                                sol = max(sol, solutions[i-1][ut][et][open_valves])
-
-                        # 2. you move, elephant opens
-                        if evalve.flow_rate > 0 and evalve not in open_valves:
+                        for tunnel in valve.tunnels:
+                            sol = max(sol, solutions[i-1][tunnel][open_valves])
+
+                        if valve.flow_rate > 0 and valve not in open_valves:
+                            new_open_valves = frozenset(open_valves.union([valve]))
+                            sol = max(sol, solutions[i-1][valve.label][frozenset(new_open_valves)] + (valve.flow_rate * i))
+                    solutions[i][valve.label][open_valves] = sol
+            bar.update()
+
+    return solutions[29]['AA'][frozenset()]
+
+def calculate_solutions(network: Network, progress: bool = False) -> 'list[dict[str, dict[str, dict[set[Valve], int]]]]':
+    valves = network.valves
+    possible_open_valves = network.possible_open_valves
+
+    solutions: 'list[dict[str, dict[str, dict[set[Valve], int]]]]' = []
+    # One update per (minute, your valve) rather than per cell keeps the bar
+    # out of the innermost loop
+    cells_per_update = len(valves) * len(possible_open_valves)
+    with Progress(26 * len(valves) * cells_per_update, 'Part 2', enabled=progress) as bar:
+        for i in range(26):
+            solutions.append({})
+            if i > 2:
+                solutions[i-2] = []
+
+            for uvalve in valves.values():
+                solutions[i][uvalve.label] = {}
+                for evalve in valves.values():
+                    solutions[i][uvalve.label][evalve.label] = {}
+                    for open_valves in possible_open_valves:
+                        sol = 0
+
+                        if i > 0:
+                            # 1. you move, elephant moves
                             for ut in uvalve.tunnels:
-                                new_open_valves = frozenset(open_valves.union([evalve]))
-                                sol = max(sol, solutions[i-1][ut][evalve.label][new_open_valves] + (evalve.flow_rate * i))
-
-                        # 3. you open, elephant moves
-                        if uvalve.flow_rate > 0 and uvalve not in open_valves:
-                            for et in evalve.tunnels:
-                                new_open_valves = frozenset(open_valves.union([uvalve]))
-                                sol = max(sol, solutions[i-1][uvalve.label][et][new_open_valves] + (uvalve.flow_rate * i))
-
-                        # 4. you open, elephant opens
-                        if uvalve.flow_rate > 0 and evalve.flow_rate > 0 and uvalve not in open_valves and evalve not in open_valves and uvalve != evalve:
-                            new_open_valves = frozenset(open_valves.union([uvalve, evalve]))
-                            sol = max(sol, solutions[i-1][uvalve.label][evalve.label][new_open_valves] + (uvalve.flow_rate * i) + (evalve.flow_rate * i))
-                    solutions[i][uvalve.label][evalve.label][open_valves] = sol
-
-def backtrace(moves_left: int, your_pos: str, elephant_pos: str, open_valves: 'set[Valve]'):
+                                for et in evalve.tunnels:
+                                    sol = max(sol, solutions[i-1][ut][et][open_valves])
+
+                            # 2. you move, elephant opens
+                            if evalve.flow_rate > 0 and evalve not in open_valves:
+                                for ut in uvalve.tunnels:
+                                    new_open_valves = frozenset(open_valves.union([evalve]))
+                                    sol = max(sol, solutions[i-1][ut][evalve.label][new_open_valves] + (evalve.flow_rate * i))
+
+                            # 3. you open, elephant moves
+                            if uvalve.flow_rate > 0 and uvalve not in open_valves:
+                                for et in evalve.tunnels:
+                                    new_open_valves = frozenset(open_valves.union([uvalve]))
+                                    sol = max(sol, solutions[i-1][uvalve.label][et][new_open_valves] + (uvalve.flow_rate * i))
+
+                            # 4. you open, elephant opens
+                            if uvalve.flow_rate > 0 and evalve.flow_rate > 0 and uvalve not in open_valves and evalve not in open_valves and uvalve != evalve:
+                                new_open_valves = frozenset(open_valves.union([uvalve, evalve]))
+                                sol = max(sol, solutions[i-1][uvalve.label][evalve.label][new_open_valves] + (uvalve.flow_rate * i) + (evalve.flow_rate * i))
+                        solutions[i][uvalve.label][evalve.label][open_valves] = sol
+                bar.update(cells_per_update)
+    return solutions
+
+def backtrace(valves: 'dict[str, Valve]', solutions, moves_left: int, your_pos: str, elephant_pos: str, open_valves: 'set[Valve]'):
     print(f"== Minute {25-moves_left} ==")
     if len(open_valves) == 0:
         print("No valves are open.")
@@ -169,7 +186,7 @@ def backtrace(moves_left: int, your_pos: str, elephant_pos: str, open_valves: 's
                 print(f"You move to valve {ut}.")
                 print(f"The elephant moves to valve {et}.")
                 print()
-                backtrace(moves_left-1, ut, et, open_valves)
+                backtrace(valves, solutions, moves_left-1, ut, et, open_valves)
                 return
 
     # 3. you open, elephant moves
@@ -180,7 +197,7 @@ def backtrace(moves_left: int, your_pos: str, elephant_pos: str, open_valves: 's
                 print(f"You open valve {uvalve.label}.")
                 print(f"The elephant moves to valve {et}.")
                 print()
-                backtrace(moves_left-1, uvalve.label, et, new_open_valves)
+                backtrace(valves, solutions, moves_left-1, uvalve.label, et, new_open_valves)
                 return
 
     # 2. you move, elephant opens
@@ -191,7 +208,7 @@ def backtrace(moves_left: int, your_pos: str, elephant_pos: str, open_valves: 's
                 print(f"You move to valve {ut}.")
                 print(f"The elephant opens valve {evalve.label}.")
                 print()
-                backtrace(moves_left-1, ut, evalve.label, new_open_valves)
+                backtrace(valves, solutions, moves_left-1, ut, evalve.label, new_open_valves)
                 return
 
     # 4. you open, elephant opens
@@ -201,13 +218,35 @@ def backtrace(moves_left: int, your_pos: str, elephant_pos: str, open_valves: 's
             print(f"You open valve {uvalve.label}.")
             print(f"The elephant opens valve {evalve.label}.")
             print()
-            backtrace(moves_left-1, uvalve.label, evalve.label, new_open_valves)
+            backtrace(valves, solutions, moves_left-1, uvalve.label, evalve.label, new_open_valves)
             return
 
     raise ValueError("Should not be reached!!")
 
-solution = solutions[-1]['AA']['AA'][frozenset()]
+def part2(network: Network, progress: bool = False) -> int:
+    solutions = calculate_solutions(network, progress)
+
+    # backtrace(network.valves, solutions, 25, 'AA', 'AA', frozenset())
+
+    return solutions[-1]['AA']['AA'][frozenset()]
+
+def solve(text: str) -> 'tuple[int, int]':
+    network = precompute(parse(text))
+    return part1(network), part2(network)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
+
+    network = precompute(parse(input))
+
+    for valve in network.valves.values():
+        print(valve)
 
-# backtrace(25, 'AA', 'AA', frozenset())
+    if not SKIP_PART_1:
+        print("Part 1:", part1(network, progress=True))
 
-print("Part 2:", solution)
+    print("Part 2:", part2(network, progress=True))
@@ -0,0 +1,8 @@
+"""
+Synthetic input generator: `size` is the length of the jet pattern.
+"""
+import random
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return ''.join(rng.choice('<>') for _ in range(size)) + '\n'
@@ -1,54 +1,18 @@
 from pathlib import Path
+from collections import deque
 import itertools
-from queue import SimpleQueue
+import sys
 
-from tqdm import trange, tqdm
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.cycles import CycleDetector
+from aoc.geometry import Vector2
+from aoc.progress import Progress
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
-
-if USE_SAMPLE_INPUT:
-    input = ">>><<><>><<<>><>>><<<>>><<<><<<>><>><<>>"
-else:
-    with in_path.open("r") as inf:
-        input = inf.read().strip()
-
-class Vector2:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-
-    def __str__(self):
-        return f'({self.x}, {self.y})'
-
-    def __repr__(self):
-        return f'Vector2({self.x}, {self.y})'
-
-    def __eq__(self, other):
-        if not isinstance(other, Vector2):
-            return False
-
-        return other.x == self.x and other.y == self.y
-
-    def __hash__(self):
-        return (self.x, self.y).__hash__()
-
-    def __add__(self, other):
-        if not isinstance(other, Vector2):
-            raise TypeError(f"Can only add Vector2 (not \"{ other.__class__.__name__ }\") to Vector2")
-        return Vector2(self.x + other.x, self.y + other.y)
-
-    def __radd__(self, other):
-        return self.__add__(other)
-
-    def __sub__(self, other):
-        if not isinstance(other, Vector2):
-            raise TypeError(f"Can only subtract Vector2 (not \"{ other.__class__.__name__ }\") from Vector2")
-        return Vector2(self.x - other.x, self.y - other.y)
-
-    def __rsub__(self, other):
-        return self.__sub__(other)
+in_path = Path(__file__).parent / 'input.txt'
 
+sample_input = ">>><<><>><<<>><>>><<<>>><<<><<<>><>><<>>"
 
 class Block:
     def __init__(self, points: 'list[Vector2]'):
@@ -148,13 +112,13 @@ class Chamber:
 
     def __trim(self):
         seen = set()
-        to_visit = SimpleQueue()
-        to_visit.put(Vector2(0, self.highest_y + 1))
+        to_visit = deque()
+        to_visit.append(Vector2(0, self.highest_y + 1))
 
         min_y = self.highest_y + 1
 
-        while not to_visit.empty():
-            curr = to_visit.get()
+        while to_visit:
+            curr = to_visit.popleft()
             if self.__point_collision(curr):
                 min_y = min(min_y, curr.y)
                 continue
@@ -163,7 +127,7 @@ class Chamber:
                 next_point = curr + dir
                 if next_point not in seen:
                     seen.add(next_point)
-                    to_visit.put(next_point)
+                    to_visit.append(next_point)
 
         new_floor = min_y + 1
         if new_floor <= 0:
@@ -201,6 +165,15 @@ class Chamber:
     def max_height(self):
         return self.correction + self.highest_y + 1
 
+    def fingerprint(self) -> bytes:
+        """
+        The filled points as one bitmask byte per row, bottom row first.
+        """
+        rows = bytearray(self.highest_y + 1)
+        for point in self.filled_points:
+            rows[point.y] |= 1 << point.x
+        return bytes(rows)
+
     def __str__(self):
         out = ''
         for y in range(self.highest_y, -1, -1):
@@ -215,8 +188,6 @@ class Chamber:
         out += f"\nMax height: {self.max_height()}"
         return out
 
-chamber = Chamber(input)
-
 block_strs = """
 ####
 
@@ -239,82 +210,81 @@ block_strs = """
 
 blocks = [Block.from_str(bstr) for bstr in block_strs]
 
-# for block in blocks:
-#     print(block)
-#     print("===")
-# exit()
-
-block_repeat = itertools.cycle(blocks)
-for _ in trange(2022):
-    block = next(block_repeat)
-    chamber.simulate_block(block)
-    #print(chamber)
-    #print("====================\n")
-
-print("Part 1", chamber.max_height())
-
-print("\n\n")
-
-# PART 2
-
-class ChamberState:
-    def __init__(self, block_idx: int, jet_idx: int, filled_points: 'frozenset[Vector2]'):
-        self.block_idx = block_idx
-        self.jet_idx = jet_idx
-        self.filled_points = filled_points
-
-    def __eq__(self, other):
-        if not isinstance(other, ChamberState):
-            return False
-        return other.block_idx == self.block_idx and other.jet_idx == self.jet_idx and other.filled_points == self.filled_points
-
-    def __hash__(self):
-        return (self.block_idx, self.jet_idx, self.filled_points).__hash__()
-
-def simulate_without_cycles(num_iter):
-    chamber = Chamber(input)
+def simulate_without_cycles(jet_pattern: str, num_iter: int, progress: bool = False) -> int:
+    chamber = Chamber(jet_pattern)
     block_repeat = itertools.cycle(blocks)
-    for _ in range(num_iter):
-        block = next(block_repeat)
-        chamber.simulate_block(block)
+    with Progress(num_iter, enabled=progress) as bar:
+        reporting = bar.enabled
+        for i in range(num_iter):
+            block = next(block_repeat)
+            chamber.simulate_block(block)
+            #print(chamber)
+            #print("====================\n")
+            if reporting and i % 64 == 0:
+                bar.set(i)
+        bar.set(num_iter)
     return chamber.max_height()
 
-def simulate_with_cycles(num_iter):
-    chamber = Chamber(input)
+def simulate_with_cycles(jet_pattern: str, num_iter: int, verbose: bool = False) -> int:
+    chamber = Chamber(jet_pattern)
     next_block_idx = 0
 
-    saved_states: 'dict[ChamberState, tuple[int, int]]' = {}
-
+    detector = CycleDetector()
     found_cycle = False
 
-    block_iter = 0
-    while block_iter < num_iter:
+    blocks_done = 0
+    while blocks_done < num_iter:
         block = blocks[next_block_idx]
         next_block_idx = (next_block_idx + 1) % len(blocks)
 
         chamber.simulate_block(block)
+        blocks_done += 1
         if not found_cycle:
-            state = ChamberState(next_block_idx, chamber.next_jet_idx, frozenset(chamber.filled_points))
-            if state in saved_states:
+            height = chamber.max_height()
+            cycle = detector.observe(blocks_done, (next_block_idx, chamber.next_jet_idx, chamber.fingerprint()), (height,))
+            if cycle is not None:
                 found_cycle = True
-                prev_block_iter, prev_height = saved_states[state]
-                block_iter_diff = block_iter - prev_block_iter
-                height_diff = chamber.max_height() - prev_height
 
-                print(f"Found cycle! Iteration {prev_block_iter} matches iteration {block_iter}")
-                print("Iter diff:", block_iter_diff)
-                print("Height diff:", height_diff)
+                if verbose:
+                    print(f"Found cycle! Block {cycle.start} matches block {blocks_done}")
+                    print("Iter diff:", cycle.length)
+                    print("Height diff:", cycle.deltas[0])
 
-                assert block_iter_diff > 0
-                assert height_diff > 0
+                assert cycle.deltas[0] > 0
 
-                repeats = (num_iter - block_iter) // block_iter_diff
-                block_iter += block_iter_diff * repeats
-                chamber.correction += height_diff * repeats
-
-            else:
-                saved_states[state] = (block_iter, chamber.max_height())
-        block_iter += 1
+                blocks_done, (new_height,) = cycle.fast_forward(blocks_done, num_iter, (height,))
+                chamber.correction += new_height - height
     return chamber.max_height()
 
-print("Part 2", simulate_with_cycles(1000000000000))
+def parse(text: str) -> str:
+    return text.strip()
+
+def part1(jet_pattern: str, progress: bool = False, num_blocks: int = 2022) -> int:
+    return simulate_without_cycles(jet_pattern, num_blocks, progress)
+
+def part2(jet_pattern: str, verbose: bool = False, num_blocks: int = 1000000000000) -> int:
+    return simulate_with_cycles(jet_pattern, num_blocks, verbose)
+
+def solve(text: str) -> 'tuple[int, int]':
+    jet_pattern = parse(text)
+    return part1(jet_pattern), part2(jet_pattern)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
+
+    jet_pattern = parse(input)
+
+    # for block in blocks:
+    #     print(block)
+    #     print("===")
+    # exit()
+
+    print("Part 1", part1(jet_pattern, progress=True))
+
+    print("\n\n")
+
+    print("Part 2", part2(jet_pattern, verbose=True))
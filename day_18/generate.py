@@ -0,0 +1,19 @@
+"""
+Synthetic input generator: `size` is the edge length of the bounding cube.
+
+Roughly a third of the voxels are filled, like the real input, which leaves
+plenty of enclosed air pockets for part 2.
+"""
+import random
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    out = ''
+    for x in range(size):
+        for y in range(size):
+            for z in range(size):
+                if rng.random() < 0.35:
+                    out += f'{x},{y},{z}\n'
+    if out == '':
+        out = '0,0,0\n'
+    return out
@@ -1,8 +1,16 @@
 from pathlib import Path
-from queue import SimpleQueue
+import sys
+
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.accel import numpy
+from aoc.geometry import Vector3
+from aoc.search import bfs
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
+# Droplets on grids with fewer cells than this are counted in pure Python
+NUMPY_MIN_CELLS = 100000
 
 sample_input = """
 2,2,2
@@ -20,121 +28,140 @@ sample_input = """
 2,3,5
 """.strip()
 
-if USE_SAMPLE_INPUT:
-    input = sample_input
-else:
-    with in_path.open("r") as inf:
-        input = inf.read().strip()
-
-class Vector3:
-    def __init__(self, x, y, z):
-        self.x = x
-        self.y = y
-        self.z = z
-
-    def __str__(self):
-        return f'({self.x}, {self.y}, {self.z})'
-
-    def __repr__(self):
-        return f'Vector2({self.x}, {self.y}, {self.z})'
-
-    def __eq__(self, other):
-        if not isinstance(other, Vector3):
-            return False
-
-        return other.x == self.x and other.y == self.y and other.z == self.z
-
-    def __hash__(self):
-        return (self.x, self.y, self.z).__hash__()
-
-    def __add__(self, other):
-        if not isinstance(other, Vector3):
-            raise TypeError(f"Can only add Vector3 (not \"{ other.__class__.__name__ }\") to Vector3")
-        return Vector3(self.x + other.x, self.y + other.y, self.z + other.z)
-
-    def __radd__(self, other):
-        return self.__add__(other)
-
-    def __sub__(self, other):
-        if not isinstance(other, Vector3):
-            raise TypeError(f"Can only subtract Vector3 (not \"{ other.__class__.__name__ }\") from Vector3")
-        return Vector3(self.x - other.x, self.y - other.y, self.z - other.z)
-
-    def __rsub__(self, other):
-        return self.__sub__(other)
-
 DIRS = (Vector3(1, 0, 0), Vector3(-1, 0, 0), Vector3(0, 1, 0), Vector3(0, -1, 0), Vector3(0, 0, 1), Vector3(0, 0, -1))
 
-cubes: 'set[Vector3]' = set()
-for line in input.split("\n"):
-    x, y, z = line.split(",")
-    cubes.add(Vector3(int(x), int(y), int(z)))
-
-seen: 'set[Vector3]' = set()
-to_visit: 'SimpleQueue[Vector3]' = SimpleQueue()
-connected_side_count = 0
-while len(seen) < len(cubes):
-    unseen = cubes.difference(seen)
-    curr = next(iter(unseen))
-    to_visit.put(curr)
-    seen.add(curr)
-
-    while not to_visit.empty():
-        curr = to_visit.get()
-        for dir in DIRS:
-            test = curr + dir
-            if test in cubes:
-                connected_side_count += 1
-            if test in cubes and test not in seen:
-                seen.add(test)
-                to_visit.put(test)
-
-print("Part 1:", (len(cubes) * 6) - connected_side_count)
-
-# PART 2
-
-curr = next(iter(cubes))
-minx = maxx = curr.x
-miny = maxy = curr.y
-minz = maxz = curr.z
-for cube in cubes:
-    minx = min(minx, cube.x)
-    miny = min(miny, cube.y)
-    minz = min(minz, cube.z)
-
-    maxx = max(maxx, cube.x)
-    maxy = max(maxy, cube.y)
-    maxz = max(maxz, cube.z)
-
-
-
-to_visit: 'SimpleQueue[Vector3]' = SimpleQueue()
-seen: 'set[Vector3]' = set()
-
-for x in range(minx-1, maxx + 2):
-    for y in range(miny - 1, maxy + 2):
-        for z in range(minz - 1, maxz + 2):
-            if x > minx-1 and x < maxx+1 and y > miny-1 and y < maxy+1 and z > minz-1 and z < maxz+1:
-                continue
-            curr = Vector3(x, y, z)
-            if curr in seen:
-                continue
-            to_visit.put(curr)
-            seen.add(curr)
-
-surface_area_count = 0
-while not to_visit.empty():
-    curr = to_visit.get()
-    for dir in DIRS:
-        test = curr + dir
-        if test in cubes:
-            surface_area_count += 1
-        else:
-            if test.x < minx or test.x > maxx or test.y < miny or test.y > maxy or test.z < minz or test.z > maxz:
-                continue
-            if test not in seen:
-                seen.add(test)
-                to_visit.put(test)
-
-print("Part 2:", surface_area_count)
-
+def parse(text: str) -> 'set[Vector3]':
+    cubes: 'set[Vector3]' = set()
+    for line in text.strip().split("\n"):
+        x, y, z = line.split(",")
+        cubes.add(Vector3(int(x), int(y), int(z)))
+    return cubes
+
+class Droplet:
+    """
+    The cubes on a flat occupancy grid covering their bounding box plus two
+    cells on every side. The outermost layer is marked as BORDER so that a
+    search over the remaining air never steps off the grid.
+    """
+    AIR = 0
+    CUBE = 1
+    BORDER = 2
+
+    def __init__(self, cubes: 'set[Vector3]'):
+        self.origin = Vector3(min(c.x for c in cubes) - 2, min(c.y for c in cubes) - 2, min(c.z for c in cubes) - 2)
+        self.width = max(c.x for c in cubes) - self.origin.x + 3
+        self.depth = max(c.y for c in cubes) - self.origin.y + 3
+        self.height = max(c.z for c in cubes) - self.origin.z + 3
+
+        layer = self.width * self.depth
+        self.cells = bytearray(layer * self.height)
+        border_row = bytes([Droplet.BORDER]) * self.width
+        self.cells[:layer] = border_row * self.depth
+        self.cells[-layer:] = border_row * self.depth
+        for z in range(1, self.height - 1):
+            first_row = z * layer
+            last_row = first_row + layer - self.width
+            self.cells[first_row:first_row + self.width] = border_row
+            self.cells[last_row:last_row + self.width] = border_row
+            for row in range(first_row, last_row, self.width):
+                self.cells[row] = Droplet.BORDER
+                self.cells[row + self.width - 1] = Droplet.BORDER
+        self.cubes = [self.index(cube - self.origin) for cube in cubes]
+        for i in self.cubes:
+            self.cells[i] = Droplet.CUBE
+
+        self.offsets = [self.index(d) for d in DIRS]
+
+    def index(self, pos: Vector3) -> int:
+        return pos.packed(self.width, self.depth)
+
+    def air_neighbors(self, i: int) -> 'list[int]':
+        cells = self.cells
+        return [i + d for d in self.offsets if cells[i + d] == Droplet.AIR]
+
+    def cube_faces(self, i: int) -> int:
+        cells = self.cells
+        return sum(1 for d in self.offsets if cells[i + d] == Droplet.CUBE)
+
+    def voxels(self, np):
+        """
+        The grid as a (z, y, x) array over the same memory.
+        """
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.height, self.depth, self.width)
+
+def neighbor_slices(axis: int) -> 'tuple[tuple[slice, ...], tuple[slice, ...]]':
+    """
+    Slices of a voxel grid that line every cell up with its neighbor one step
+    further along `axis`.
+    """
+    lower = [slice(None)] * 3
+    upper = [slice(None)] * 3
+    lower[axis] = slice(None, -1)
+    upper[axis] = slice(1, None)
+    return tuple(lower), tuple(upper)
+
+def touching_faces_numpy(np, a, b) -> int:
+    """
+    The number of faces shared by a cell set in `a` and a cell set in `b`.
+    """
+    count = 0
+    for axis in range(3):
+        lower, upper = neighbor_slices(axis)
+        count += int(np.count_nonzero(a[lower] & b[upper])) + int(np.count_nonzero(a[upper] & b[lower]))
+    return count
+
+def flood_numpy(np, passable, start: 'tuple[int, int, int]'):
+    """
+    The cells of `passable` reachable from `start`, grown a layer at a time.
+    """
+    reached = np.zeros(passable.shape, dtype=bool)
+    reached[start] = True
+    count = 1
+    while True:
+        grown = reached.copy()
+        for axis in range(3):
+            lower, upper = neighbor_slices(axis)
+            grown[upper] |= reached[lower]
+            grown[lower] |= reached[upper]
+        grown &= passable
+        new_count = np.count_nonzero(grown)
+        if new_count == count:
+            return reached
+        reached = grown
+        count = new_count
+
+def part1(cubes: 'set[Vector3]') -> int:
+    droplet = Droplet(cubes)
+    np = numpy(len(droplet.cells), NUMPY_MIN_CELLS)
+    if np is not None:
+        filled = droplet.voxels(np) == Droplet.CUBE
+        return len(cubes) * 6 - touching_faces_numpy(np, filled, filled)
+    connected_side_count = sum(droplet.cube_faces(i) for i in droplet.cubes)
+    return (len(cubes) * 6) - connected_side_count
+
+def part2(cubes: 'set[Vector3]') -> int:
+    droplet = Droplet(cubes)
+    np = numpy(len(droplet.cells), NUMPY_MIN_CELLS)
+    if np is not None:
+        voxels = droplet.voxels(np)
+        outside = flood_numpy(np, voxels == Droplet.AIR, (1, 1, 1))
+        return touching_faces_numpy(np, voxels == Droplet.CUBE, outside)
+    # Flood the air from a corner just inside the border; every face it
+    # touches is on the outside of the droplet
+    outside = bfs([droplet.index(Vector3(1, 1, 1))], droplet.air_neighbors, len(droplet.cells))
+    return sum(droplet.cube_faces(i) for i in outside.visited)
+
+def solve(text: str) -> 'tuple[int, int]':
+    cubes = parse(text)
+    return part1(cubes), part2(cubes)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
+
+    part1_answer, part2_answer = solve(input)
+    print("Part 1:", part1_answer)
+    print("Part 2:", part2_answer)
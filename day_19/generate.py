@@ -0,0 +1,19 @@
+"""
+Synthetic input generator: `size` is the number of blueprints.
+
+Costs are drawn from the same ranges as the real inputs.
+"""
+import random
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    out = ''
+    for i in range(max(size, 1)):
+        out += (
+            f'Blueprint {i+1}: '
+            f'Each ore robot costs {rng.randint(2, 4)} ore. '
+            f'Each clay robot costs {rng.randint(2, 4)} ore. '
+            f'Each obsidian robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} clay. '
+            f'Each geode robot costs {rng.randint(2, 4)} ore and {rng.randint(7, 20)} obsidian.\n'
+        )
+    return out
@@ -1,9 +1,8 @@
 from pathlib import Path
 import re
-from queue import SimpleQueue
 
 USE_SAMPLE_INPUT = True
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
 
 sample_input = """
 Blueprint 1:
@@ -19,12 +18,6 @@ Blueprint 2:
   Each geode robot costs 3 ore and 12 obsidian.
 """.strip()
 
-if USE_SAMPLE_INPUT:
-    blueprints = [' '.join([l.strip() for l in bp.split('\n')]) for bp in sample_input.split("\n\n")]
-else:
-    with in_path.open("r") as inf:
-        blueprints = inf.read().strip().split('\n')
-
 class Resources:
     def __init__(self, ore: int = 0, clay: int = 0, obsidian: int = 0, geodes: int = 0):
         self.ore = ore
@@ -218,94 +211,82 @@ class GameState:
     def __hash__(self):
         return (self.minutes_left, self.resources, self.robots).__hash__()
 
-blueprints = [Blueprint.from_str(bp) for bp in blueprints]
-
-for blueprint in blueprints:
-    print(blueprint)
+ROBOT_KINDS = ('geode', 'obsidian', 'clay', 'ore')
 
-def evaluate_blueprint(bp: Blueprint):
+def wait_and_build(state: GameState, bp: Blueprint, kind: str) -> 'GameState|None':
+    """
+    Let resources accumulate until a robot of the given kind is affordable,
+    then build it. Returns None if the robot can't be built in time to
+    produce anything.
+    """
+    next_state = state
+    while not getattr(next_state, f'can_build_{kind}_robot')(bp):
+        next_state = next_state.tick()
+        if next_state.minutes_left <= 1:
+            return None
+    if next_state.minutes_left <= 1:
+        return None
+    return getattr(next_state, f'build_{kind}_robot')(bp)
+
+def evaluate_blueprint(bp: Blueprint, minutes: int = 24) -> int:
     global_max = 0
-    states: 'dict[GameState, int]' = {}
     def _max_geodes(state: GameState):
         nonlocal global_max
-        if state.minutes_left == 0:
-            return state.resources.geodes
-        if state in states:
-            return states[state]
-
-        next_states = []
-        if state.should_build_geode_robot(bp):
-            next_state = state
-            while not next_state.can_build_geode_robot(bp):
-                next_state = state.tick()
-            next_state = state.build_geode_robot()
-            next_states.append(next_state)
-
-        if state.should_build_obsidian_robot(bp):
-            next_state = state
-            while not next_state.can_build_obsidian_robot(bp):
-                next_state = state.tick()
-            next_state = state.build_obsidian_robot()
-            next_states.append(next_state)
-
-        next_states = []
-        if state.should_build_clay_robot(bp):
-            next_state = state
-            while not next_state.can_build_clay_robot(bp):
-                next_state = state.tick()
-            next_state = state.build_clay_robot()
-            next_states.append(next_state)
+        # Baseline: build nothing else and let the existing geode robots run
+        curr_max = state.resources.geodes + (state.robots.geodes * state.minutes_left)
+        global_max = max(global_max, curr_max)
 
         next_states = []
-        if state.should_build_ore_robot(bp):
-            next_state = state
-            while not next_state.can_build_ore_robot(bp):
-                next_state = state.tick()
-            next_state = state.build_ore_robot()
-            next_states.append(next_state)
+        for kind in ROBOT_KINDS:
+            if getattr(state, f'should_build_{kind}_robot')(bp):
+                next_state = wait_and_build(state, bp, kind)
+                if next_state is not None:
+                    next_states.append(next_state)
 
         next_states = [(s.estimate_upper_bound(bp), s) for s in next_states]
         next_states.sort(key=lambda s: s[0], reverse=True)
 
-        curr_max = 0
-        for bound, state in next_states:
-            if bound < curr_max or bound < global_max:
+        for bound, next_state in next_states:
+            if bound <= global_max:
                 continue
-            curr_max = max(curr_max, _max_geodes(state))
+            curr_max = max(curr_max, _max_geodes(next_state))
 
-        states[state] = curr_max
-        global_max = max(global_max, curr_max)
         return curr_max
 
-    #for i in range(10, 24):
-    #    print(i, _max_geodes(GameState(i, Resources(), Resources(ore=1))), global_max)
+    return _max_geodes(GameState(minutes, Resources(), Resources(ore=1)))
 
-    return _max_geodes(GameState(24, Resources(), Resources(ore=1)))
+def parse(text: str) -> 'list[Blueprint]':
+    text = text.strip()
+    if '\n\n' in text:
+        blueprints = [' '.join([l.strip() for l in bp.split('\n')]) for bp in text.split("\n\n")]
+    else:
+        blueprints = text.split('\n')
+    return [Blueprint.from_str(bp) for bp in blueprints]
 
+def part1(blueprints: 'list[Blueprint]') -> int:
+    return sum([bp.id * evaluate_blueprint(bp, 24) for bp in blueprints])
 
-    """
-    max_so_far = 0
-    states: 'SimpleQueue[GameState]' = SimpleQueue()
-    states.put(GameState(24, Resources(), Resources(ore=1)))
-    while not states.empty():
-        curr = states.get()
-        if curr.minutes_left == 0:
-            if curr.resources.geodes > max_so_far:
-                max_so_far = curr.resources.geodes
-        else:
-            next_states: 'list[GameState]' = [curr.tick()]
-            if curr.can_build_geode_robot(bp):
-                next_states.append(curr.build_geode_robot(bp))
-            if curr.can_build_obsidian_robot(bp):
-                next_states.append(curr.build_obsidian_robot(bp))
-            if curr.can_build_clay_robot(bp):
-                next_states.append(curr.build_clay_robot(bp))
-            if curr.can_build_ore_robot(bp):
-                next_states.append(curr.build_ore_robot(bp))
-            for state in next_states:
-                if state.estimate_upper_bound(bp) > max_so_far:
-                    states.put(state)
-    return max_so_far
-    """
+def part2(blueprints: 'list[Blueprint]') -> int:
+    result = 1
+    for bp in blueprints[:3]:
+        result *= evaluate_blueprint(bp, 32)
+    return result
+
+def solve(text: str) -> 'tuple[int, int]':
+    blueprints = parse(text)
+    return part1(blueprints), part2(blueprints)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
+
+    blueprints = parse(input)
+
+    for blueprint in blueprints:
+        print(blueprint)
 
-print(evaluate_blueprint(blueprints[0]))
+    print("Part 1:", part1(blueprints))
+    print("Part 2:", part2(blueprints))
@@ -0,0 +1,17 @@
+"""
+Synthetic input generator: `size` is the number of values in the file.
+
+Exactly one value is 0, as the grove coordinates are measured from it.
+"""
+import random
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    values = []
+    for _ in range(max(size, 2) - 1):
+        value = 0
+        while value == 0:
+            value = rng.randint(-10000, 10000)
+        values.append(value)
+    values.insert(rng.randint(0, len(values)), 0)
+    return ''.join(f'{v}\n' for v in values)
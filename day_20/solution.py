@@ -1,7 +1,7 @@
 from pathlib import Path
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
 
 sample_input = """
 1
@@ -13,17 +13,12 @@ sample_input = """
 4
 """.strip()
 
-if USE_SAMPLE_INPUT:
-    input = sample_input.strip()
-else:
-    with in_path.open("r") as inf:
-        input = inf.read().strip()
-
-input = [int(n) for n in input.split('\n')]
+DECRYPTION_KEY = 811589153
 
 class DLLNode:
-    def __init__(self, value: int, next: 'DLLNode|None' = None, prev: 'DLLNode|None' = None):
-        self.value = value
+    def __init__(self, initial_value: int, next: 'DLLNode|None' = None, prev: 'DLLNode|None' = None):
+        self.initial_value = initial_value
+        self.value = initial_value
         self.next = next
         self.prev = prev
 
@@ -39,124 +34,63 @@ class DLLNode:
     def __str__(self):
         return "DLLNode: " + ", ".join([str(n) for n in self.subsequent_values])
 
+def link_dll(nodes: 'list[DLLNode]', key: int = 1) -> DLLNode:
+    """
+    (Re)links `nodes` into a ring in their original order, scaling every value
+    by `key`, and returns the head. Both parts mix the same nodes, so mixing
+    only ever relinks them instead of allocating a new list.
+    """
+    for i, node in enumerate(nodes):
+        node.value = node.initial_value * key
+        node.next = nodes[(i + 1) % len(nodes)]
+        node.prev = nodes[i - 1]
+    return nodes[0]
+
+def grove_coordinates(head: DLLNode, verbose: bool = False) -> int:
+    zero = head
+    while zero.value != 0:
+        zero = zero.next
+
+    first = zero
+    for _ in range(1000):
+        first = first.next
+    if verbose:
+        print("first:", first.value)
+
+    second = first
+    for _ in range(1000):
+        second = second.next
+    if verbose:
+        print("second:", second.value)
+
+    third = second
+    for _ in range(1000):
+        third = third.next
+    if verbose:
+        print("third:", third.value)
+        print()
 
-head = None
-curr = None
-for n in input:
-    if head is None:
-        head = curr = DLLNode(int(n))
-    else:
-        curr.next = DLLNode(int(n), prev=curr)
-        curr = curr.next
-
-tail = curr
-tail.next = head
-head.prev = tail
-
-to_mix: 'list[DLLNode]' = [head]
-curr = head.next
-while curr != head:
-    to_mix.append(curr)
-    curr = curr.next
-
-if USE_SAMPLE_INPUT:
-    print('Initial arrangement:')
-    print(', '.join([str(n) for n in head.subsequent_values]))
-    print()
-
-for node in to_mix:
-    value = node.value
-    if value == 0:
-        if USE_SAMPLE_INPUT:
-            print("0 does not move:")
-            print(', '.join([str(n) for n in head.subsequent_values]))
-            print()
-        continue
-
-    if node == head:
-        head = node.next
-
-    node.prev.next = node.next
-    node.next.prev = node.prev
-
-    curr = node
-    if value > 0:
-        for _ in range(value):
-            curr = curr.next
-    else:
-        assert value < 0
-        for _ in range(-value + 1):
-            curr = curr.prev
+    return first.value + second.value + third.value
 
-    node.next = curr.next
-    node.prev = curr
+def parse(text: str) -> 'list[DLLNode]':
+    # Left unlinked so the list pickles flat; the parts link it before mixing
+    return [DLLNode(int(n)) for n in text.strip().split('\n')]
 
-    node.next.prev = node
-    node.prev.next = node
+def part1(to_mix: 'list[DLLNode]', verbose: bool = False) -> int:
+    head = link_dll(to_mix)
 
-    if USE_SAMPLE_INPUT:
-        print(f"{node.value} moves between {node.prev.value} and {node.next.value}:")
+    if verbose:
+        print('Initial arrangement:')
         print(', '.join([str(n) for n in head.subsequent_values]))
         print()
 
-zero = head
-while zero.value != 0:
-    zero = zero.next
-
-first = zero
-for _ in range(1000):
-    first = first.next
-print("first:", first.value)
-
-second = first
-for _ in range(1000):
-    second = second.next
-print("second:", second.value)
-
-third = second
-for _ in range(1000):
-    third = third.next
-print("third:", third.value)
-
-print()
-print("Part 1:", first.value + second.value + third.value)
-
-# PART 2
-print("\n\n")
-
-DECRYPTION_KEY = 811589153
-
-head = None
-curr = None
-for n in input:
-    if head is None:
-        head = curr = DLLNode(int(n) * DECRYPTION_KEY)
-    else:
-        curr.next = DLLNode(int(n) * DECRYPTION_KEY, prev=curr)
-        curr = curr.next
-
-tail = curr
-tail.next = head
-head.prev = tail
-
-to_mix: 'list[DLLNode]' = [head]
-curr = head.next
-while curr != head:
-    to_mix.append(curr)
-    curr = curr.next
-
-if USE_SAMPLE_INPUT:
-    print('Initial arrangement:')
-    print(', '.join([str(n) for n in head.subsequent_values]))
-    print()
-
-num_values = len(to_mix)
-
-for i in range(10):
     for node in to_mix:
         value = node.value
-        moves = value % (num_values-1)
-        if moves == 0:
+        if value == 0:
+            if verbose:
+                print("0 does not move:")
+                print(', '.join([str(n) for n in head.subsequent_values]))
+                print()
             continue
 
         if node == head:
@@ -166,12 +100,12 @@ for i in range(10):
         node.next.prev = node.prev
 
         curr = node
-        if moves > 0:
-            for _ in range(moves):
+        if value > 0:
+            for _ in range(value):
                 curr = curr.next
         else:
-            assert moves < 0
-            for _ in range(-moves + 1):
+            assert value < 0
+            for _ in range(-value + 1):
                 curr = curr.prev
 
         node.next = curr.next
@@ -180,29 +114,73 @@ for i in range(10):
         node.next.prev = node
         node.prev.next = node
 
-    if USE_SAMPLE_INPUT:
-        print(f'After {i+1} rounds of mixing:')
+        if verbose:
+            print(f"{node.value} moves between {node.prev.value} and {node.next.value}:")
+            print(', '.join([str(n) for n in head.subsequent_values]))
+            print()
+
+    return grove_coordinates(head, verbose)
+
+def part2(to_mix: 'list[DLLNode]', verbose: bool = False) -> int:
+    head = link_dll(to_mix, DECRYPTION_KEY)
+
+    if verbose:
+        print('Initial arrangement:')
         print(', '.join([str(n) for n in head.subsequent_values]))
         print()
 
-zero = head
-while zero.value != 0:
-    zero = zero.next
+    num_values = len(to_mix)
+
+    for i in range(10):
+        for node in to_mix:
+            value = node.value
+            moves = value % (num_values-1)
+            if moves == 0:
+                continue
+
+            if node == head:
+                head = node.next
+
+            node.prev.next = node.next
+            node.next.prev = node.prev
+
+            curr = node
+            if moves > 0:
+                for _ in range(moves):
+                    curr = curr.next
+            else:
+                assert moves < 0
+                for _ in range(-moves + 1):
+                    curr = curr.prev
+
+            node.next = curr.next
+            node.prev = curr
+
+            node.next.prev = node
+            node.prev.next = node
+
+        if verbose:
+            print(f'After {i+1} rounds of mixing:')
+            print(', '.join([str(n) for n in head.subsequent_values]))
+            print()
+
+    return grove_coordinates(head, verbose)
+
+def solve(text: str) -> 'tuple[int, int]':
+    nodes = parse(text)
+    return part1(nodes), part2(nodes)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
 
-first = zero
-for _ in range(1000):
-    first = first.next
-print("first:", first.value)
+    nodes = parse(input)
 
-second = first
-for _ in range(1000):
-    second = second.next
-print("second:", second.value)
+    print("Part 1:", part1(nodes, verbose=USE_SAMPLE_INPUT))
 
-third = second
-for _ in range(1000):
-    third = third.next
-print("third:", third.value)
+    print("\n\n")
 
-print()
-print("Part 2:", first.value + second.value + third.value)
+    print("Part 2:", part2(nodes, verbose=USE_SAMPLE_INPUT))
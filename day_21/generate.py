@@ -0,0 +1,88 @@
+"""
+Synthetic input generator: `size` is the number of monkeys.
+
+The expression tree is built top-down from a target value for every node, so
+every division is exact and every intermediate result a positive integer.
+`humn` is a leaf that is never reached through the right-hand side of a
+division, so the root equality stays linear in it, as in the real inputs.
+"""
+import random
+import string
+from collections import deque
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    size = max(size, 5)
+
+    names = set(['root', 'humn'])
+    def new_name():
+        while True:
+            name = ''.join(rng.choice(string.ascii_lowercase) for _ in range(4))
+            if name not in names:
+                names.add(name)
+                return name
+
+    # jobs[name] = either an int (leaf) or (lhs, op, rhs)
+    jobs: 'dict[str, int|tuple[str, str, str]]' = {}
+    # Leaves that humn could replace, i.e. not under the divisor of a division
+    humn_candidates = []
+
+    # root compares its two operands, so both are built for the same value
+    # and the tree balances with humn at its planted value
+    half = rng.randint(500, 50000)
+    jobs['root'] = (new_name(), '+', new_name())
+    # Queue of (name, value, humn_allowed) still to be expanded; expanding
+    # breadth-first keeps the tree shallow enough for the recursive resolver
+    pending = deque([
+        (jobs['root'][0], half, True),
+        (jobs['root'][2], half, True)
+    ])
+    remaining = size - 3
+    while pending:
+        name, value, humn_allowed = pending.popleft()
+        if remaining < 2 or rng.random() < 0.1:
+            jobs[name] = value
+            if humn_allowed:
+                humn_candidates.append(name)
+            continue
+        remaining -= 2
+
+        ops = ['-', '/']
+        if value >= 2:
+            ops.append('+')
+        divisors = [d for d in range(2, 10) if value % d == 0]
+        if divisors:
+            ops.append('*')
+        op = rng.choice(ops)
+        if op == '+':
+            lhs = rng.randint(1, value - 1)
+            rhs = value - lhs
+        elif op == '-':
+            rhs = rng.randint(1, 100)
+            lhs = value + rhs
+        elif op == '*':
+            rhs = rng.choice(divisors)
+            lhs = value // rhs
+        else:
+            rhs = rng.randint(2, 9)
+            lhs = value * rhs
+
+        jobs[name] = (new_name(), op, new_name())
+        pending.append((jobs[name][0], lhs, humn_allowed))
+        pending.append((jobs[name][2], rhs, humn_allowed and op != '/'))
+
+    humn = rng.choice(humn_candidates)
+    jobs['humn'] = jobs.pop(humn)
+    for name, job in jobs.items():
+        if isinstance(job, tuple):
+            lhs, op, rhs = job
+            jobs[name] = ('humn' if lhs == humn else lhs, op, 'humn' if rhs == humn else rhs)
+
+    lines = []
+    for name, job in jobs.items():
+        if isinstance(job, tuple):
+            lines.append(f'{name}: {job[0]} {job[1]} {job[2]}')
+        else:
+            lines.append(f'{name}: {job}')
+    rng.shuffle(lines)
+    return '\n'.join(lines) + '\n'
@@ -1,7 +1,7 @@
 from pathlib import Path
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
 
 sample_input = """
 root: pppw + sjmn
@@ -21,20 +21,15 @@ drzm: hmdt - zczc
 hmdt: 32
 """
 
-if USE_SAMPLE_INPUT:
-    input = sample_input.strip()
-else:
-    with in_path.open("r") as inf:
-        input = inf.read().strip()
+def parse(text: str) -> 'dict[str, str]':
+    values = {}
+    for line in text.strip().split("\n"):
+        colonidx = line.index(':')
+        name = line[:colonidx]
+        values[name] = line[colonidx+2:]
+    return values
 
-values = {}
-for line in input.split("\n"):
-    colonidx = line.index(':')
-    name = line[:colonidx]
-    values[name] = line[colonidx+2:]
-
-resolved_values = {}
-def resolve(key) -> float:
+def resolve(values: 'dict[str, str]', resolved_values: 'dict[str, float]', key) -> float:
     if key in resolved_values:
         return resolved_values[key]
     if key not in values:
@@ -44,8 +39,8 @@ def resolve(key) -> float:
         out = float(value)
     except ValueError:
         lhs, op, rhs = value.split()
-        lhs = resolve(lhs)
-        rhs = resolve(rhs)
+        lhs = resolve(values, resolved_values, lhs)
+        rhs = resolve(values, resolved_values, rhs)
         if op == '+':
             out = lhs + rhs
         elif op == '-':
@@ -59,51 +54,64 @@ def resolve(key) -> float:
     resolved_values[key] = out
     return out
 
-print('Part 1:', resolve('root'))
-
-# PART 2
-print('\n\n')
-
-values = {}
-resolved_values = {}
-for line in input.split("\n"):
-    colonidx = line.index(':')
-    name = line[:colonidx]
-    if name == 'humn':
-        continue
-    values[name] = line[colonidx+2:]
-
-lhs, _, rhs = values['root'].split()
-del values['root']
-
-try:
-    target_root_val = resolve(rhs)
-    backsolve_target = lhs
-except ValueError:
-    target_root_val = resolve(lhs)
-    backsolve_target = rhs
-
-print(f"Need to solve for {backsolve_target} = {target_root_val}")
-
-def resolve_with_humn(key, humn):
-    global resolved_values
-    resolved_values = {}
-    values['humn'] = humn
-    out = resolve(key)
-    del values['humn']
-    return out
+def part1(values: 'dict[str, str]') -> int:
+    return round(resolve(values, {}, 'root'))
 
 DER_EST_DELTA = 0.01
 
-# NEWTON'S METHOD FTW
-# https://en.wikipedia.org/wiki/Newton%27s_method
-x = 0
-for i in range(100):
-    print(f"{i}) {x} -> ", end="")
-    f_x = resolve_with_humn(backsolve_target, x) - target_root_val
-    df_x = (resolve_with_humn(backsolve_target, x+DER_EST_DELTA) - resolve_with_humn(backsolve_target, x-DER_EST_DELTA)) / DER_EST_DELTA
+def part2(values: 'dict[str, str]', verbose: bool = False) -> int:
+    values = {name: value for name, value in values.items() if name != 'humn'}
+
+    lhs, _, rhs = values['root'].split()
+    del values['root']
+
+    try:
+        target_root_val = resolve(values, {}, rhs)
+        backsolve_target = lhs
+    except ValueError:
+        target_root_val = resolve(values, {}, lhs)
+        backsolve_target = rhs
+
+    if verbose:
+        print(f"Need to solve for {backsolve_target} = {target_root_val}")
+
+    def resolve_with_humn(key, humn):
+        values['humn'] = humn
+        out = resolve(values, {}, key)
+        del values['humn']
+        return out
+
+    # NEWTON'S METHOD FTW
+    # https://en.wikipedia.org/wiki/Newton%27s_method
+    x = 0
+    for i in range(100):
+        if verbose:
+            print(f"{i}) {x} -> ", end="")
+        f_x = resolve_with_humn(backsolve_target, x) - target_root_val
+        df_x = (resolve_with_humn(backsolve_target, x+DER_EST_DELTA) - resolve_with_humn(backsolve_target, x-DER_EST_DELTA)) / DER_EST_DELTA
+
+        x = x - (f_x / df_x)
+
+        if verbose:
+            print(x)
+
+    return round(x)
+
+def solve(text: str) -> 'tuple[int, int]':
+    values = parse(text)
+    return part1(values), part2(values)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
+
+    values = parse(input)
 
-    x = x - (f_x / df_x)
+    print('Part 1:', part1(values))
 
-    print(x)
+    print('\n\n')
 
+    print('Part 2:', part2(values, verbose=True))
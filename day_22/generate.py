@@ -0,0 +1,29 @@
+"""
+Synthetic input generator: `size` is the number of moves in the path.
+
+The board always has the same cube net as the real input (50x50 faces), since
+part 2 only knows how to fold that layout; only the walls and the path vary.
+"""
+import random
+
+EDGE_LENGTH = 50
+
+# (column, row) of each face of the net, in units of EDGE_LENGTH
+FACES = ((1, 0), (2, 0), (1, 1), (0, 2), (1, 2), (0, 3))
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    grid = [[' '] * (3 * EDGE_LENGTH) for _ in range(4 * EDGE_LENGTH)]
+    for fx, fy in FACES:
+        for y in range(fy * EDGE_LENGTH, (fy + 1) * EDGE_LENGTH):
+            for x in range(fx * EDGE_LENGTH, (fx + 1) * EDGE_LENGTH):
+                grid[y][x] = '#' if rng.random() < 0.05 else '.'
+    # The walker starts on the leftmost open tile of the top row
+    grid[0][EDGE_LENGTH] = '.'
+
+    board = '\n'.join(''.join(row).rstrip() for row in grid)
+    path = str(rng.randint(1, 50))
+    for _ in range(size):
+        path += rng.choice('LR') + str(rng.randint(1, 50))
+    return board + '\n\n' + path + '\n'
@@ -1,7 +1,14 @@
 from pathlib import Path
+import sys
+
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.geometry import Vector2
+from aoc.grid import Grid2D
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
+PARSER_VERSION = 2
 
 sample_input = """
         ...#
@@ -20,78 +27,26 @@ sample_input = """
 10R5L5R10L4R5L5
 """
 
-if USE_SAMPLE_INPUT:
-    input = sample_input.strip('\n')
-else:
-    with in_path.open("r") as inf:
-        input = inf.read().strip('\n')
-
-class Vector2:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-
-    def __str__(self):
-        return f'({self.x}, {self.y})'
-
-    def __repr__(self):
-        return f'Vector2({self.x}, {self.y})'
-
-    def __eq__(self, other):
-        if not isinstance(other, Vector2):
-            return False
-
-        return other.x == self.x and other.y == self.y
-
-    def __hash__(self):
-        return (self.x, self.y).__hash__()
-
-    def __add__(self, other):
-        if not isinstance(other, Vector2):
-            raise TypeError(f"Can only add Vector2 (not \"{ other.__class__.__name__ }\") to Vector2")
-        return Vector2(self.x + other.x, self.y + other.y)
-
-    def __radd__(self, other):
-        return self.__add__(other)
-
-    def __sub__(self, other):
-        if not isinstance(other, Vector2):
-            raise TypeError(f"Can only subtract Vector2 (not \"{ other.__class__.__name__ }\") from Vector2")
-        return Vector2(self.x - other.x, self.y - other.y)
-
-    def __rsub__(self, other):
-        return self.__sub__(other)
-
-    def __mod__(self, other):
-        if not isinstance(other, Vector2):
-            raise TypeError(f"Can only modulo Vector2 (not \"{ other.__class__.__name__ }\") from Vector2")
-        return Vector2(self.x % other.x, self.y % other.y)
+VOID = ord(' ')
+OPEN = ord('.')
+WALL = ord('#')
 
 class Board:
-    def __init__(self, grid: 'list[list[str]]'):
+    def __init__(self, grid: Grid2D):
         self.grid = grid
 
     @staticmethod
     def from_str(instr: str) -> 'Board':
-        split_str = instr.split('\n')
-        height = len(split_str)
-        width = max([len(s) for s in split_str])
-
-        grid = [ [' ' for _ in range(width)] for _ in range(height)]
-        for i, line in enumerate(split_str):
-            for j, c in enumerate(line):
-                grid[i][j] = c
+        return Board(Grid2D.from_text(instr, pad=' '))
 
-        return Board(grid)
-
-    def get_char(self, pos: Vector2) -> str:
-        return self.grid[pos.y][pos.x]
+    def get_cell(self, pos: Vector2) -> int:
+        return self.grid[pos.x, pos.y]
 
     def get_size(self):
-        return Vector2(len(self.grid[0]), len(self.grid))
+        return Vector2(self.grid.width, self.grid.height)
 
     def __str__(self):
-        return '\n'.join([''.join(row) for row in self.grid])
+        return str(self.grid)
 
 left_rotations = {
     Vector2(1, 0): Vector2(0, -1),
@@ -108,10 +63,10 @@ right_rotations = {
 }
 
 direction_markers = {
-    Vector2(1, 0): '>',
-    Vector2(0, -1): '^',
-    Vector2(-1, 0): '<',
-    Vector2(0, 1): 'v'
+    Vector2(1, 0): ord('>'),
+    Vector2(0, -1): ord('^'),
+    Vector2(-1, 0): ord('<'),
+    Vector2(0, 1): ord('v')
 }
 
 direction_ids = {
@@ -128,39 +83,35 @@ class PathWalker:
     def __init__(self, board: Board):
         self.board = board
 
-        start_x = -1
-        for x, c in enumerate(board.grid[0]):
-            if c == '.':
-                start_x = x
-                break
+        start_x = board.grid.row(0).tobytes().find(OPEN)
 
         self.pos = Vector2(start_x, 0)
         self.facing_dir = Vector2(1, 0)
 
-        self.path = [[' ' for _ in range(len(board.grid[0]))] for _ in range(len(board.grid))]
+        self.path = Grid2D(board.grid.width, board.grid.height, VOID)
         self._mark_pos()
 
     def _mark_pos(self):
-        self.path[self.pos.y][self.pos.x] = direction_markers[self.facing_dir]
+        self.path[self.pos.x, self.pos.y] = direction_markers[self.facing_dir]
 
     def step(self):
         board_size = self.board.get_size()
         newpos = (self.pos + self.facing_dir) % board_size
-        newpos_chr = self.board.get_char(newpos)
-        while newpos_chr == ' ':
+        newpos_cell = self.board.get_cell(newpos)
+        while newpos_cell == VOID:
             newpos = (newpos + self.facing_dir) % board_size
-            newpos_chr = self.board.get_char(newpos)
+            newpos_cell = self.board.get_cell(newpos)
 
-        if newpos_chr == '#':
+        if newpos_cell == WALL:
             raise StepBlocked()
 
-        assert newpos_chr == '.'
+        assert newpos_cell == OPEN
 
         self.pos = newpos
 
         self._mark_pos()
 
-    def follow_path(self, path: str):
+    def follow_path(self, path: str, verbose: bool = False):
         pathparts = []
         curr_part = ''
         for c in path:
@@ -188,39 +139,26 @@ class PathWalker:
                         self.step()
                 except StepBlocked:
                     pass
-                if USE_SAMPLE_INPUT:
+                if verbose:
                     print(self)
                     print()
+
     def __str__(self):
         out = ""
-        for i, row in enumerate(self.path):
-            for j, c in enumerate(row):
+        for i in range(self.path.height):
+            for j in range(self.path.width):
                 if i == self.pos.y and j == self.pos.x:
                     out += "\u001b[31m"
-                if c == ' ':
-                    out += self.board.grid[i][j]
+                c = self.path[j, i]
+                if c == VOID:
+                    out += chr(self.board.grid[j, i])
                 else:
-                    out += c
+                    out += chr(c)
                 if i == self.pos.y and j == self.pos.x:
                     out += "\u001b[0m"
             out += '\n'
         return out
 
-board, path = input.split('\n\n')
-board = Board.from_str(board)
-walker = PathWalker(board)
-
-# path = "10"
-
-walker.follow_path(path)
-print(walker)
-
-password = (1000 * (walker.pos.y+1)) + (4 * (walker.pos.x+1)) + direction_ids[walker.facing_dir]
-print("Part 1:", password)
-
-# PART 2
-print('\n\n')
-
 class Direction:
     LEFT = Vector2(-1, 0)
     RIGHT = Vector2(1, 0)
@@ -291,65 +229,109 @@ class CubeEdge:
 
         assert False
 
-EDGE_LENGTH = 0
-edge_pairs: 'list[tuple[CubeEdge, CubeEdge]]' = []
-
-if USE_SAMPLE_INPUT:
-    EDGE_LENGTH = 4
-    edge_pairs = [
-        (CubeEdge(Vector2(8,0), EDGE_LENGTH, Direction.DOWN), CubeEdge(Vector2(0, 4), EDGE_LENGTH, Direction.DOWN)), # PINK
-        (CubeEdge(Vector2(8, 4), EDGE_LENGTH, Direction.RIGHT), CubeEdge(Vector2(4, 4), EDGE_LENGTH, Direction.DOWN)), # BROWN
-        (CubeEdge(Vector2(12, 0), EDGE_LENGTH, Direction.LEFT), CubeEdge(Vector2(16, 8), EDGE_LENGTH, Direction.LEFT)), # RED
-        (CubeEdge(Vector2(12, 4), EDGE_LENGTH, Direction.LEFT), CubeEdge(Vector2(12, 8), EDGE_LENGTH, Direction.DOWN)), # CYAN
-        (CubeEdge(Vector2(4, 8), EDGE_LENGTH, Direction.UP), CubeEdge(Vector2(12, 12), EDGE_LENGTH, Direction.UP)), # GREEN
-        (CubeEdge(Vector2(0, 8), EDGE_LENGTH, Direction.RIGHT), CubeEdge(Vector2(16, 12), EDGE_LENGTH, Direction.UP)), # PURPLE
-        (CubeEdge(Vector2(8, 8), EDGE_LENGTH, Direction.UP), CubeEdge(Vector2(8, 12), EDGE_LENGTH, Direction.RIGHT)) # BLUE
-    ]
-else:
-    EDGE_LENGTH = 50
-    edge_pairs = [
-        (CubeEdge(Vector2(50, 0), EDGE_LENGTH, Direction.DOWN), CubeEdge(Vector2(0, 200), EDGE_LENGTH, Direction.RIGHT)), # GREEN
-        (CubeEdge(Vector2(100, 0), EDGE_LENGTH, Direction.DOWN), CubeEdge(Vector2(50, 200), EDGE_LENGTH, Direction.UP)), # PURPLE
-        (CubeEdge(Vector2(50, 50), EDGE_LENGTH, Direction.RIGHT), CubeEdge(Vector2(0, 150), EDGE_LENGTH, Direction.RIGHT)), # PINK
-        (CubeEdge(Vector2(150, 0), EDGE_LENGTH, Direction.LEFT), CubeEdge(Vector2(100, 100), EDGE_LENGTH, Direction.LEFT)), # CYAN
-        (CubeEdge(Vector2(150, 50), EDGE_LENGTH, Direction.UP), CubeEdge(Vector2(100, 50), EDGE_LENGTH, Direction.LEFT)), # BLUE
-        (CubeEdge(Vector2(50, 100), EDGE_LENGTH, Direction.RIGHT), CubeEdge(Vector2(0, 100), EDGE_LENGTH, Direction.DOWN)), # RED
-        (CubeEdge(Vector2(100, 150), EDGE_LENGTH, Direction.UP), CubeEdge(Vector2(50, 150), EDGE_LENGTH, Direction.LEFT)), # BROWN
+# Hand-folded cube nets, keyed by edge length
+CUBE_LAYOUTS: 'dict[int, list[tuple[CubeEdge, CubeEdge]]]' = {
+    4: [
+        (CubeEdge(Vector2(8,0), 4, Direction.DOWN), CubeEdge(Vector2(0, 4), 4, Direction.DOWN)), # PINK
+        (CubeEdge(Vector2(8, 4), 4, Direction.RIGHT), CubeEdge(Vector2(4, 4), 4, Direction.DOWN)), # BROWN
+        (CubeEdge(Vector2(12, 0), 4, Direction.LEFT), CubeEdge(Vector2(16, 8), 4, Direction.LEFT)), # RED
+        (CubeEdge(Vector2(12, 4), 4, Direction.LEFT), CubeEdge(Vector2(12, 8), 4, Direction.DOWN)), # CYAN
+        (CubeEdge(Vector2(4, 8), 4, Direction.UP), CubeEdge(Vector2(12, 12), 4, Direction.UP)), # GREEN
+        (CubeEdge(Vector2(0, 8), 4, Direction.RIGHT), CubeEdge(Vector2(16, 12), 4, Direction.UP)), # PURPLE
+        (CubeEdge(Vector2(8, 8), 4, Direction.UP), CubeEdge(Vector2(8, 12), 4, Direction.RIGHT)) # BLUE
+    ],
+    50: [
+        (CubeEdge(Vector2(50, 0), 50, Direction.DOWN), CubeEdge(Vector2(0, 200), 50, Direction.RIGHT)), # GREEN
+        (CubeEdge(Vector2(100, 0), 50, Direction.DOWN), CubeEdge(Vector2(50, 200), 50, Direction.UP)), # PURPLE
+        (CubeEdge(Vector2(50, 50), 50, Direction.RIGHT), CubeEdge(Vector2(0, 150), 50, Direction.RIGHT)), # PINK
+        (CubeEdge(Vector2(150, 0), 50, Direction.LEFT), CubeEdge(Vector2(100, 100), 50, Direction.LEFT)), # CYAN
+        (CubeEdge(Vector2(150, 50), 50, Direction.UP), CubeEdge(Vector2(100, 50), 50, Direction.LEFT)), # BLUE
+        (CubeEdge(Vector2(50, 100), 50, Direction.RIGHT), CubeEdge(Vector2(0, 100), 50, Direction.DOWN)), # RED
+        (CubeEdge(Vector2(100, 150), 50, Direction.UP), CubeEdge(Vector2(50, 150), 50, Direction.LEFT)), # BROWN
     ]
+}
 
-edge_pairs = edge_pairs + [(e2, e1) for e1, e2 in edge_pairs]
+def edge_length(board: Board) -> int:
+    face_area = (len(board.grid.cells) - board.grid.cells.count(VOID)) // 6
+    return round(face_area ** 0.5)
 
 class PathWalker2(PathWalker):
+    def __init__(self, board: Board):
+        super().__init__(board)
+
+        self.edge_length = edge_length(board)
+        if self.edge_length not in CUBE_LAYOUTS:
+            raise ValueError(f"No cube layout for edge length {self.edge_length}")
+        edge_pairs = CUBE_LAYOUTS[self.edge_length]
+        self.edge_pairs = edge_pairs + [(e2, e1) for e1, e2 in edge_pairs]
+
     def step(self):
         newpos = (self.pos + self.facing_dir)
         newdir = self.facing_dir
 
-        for edge1, edge2 in edge_pairs:
+        for edge1, edge2 in self.edge_pairs:
             if edge1.point_in_edge(newpos) and edge1.facing_towards_edge(newdir):
                 edge_pos = edge1.point_to_origin_dist(newpos)
-                assert edge_pos < EDGE_LENGTH
-                newpos = edge2.origin_dist_to_point(EDGE_LENGTH - 1 - edge_pos) + edge2.cube_direction
+                assert edge_pos < self.edge_length
+                newpos = edge2.origin_dist_to_point(self.edge_length - 1 - edge_pos) + edge2.cube_direction
                 newdir = edge2.cube_direction
                 break
 
-        newpos_chr = self.board.get_char(newpos)
-        if newpos_chr == '#':
+        newpos_cell = self.board.get_cell(newpos)
+        if newpos_cell == WALL:
             raise StepBlocked()
 
-        assert newpos_chr == '.'
+        assert newpos_cell == OPEN
 
         self.pos = newpos
         self.facing_dir = newdir
 
         self._mark_pos()
 
-board, path = input.split('\n\n')
-board = Board.from_str(board)
-walker = PathWalker2(board)
+def parse(text: str) -> 'tuple[Board, str]':
+    board, path = text.strip('\n').split('\n\n')
+    return Board.from_str(board), path.strip()
+
+def password(walker: PathWalker) -> int:
+    return (1000 * (walker.pos.y+1)) + (4 * (walker.pos.x+1)) + direction_ids[walker.facing_dir]
+
+def part1(notes: 'tuple[Board, str]', verbose: bool = False) -> int:
+    board, path = notes
+    walker = PathWalker(board)
+
+    # path = "10"
+
+    walker.follow_path(path, verbose)
+    if verbose:
+        print(walker)
+
+    return password(walker)
+
+def part2(notes: 'tuple[Board, str]', verbose: bool = False) -> int:
+    board, path = notes
+    walker = PathWalker2(board)
+
+    walker.follow_path(path, verbose)
+    if verbose:
+        print(walker)
+
+    return password(walker)
+
+def solve(text: str) -> 'tuple[int, int]':
+    notes = parse(text)
+    return part1(notes), part2(notes)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
+
+    notes = parse(input)
 
-walker.follow_path(path)
-print(walker)
+    print("Part 1:", part1(notes, verbose=USE_SAMPLE_INPUT))
 
+    print('\n\n')
 
-password = (1000 * (walker.pos.y+1)) + (4 * (walker.pos.x+1)) + direction_ids[walker.facing_dir]
-print("Part 2:", password)
+    print("Part 2:", part2(notes, verbose=USE_SAMPLE_INPUT))
@@ -0,0 +1,8 @@
+"""
+Synthetic input generator: `size` is the width and height of the initial scan.
+"""
+import random
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return ''.join(''.join('#' if rng.random() < 0.45 else '.' for _ in range(size)) + '\n' for _ in range(size))
@@ -1,7 +1,16 @@
 from pathlib import Path
+import sys
+
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.accel import numpy
+from aoc.geometry import Vector2
+from aoc.grid import ALL_DIRECTIONS, Grid2D
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
+# Fewer elves than this are simulated in pure Python
+NUMPY_MIN_ELVES = 1000
 
 sample_input = """
 ....#..
@@ -13,48 +22,6 @@ sample_input = """
 .#..#..
 """
 
-if USE_SAMPLE_INPUT:
-    input = sample_input.strip()
-else:
-    with in_path.open("r") as inf:
-        input = inf.read().strip()
-
-
-class Vector2:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-
-    def __str__(self):
-        return f'({self.x}, {self.y})'
-
-    def __repr__(self):
-        return f'Vector2({self.x}, {self.y})'
-
-    def __eq__(self, other):
-        if not isinstance(other, Vector2):
-            return False
-
-        return other.x == self.x and other.y == self.y
-
-    def __hash__(self):
-        return (self.x, self.y).__hash__()
-
-    def __add__(self, other):
-        if not isinstance(other, Vector2):
-            raise TypeError(f"Can only add Vector2 (not \"{ other.__class__.__name__ }\") to Vector2")
-        return Vector2(self.x + other.x, self.y + other.y)
-
-    def __radd__(self, other):
-        return self.__add__(other)
-
-    def __sub__(self, other):
-        if not isinstance(other, Vector2):
-            raise TypeError(f"Can only subtract Vector2 (not \"{ other.__class__.__name__ }\") from Vector2")
-        return Vector2(self.x - other.x, self.y - other.y)
-
-    def __rsub__(self, other):
-        return self.__sub__(other)
 
 class Direction:
     N = Vector2(0, -1)
@@ -75,22 +42,51 @@ class Step:
         self.result = result
         self.checks = checks
 
-class ElfDone(Exception):
-    pass
+# The direction each step moves in and the directions it must find empty,
+# in the order they are considered in the first round
+STEPS = [
+    Step(Direction.N, set([Direction.N, Direction.NE, Direction.NW])),
+    Step(Direction.S, set([Direction.S, Direction.SE, Direction.SW])),
+    Step(Direction.W, set([Direction.W, Direction.NW, Direction.SW])),
+    Step(Direction.E, set([Direction.E, Direction.NE, Direction.SE]))
+]
 
 class Board:
-    def __init__(self, elves: 'set[Vector2]'):
-        self.elves = elves
+    # Empty cells kept around the elves; the grid is re-embedded with a fresh
+    # margin whenever an elf gets within one cell of its edge
+    MARGIN = 16
 
-        self.steps = [
-            Step(Direction.N, set([Direction.N, Direction.NE, Direction.NW])),
-            Step(Direction.S, set([Direction.S, Direction.SE, Direction.SW])),
-            Step(Direction.W, set([Direction.W, Direction.NW, Direction.SW])),
-            Step(Direction.E, set([Direction.E, Direction.NE, Direction.SE]))
-        ]
+    def __init__(self, elves: 'set[Vector2]'):
+        self.steps = STEPS
         self.first_step_idx = 0
         self.step_count = 0
 
+        self.__embed(elves)
+
+    def __embed(self, elves: 'set[Vector2]'):
+        """
+        Lays the elves out on an occupancy grid with `MARGIN` free cells on
+        every side, so that neighbor lookups are plain flat-index offsets.
+        """
+        minx = min(elf.x for elf in elves) - self.MARGIN
+        miny = min(elf.y for elf in elves) - self.MARGIN
+        maxx = max(elf.x for elf in elves) + self.MARGIN
+        maxy = max(elf.y for elf in elves) + self.MARGIN
+
+        self.origin = Vector2(minx, miny)
+        self.grid = Grid2D(maxx - minx + 1, maxy - miny + 1)
+        self.positions: 'set[int]' = set()
+        for elf in elves:
+            i = self.grid.index(elf.x - minx, elf.y - miny)
+            self.grid.cells[i] = 1
+            self.positions.add(i)
+
+        self.neighbor_offsets = self.grid.offsets(ALL_DIRECTIONS)
+        self.step_offsets = [
+            (self.grid.index(step.result.x, step.result.y), tuple(self.grid.index(d.x, d.y) for d in step.checks))
+            for step in self.steps
+        ]
+
     @staticmethod
     def from_str(input_str: str) -> 'Board':
         split_str = input_str.split('\n')
@@ -102,46 +98,59 @@ class Board:
 
         return Board(elves)
 
+    @property
+    def elves(self) -> 'set[Vector2]':
+        out = set()
+        for i in self.positions:
+            x, y = self.grid.coords(i)
+            out.add(Vector2(x + self.origin.x, y + self.origin.y))
+        return out
+
     def step(self) -> bool:
+        cells = self.grid.cells
+        neighbor_offsets = self.neighbor_offsets
+        step_order = [self.step_offsets[(self.first_step_idx + i) % len(self.steps)] for i in range(len(self.steps))]
+
         # FIRST HALF
-        proposed_elf_positions: 'dict[Vector2, set[Vector2]]' = {}
-        for elf in self.elves:
-            try:
-                no_adjacent_elves = True
-                for delta in Direction.all():
-                    if elf + delta in self.elves:
-                        no_adjacent_elves = False
+        # Proposed position -> the elf proposing it, or -1 once two elves have
+        proposed_elf_positions: 'dict[int, int]' = {}
+        for elf in self.positions:
+            for delta in neighbor_offsets:
+                if cells[elf + delta]:
+                    break
+            else:
+                continue
+
+            for result, checks in step_order:
+                for delta in checks:
+                    if cells[elf + delta]:
                         break
-                if no_adjacent_elves:
-                    raise ElfDone()
-
-                for i in range(0, 4):
-                    curr_step_idx = (self.first_step_idx + i) % len(self.steps)
-                    step = self.steps[curr_step_idx]
-                    step_is_valid = True
-                    for delta in step.checks:
-                        newpos = elf + delta
-                        if newpos in self.elves:
-                            step_is_valid = False
-                            break
-                    if step_is_valid:
-                        respos = elf + step.result
-                        if respos not in proposed_elf_positions:
-                            proposed_elf_positions[respos] = set([elf])
-                        else:
-                            proposed_elf_positions[respos].add(elf)
-                        raise ElfDone()
-            except ElfDone:
-                pass
+                else:
+                    respos = elf + result
+                    if respos in proposed_elf_positions:
+                        proposed_elf_positions[respos] = -1
+                    else:
+                        proposed_elf_positions[respos] = elf
+                    break
 
         # SECOND HALF
         elf_did_move = False
-        for position, elves in proposed_elf_positions.items():
-            if len(elves) == 1:
+        near_edge = False
+        width = self.grid.width
+        height = self.grid.height
+        for position, elf in proposed_elf_positions.items():
+            if elf >= 0:
                 elf_did_move = True
-                elf = next(iter(elves))
-                self.elves.remove(elf)
-                self.elves.add(position)
+                cells[elf] = 0
+                cells[position] = 1
+                self.positions.remove(elf)
+                self.positions.add(position)
+                y, x = divmod(position, width)
+                if x <= 1 or y <= 1 or x >= width - 2 or y >= height - 2:
+                    near_edge = True
+
+        if near_edge:
+            self.__embed(self.elves)
 
         self.first_step_idx = (self.first_step_idx + 1) % len(self.steps)
 
@@ -194,25 +203,135 @@ class Board:
             out += '\n'
         return out
 
-board = Board.from_str(input)
+class ArrayBoard(Board):
+    """
+    The same simulation on a NumPy boolean array, moving all the elves of a
+    round at once.
+    """
+    def __init__(self, np, elves: 'set[Vector2]'):
+        self.np = np
+        self.steps = STEPS
+        self.first_step_idx = 0
+        self.step_count = 0
+
+        minx = min(elf.x for elf in elves)
+        miny = min(elf.y for elf in elves)
+        self.origin = Vector2(minx - self.MARGIN, miny - self.MARGIN)
+        occupied = np.zeros((max(elf.y for elf in elves) - miny + 1, max(elf.x for elf in elves) - minx + 1), dtype=bool)
+        occupied[[elf.y - miny for elf in elves], [elf.x - minx for elf in elves]] = True
+        self.occupied = np.pad(occupied, self.MARGIN)
+
+    def __embed(self):
+        """
+        Crops the grid to the elves and pads it with a fresh `MARGIN`.
+        """
+        np = self.np
+        ys, xs = np.nonzero(self.occupied)
+        top, left = int(ys.min()), int(xs.min())
+        self.occupied = np.pad(self.occupied[top:int(ys.max()) + 1, left:int(xs.max()) + 1], self.MARGIN)
+        self.origin += Vector2(left - self.MARGIN, top - self.MARGIN)
+
+    @property
+    def elves(self) -> 'set[Vector2]':
+        ys, xs = self.np.nonzero(self.occupied)
+        return set(Vector2(int(x) + self.origin.x, int(y) + self.origin.y) for x, y in zip(xs, ys))
+
+    def step(self) -> bool:
+        np = self.np
+        occupied = self.occupied
+        height, width = occupied.shape
+
+        # Every view is over the cells one away from the edge, so that the
+        # neighbor in any direction is still on the grid
+        def shifted(grid, d: Vector2):
+            return grid[1 + d.y:height - 1 + d.y, 1 + d.x:width - 1 + d.x]
+
+        neighbors = {d: shifted(occupied, d) for d in Direction.all()}
+
+        # FIRST HALF
+        undecided = shifted(occupied, Vector2(0, 0)) & np.logical_or.reduce(list(neighbors.values()))
+        proposals = []
+        # How many elves propose moving to each cell
+        proposal_counts = np.zeros(occupied.shape, dtype=np.uint8)
+        for i in range(len(self.steps)):
+            step = self.steps[(self.first_step_idx + i) % len(self.steps)]
+            proposing = undecided & ~np.logical_or.reduce([neighbors[d] for d in step.checks])
+            undecided &= ~proposing
+            shifted(proposal_counts, step.result)[...] += proposing
+            proposals.append((step.result, proposing))
+
+        # SECOND HALF
+        elf_did_move = False
+        moved = occupied.copy()
+        for result, proposing in proposals:
+            moving = proposing & (shifted(proposal_counts, result) == 1)
+            if moving.any():
+                elf_did_move = True
+                shifted(moved, Vector2(0, 0))[...] &= ~moving
+                shifted(moved, result)[...] |= moving
+        self.occupied = moved
+
+        if moved[:2].any() or moved[-2:].any() or moved[:, :2].any() or moved[:, -2:].any():
+            self.__embed()
+
+        self.first_step_idx = (self.first_step_idx + 1) % len(self.steps)
+
+        self.step_count += 1
+
+        return elf_did_move
+
+def new_board(elves: 'set[Vector2]') -> Board:
+    np = numpy(len(elves), NUMPY_MIN_ELVES)
+    if np is not None:
+        return ArrayBoard(np, elves)
+    return Board(elves)
+
+def parse(text: str) -> 'set[Vector2]':
+    return Board.from_str(text.strip()).elves
+
+def part1(elves: 'set[Vector2]', verbose: bool = False) -> int:
+    board = new_board(set(elves))
+
+    if verbose:
+        print("== Initial State ==")
+        print(board)
+        print()
+
+    for i in range(10):
+        board.step()
+        if verbose:
+            print(f"== End of Round {i+1} ==")
+            print(board)
+            print()
+
+    return board.empty_tile_count()
+
+def part2(elves: 'set[Vector2]', verbose: bool = False) -> int:
+    board = new_board(set(elves))
+    while board.step():
+        pass
+
+    if verbose:
+        print(board)
+
+    return board.step_count
 
-print("== Initial State ==")
-print(board)
-print()
+def solve(text: str) -> 'tuple[int, int]':
+    elves = parse(text)
+    return part1(elves), part2(elves)
 
-for i in range(10):
-    board.step()
-    print(f"== End of Round {i+1} ==")
-    print(board)
-    print()
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
 
-print("Part 1", board.empty_tile_count())
+    elves = parse(input)
 
-# PART 2
-print('\n\n')
-while board.step():
-    pass
+    print("Part 1", part1(elves, verbose=True))
 
-print(board)
+    # PART 2
+    print('\n\n')
 
-print("Part 2", board.step_count)
+    print("Part 2", part2(elves, verbose=True))
@@ -0,0 +1,72 @@
+"""
+Synthetic input generator: `size` is the height of the valley (the width is
+five times that, so the blizzard period stays equal to the width).
+
+The entrance and exit columns have no vertical blizzards, as in the real
+inputs. Valleys that can't be crossed there, back and there again (which
+happens at small sizes) are thrown away and redrawn.
+"""
+import math
+import random
+
+def crossing_time(rows: 'list[str]', start: 'tuple[int, int]', goal: 'tuple[int, int]', t: int) -> 'int|None':
+    """
+    The earliest minute at which `goal` can be reached from `start`, leaving
+    at minute `t`, or None if it can't be.
+    """
+    height, width = len(rows), len(rows[0])
+    period = math.lcm(width, height)
+
+    def free(x, y, t):
+        return (rows[y][(x - t) % width] != '>' and rows[y][(x + t) % width] != '<'
+                and rows[(y - t) % height][x] != 'v' and rows[(y + t) % height][x] != '^')
+
+    frontier = set([start])
+    seen = set()
+    while frontier:
+        t += 1
+        next_frontier = set()
+        for x, y in frontier:
+            for nx, ny in ((x, y), (x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if (nx, ny) == goal:
+                    return t
+                if (nx, ny) != start and not (0 <= nx < width and 0 <= ny < height and free(nx, ny, t)):
+                    continue
+                if (nx, ny, t % period) not in seen:
+                    seen.add((nx, ny, t % period))
+                    next_frontier.add((nx, ny))
+        frontier = next_frontier
+    return None
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    height = max(size, 2)
+    width = height * 5
+    entrance, exit = (0, -1), (width - 1, height)
+
+    while True:
+        rows = []
+        for _ in range(height):
+            row = ''
+            for x in range(width):
+                if rng.random() < 0.5:
+                    row += '.'
+                elif x == 0 or x == width - 1:
+                    row += rng.choice('<>')
+                else:
+                    row += rng.choice('<>^v')
+            rows.append(row)
+
+        t = 0
+        for start, goal in ((entrance, exit), (exit, entrance), (entrance, exit)):
+            t = crossing_time(rows, start, goal, t)
+            if t is None:
+                break
+        else:
+            break
+
+    out = '#.' + ('#' * width) + '\n'
+    for row in rows:
+        out += '#' + row + '#\n'
+    out += ('#' * width) + '.#\n'
+    return out
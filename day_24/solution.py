@@ -1,8 +1,19 @@
 from pathlib import Path
-import heapq
+import sys
+
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.accel import numpy
+from aoc.cycles import CycleDetector
+from aoc.geometry import Vector2
+from aoc.grid import Grid2D
+from aoc.search import TimeExpanded, bfs
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
+PARSER_VERSION = 3
+# Valleys with fewer cells than this are plotted in pure Python
+NUMPY_MIN_CELLS = 1000
 
 sample_input_1 = """
 #.#####
@@ -23,68 +34,6 @@ sample_input_2 = """
 ######.#
 """
 
-if USE_SAMPLE_INPUT:
-    input = sample_input_2.strip()
-else:
-    with in_path.open("r") as inf:
-        input = inf.read().strip()
-
-def lcm(a, b):
-    curr = max(a, b)
-    while True:
-        if curr % a == 0 and curr % b == 0:
-            return curr
-        curr += 1
-
-class Vector2:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-
-    def __str__(self):
-        return f'({self.x}, {self.y})'
-
-    def __repr__(self):
-        return f'Vector2({self.x}, {self.y})'
-
-    def __eq__(self, other):
-        if not isinstance(other, Vector2):
-            return False
-
-        return other.x == self.x and other.y == self.y
-
-    def __hash__(self):
-        return (self.x, self.y).__hash__()
-
-    def __add__(self, other):
-        if not isinstance(other, Vector2):
-            raise TypeError(f"Can only add Vector2 (not \"{ other.__class__.__name__ }\") to Vector2")
-        return Vector2(self.x + other.x, self.y + other.y)
-
-    def __radd__(self, other):
-        return self.__add__(other)
-
-    def __sub__(self, other):
-        if not isinstance(other, Vector2):
-            raise TypeError(f"Can only subtract Vector2 (not \"{ other.__class__.__name__ }\") from Vector2")
-        return Vector2(self.x - other.x, self.y - other.y)
-
-    def __rsub__(self, other):
-        return self.__sub__(other)
-
-    def __mod__(self, other):
-        if not isinstance(other, Vector2):
-            raise TypeError(f"Can only modulo Vector2 (not \"{ other.__class__.__name__ }\") from Vector2")
-        return Vector2(self.x % other.x, self.y % other.y)
-
-    def __mul__(self, other):
-        if not isinstance(other, int):
-            raise TypeError(f"Can only multiply int (not \"{ other.__class__.__name__ }\") with Vector2")
-        return Vector2(self.x * other, self.y * other)
-
-    def __rmul__(self, other):
-        return self.__mul__(other)
-
 class Blizzard:
     def __init__(self, initial_position: Vector2, direction: Vector2):
         self.initial_position = initial_position
@@ -104,12 +53,17 @@ dirstrs = {
     Vector2(1, 0): '>'
 }
 
+EMPTY = ord('.')
+
+# A cell's blizzard state is the set of directions of the blizzards in it, one
+# bit per direction
+DIRECTION_BITS = {direction: 1 << i for i, direction in enumerate(dirstrs)}
+
 class Valley:
     def __init__(self, blizzards: 'list[Blizzard]', size: Vector2):
         self.blizzards = blizzards
         self.size = size
-
-        self.__calculate_blizzards()
+        self.blizzards_in_time: 'list[Grid2D]' = []
 
     @staticmethod
     def from_str(inputstr: str) -> 'Valley':
@@ -124,128 +78,206 @@ class Valley:
 
         return Valley(blizzards, Vector2(len(valley_str[0]), len(valley_str)))
 
-    def __blizzards_at_t(self, t):
-        grid = [ ['.' for _ in range(self.size.x)] for _ in range(self.size.y)]
+    def __blizzards_at_t(self, t) -> 'tuple[Grid2D, bytes]':
+        """
+        The blizzards plotted at minute `t`, and the state they are in as
+        `DIRECTION_BITS` per cell. The plot only shows how many blizzards
+        overlap in a cell, not which, so it can't tell every state apart.
+        """
+        grid = Grid2D(self.size.x, self.size.y, EMPTY)
+        state = bytearray(self.size.x * self.size.y)
         for blizzard in self.blizzards:
             pos = (blizzard.initial_position + (blizzard.direction * t)) % self.size
-            if grid[pos.y][pos.x] == '.':
-                grid[pos.y][pos.x] = dirstrs[blizzard.direction]
-            elif grid[pos.y][pos.x] in "^v><":
-                grid[pos.y][pos.x] = "2"
+            state[pos.x + pos.y * self.size.x] |= DIRECTION_BITS[blizzard.direction]
+            c = grid[pos.x, pos.y]
+            if c == EMPTY:
+                grid[pos.x, pos.y] = ord(dirstrs[blizzard.direction])
+            elif chr(c) in "^v><":
+                grid[pos.x, pos.y] = ord("2")
             else:
-                grid[pos.y][pos.x] = str(int(grid[pos.y][pos.x]) + 1)
-
-        return grid
-
-
-    def __calculate_blizzards(self):
-        configuration_count = lcm(self.size.x, self.size.y)
+                grid[pos.x, pos.y] = c + 1
+
+        return grid, bytes(state)
+
+    def __blizzard_plotter_numpy(self, np):
+        """
+        Returns a function plotting the blizzards (and their state) at a
+        given minute like `__blizzards_at_t`, by rolling one grid per
+        direction.
+        """
+        shape = (self.size.y, self.size.x)
+        starts = {direction: np.zeros(shape, dtype=np.uint8) for direction in dirstrs}
+        for blizzard in self.blizzards:
+            starts[blizzard.direction][blizzard.initial_position.y, blizzard.initial_position.x] = 1
+
+        def plot(t: int) -> Grid2D:
+            counts = np.zeros(shape, dtype=np.uint8)
+            cells = np.full(shape, EMPTY, dtype=np.uint8)
+            state = np.zeros(shape, dtype=np.uint8)
+            for direction, start in starts.items():
+                moved = np.roll(start, (direction.y * t, direction.x * t), axis=(0, 1))
+                counts += moved
+                cells[moved == 1] = ord(dirstrs[direction])
+                state |= moved * np.uint8(DIRECTION_BITS[direction])
+            cells = np.where(counts > 1, ord('0') + counts, cells)
+            return Grid2D(self.size.x, self.size.y, cells=bytearray(cells.tobytes())), state.tobytes()
+        return plot
+
+    def calculate_blizzards(self):
+        """
+        Plots the blizzards at every minute until the valley is back to a
+        configuration it has been in, which happens at the latest after
+        lcm(width, height) minutes and sooner if the blizzards line up.
+        The configuration is fingerprinted by the directions in every cell,
+        not by the plot.
+        """
+        np = numpy(self.size.x * self.size.y, NUMPY_MIN_CELLS)
+        blizzards_at_t = self.__blizzards_at_t if np is None else self.__blizzard_plotter_numpy(np)
+        detector = CycleDetector()
         self.blizzards_in_time = []
-        for t in range(configuration_count):
-            self.blizzards_in_time.append(self.__blizzards_at_t(t))
+        t = 0
+        while True:
+            grid, state = blizzards_at_t(t)
+            if detector.observe(t, state) is not None:
+                break
+            self.blizzards_in_time.append(grid)
+            t += 1
 
     def point_in_blizzard(self, point: Vector2, when: int) -> bool:
         if point.x < 0 or point.x >= self.size.x or point.y < 0 or point.y >= self.size.y:
             return False
-        return self.blizzards_in_time[when % len(self.blizzards_in_time)][point.y][point.x] != '.'
+        return self.blizzards_in_time[when % len(self.blizzards_in_time)].cells[point.x + point.y * self.size.x] != EMPTY
 
     def str_at_t(self, t: int) -> str:
-        return "\n".join([''.join(s) for s in self.blizzards_in_time[t % len(self.blizzards_in_time)]])
+        return str(self.blizzards_in_time[t % len(self.blizzards_in_time)])
 
     def __str__(self):
         return self.str_at_t(0)
 
-class AStarNode:
-    def __init__(self, prev: 'AStarNode', pos: Vector2, when: int, total_cost: int):
-        self.prev = prev
-        self.pos = pos
-        self.when = when
-        self.total_cost = total_cost
-
-    def __lt__(self, other):
-        assert isinstance(other, AStarNode)
-        return self.total_cost < other.total_cost
-
-    def __eq__(self, other):
-        if not isinstance(other, AStarNode):
-            return False
-        return self.pos == other.pos and self.when == other.when
-
-    def __hash__(self):
-        return (self.pos, self.when).__hash__()
-
-def estimate_cost(at: Vector2, goal: Vector2) -> float:
-    return ( ((goal.x - at.x)**2) + ((goal.y - at.y)**2) )**0.5
-
-v = Valley.from_str(input)
-for i in range(10):
-    print(f"== Minute {i} ==")
-    print(v.str_at_t(i))
-    print()
-
-def find_path(from_pt: Vector2, to_pt: Vector2, start_t: int = 0) -> AStarNode:
-    open_set = [AStarNode(None, from_pt, start_t, start_t + estimate_cost(Vector2(0, -1), to_pt))]
-    seen = set()
-
-    dirs = [Vector2(0, -1), Vector2(0, 1), Vector2(-1, 0), Vector2(1, 0), Vector2(0, 0)]
-
-    solution = None
-
-    extra_spots = set([from_pt, to_pt])
-
-    while len(open_set) > 0:
-        curr = heapq.heappop(open_set)
-        if curr.pos == to_pt:
-            solution = curr
-            break
-        for dir in dirs:
-            next = AStarNode(curr, curr.pos + dir, curr.when + 1, curr.when + 1 + estimate_cost(curr.pos + dir, to_pt))
-            if next in seen:
-                continue
-            seen.add(next)
-            if v.point_in_blizzard(next.pos, next.when):
-                continue
-            if next.pos not in extra_spots:
-                if next.pos.x < 0 or next.pos.x >= v.size.x or next.pos.y < 0 or next.pos.y >= v.size.y:
-                    continue
-            heapq.heappush(open_set, next)
-
-    return solution
-
-solution = find_path(Vector2(0, -1), Vector2(v.size.x - 1, v.size.y))
-
-if USE_SAMPLE_INPUT:
-    path = []
-    curr = solution
-    while curr is not None:
-        path.append(curr)
-        curr = curr.prev
-
-    for node in path[::-1]:
-        print(f"== Minute {node.when} ==")
-        valley_at_t = v.blizzards_in_time[node.when % len(v.blizzards_in_time)]
-        for y, row in enumerate(valley_at_t):
-            for x, c in enumerate(row):
-                if Vector2(x, y) == node.pos:
+def find_path(v: Valley, from_pt: Vector2, to_pt: Vector2, start_t: int = 0) -> 'list[tuple[Vector2, int]]':
+    """
+    Returns the quickest route from `from_pt` to `to_pt` leaving at
+    `start_t`, as (position, time) pairs. Positions are numbered as flat
+    valley indices plus two extra ids for the entrance and exit, and the
+    search runs over (position, time mod blizzard period) states.
+    """
+    width = v.size.x
+    cell_count = v.size.x * v.size.y
+    entrance_id = cell_count
+    exit_id = cell_count + 1
+    outside = {entrance_id: valley_entrance(v), exit_id: valley_exit(v)}
+
+    def position_id(pos: Vector2) -> int:
+        for pos_id, outside_pos in outside.items():
+            if pos == outside_pos:
+                return pos_id
+        return pos.x + pos.y * width
+
+    def position(pos_id: int) -> Vector2:
+        if pos_id in outside:
+            return outside[pos_id]
+        return Vector2(pos_id % width, pos_id // width)
+
+    # Where each position can be one minute later, waiting included
+    grid = Grid2D(v.size.x, v.size.y)
+    moves = [grid.neighbors(i) + [i] for i in range(cell_count)]
+    moves[0].append(entrance_id)
+    moves[cell_count - 1].append(exit_id)
+    moves.append([entrance_id, 0])
+    moves.append([exit_id, cell_count - 1])
+
+    states = TimeExpanded(cell_count + 2, len(v.blizzards_in_time))
+    occupied = [g.cells for g in v.blizzards_in_time]
+
+    def next_states(state: int) -> 'list[int]':
+        t = states.phase(state) + 1
+        blizzards = occupied[t % states.period]
+        return [states.node(pos_id, t) for pos_id in moves[states.position(state)]
+                if pos_id >= cell_count or blizzards[pos_id] == EMPTY]
+
+    goal_id = position_id(to_pt)
+    result = bfs([states.node(position_id(from_pt), start_t)], next_states, states.node_count,
+                 lambda state: states.position(state) == goal_id)
+    if not result.found:
+        raise ValueError(f'No route from {from_pt} to {to_pt} leaving at minute {start_t}')
+
+    return [(position(states.position(state)), start_t + result.dist[state]) for state in result.path()]
+
+def print_path(v: Valley, path: 'list[tuple[Vector2, int]]'):
+    for pos, when in path:
+        print(f"== Minute {when} ==")
+        valley_at_t = v.blizzards_in_time[when % len(v.blizzards_in_time)]
+        for y in range(valley_at_t.height):
+            for x in range(valley_at_t.width):
+                if Vector2(x, y) == pos:
                     print("E", end="")
                 else:
-                    print(c, end="")
+                    print(chr(valley_at_t[x, y]), end="")
             print()
 
-print("Part 1:", solution.when)
+def parse(text: str) -> Valley:
+    return Valley.from_str(text.strip())
+
+def precompute(v: Valley) -> Valley:
+    v.calculate_blizzards()
+    return v
+
+def valley_entrance(v: Valley) -> Vector2:
+    return Vector2(0, -1)
+
+def valley_exit(v: Valley) -> Vector2:
+    return Vector2(v.size.x - 1, v.size.y)
+
+def part1(v: Valley, verbose: bool = False) -> int:
+    path = find_path(v, valley_entrance(v), valley_exit(v))
+
+    if verbose:
+        print_path(v, path)
+
+    _, arrival = path[-1]
+    return arrival
+
+def part2(v: Valley, first_crossing: 'int|None' = None, verbose: bool = False) -> int:
+    start = valley_entrance(v)
+    end = valley_exit(v)
+
+    if first_crossing is None:
+        _, first_crossing = find_path(v, start, end)[-1]
+
+    if verbose:
+        print(f"cross1: t=0 to t={first_crossing}")
+    _, cross2 = find_path(v, end, start, start_t=first_crossing)[-1]
+    if verbose:
+        print(f"cross2: t={first_crossing} to t={cross2}")
+    _, cross3 = find_path(v, start, end, start_t=cross2)[-1]
+    if verbose:
+        print(f"cross3: t={cross2} to t={cross3}")
+        print()
+
+    return cross3
+
+def solve(text: str) -> 'tuple[int, int]':
+    v = precompute(parse(text))
+    part1_answer = part1(v)
+    return part1_answer, part2(v, part1_answer)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input_2
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
 
-## PART 2
-print('\n\n')
+    v = precompute(parse(input))
+    for i in range(10):
+        print(f"== Minute {i} ==")
+        print(v.str_at_t(i))
+        print()
 
-start = Vector2(0, -1)
-end = Vector2(v.size.x - 1, v.size.y)
+    part1_answer = part1(v, verbose=USE_SAMPLE_INPUT)
+    print("Part 1:", part1_answer)
 
-cross1 = solution
-print(f"cross1: t=0 to t={cross1.when}")
-cross2 = find_path(end, start, start_t=cross1.when)
-print(f"cross2: t={cross1.when} to t={cross2.when}")
-cross3 = find_path(start, end, start_t=cross2.when)
-print(f"cross3: t={cross2.when} to t={cross3.when}")
-print()
+    ## PART 2
+    print('\n\n')
 
-print("Part 2:", cross3.when)
+    print("Part 2:", part2(v, part1_answer, verbose=True))
@@ -0,0 +1,18 @@
+"""
+Synthetic input generator: `size` is the number of SNAFU numbers.
+"""
+import random
+
+def int_to_snafu(value: int) -> str:
+    digits = ''
+    while value != 0:
+        value, remainder = divmod(value, 5)
+        if remainder > 2:
+            remainder -= 5
+            value += 1
+        digits = '012=-'[remainder] + digits
+    return digits or '0'
+
+def generate(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return ''.join(int_to_snafu(rng.randint(1, 10 ** rng.randint(1, 13))) + '\n' for _ in range(size))
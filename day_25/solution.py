@@ -1,7 +1,13 @@
 from pathlib import Path
+import sys
+
+# Make the shared `aoc` package importable when run as a script from this directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from aoc.reader import nonblank_lines
 
 USE_SAMPLE_INPUT = False
-in_path = Path.cwd() / 'input.txt'
+in_path = Path(__file__).parent / 'input.txt'
+MAPPED_INPUT = True
 
 sample_input = """
 1=-0-2
@@ -19,12 +25,6 @@ sample_input = """
 122
 """
 
-if USE_SAMPLE_INPUT:
-    input = sample_input.strip()
-else:
-    with in_path.open("r") as inf:
-        input = inf.read().strip()
-
 snafu_to_int = {
     '2': 2,
     '1': 1,
@@ -90,8 +90,29 @@ def test_add(snafu1, snafu2):
     print(f"{dec1} + {dec2} = {dec1 + dec2}")
     assert dec1 + dec2 == resdec
 
-value = "0"
-for snafu in input.split("\n"):
-    value = add(snafu, value)
+def parse(text: str) -> 'list[str]':
+    return list(nonblank_lines(text))
+
+def part1(numbers: 'list[str]') -> str:
+    value = "0"
+    for snafu in numbers:
+        value = add(snafu, value)
+    return value
+
+def part2(numbers: 'list[str]') -> None:
+    # Day 25 has no second puzzle
+    return None
+
+def solve(text: str) -> 'tuple[str, None]':
+    numbers = parse(text)
+    return part1(numbers), part2(numbers)
+
+if __name__ == '__main__':
+    if USE_SAMPLE_INPUT:
+        input = sample_input
+    else:
+        with in_path.open("r") as inf:
+            input = inf.read()
 
-print(f"Part 1: '{value}' ({snafu_to_decimal(value)})")
+    value = part1(parse(input))
+    print(f"Part 1: '{value}' ({snafu_to_decimal(value)})")